@@ -3,23 +3,48 @@ from __future__ import annotations
 
 import logging
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL, Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
-from .api import InvisaGigApiClient
-from .coordinator import InvisaGigDataUpdateCoordinator
 from .const import (
-    DOMAIN,
     CONF_USE_SSL,
     DEFAULT_PORT_HTTP,
     DEFAULT_USE_SSL,
+    DOMAIN,
+    STORAGE_VERSION,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR]
+# The client, parsers and derived metrics (see snapshot.py and cli.py) are
+# usable without Home Assistant, so only a missing homeassistant package is
+# tolerated here; any other import error is a real bug and still raises.
+try:
+    import homeassistant.helpers.config_validation as cv
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.const import CONF_HOST, CONF_PORT, Platform
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.aiohttp_client import async_get_clientsession
+    from homeassistant.helpers.storage import Store
+
+    from .api import InvisaGigApiClient
+    from .coordinator import InvisaGigDataUpdateCoordinator, InvisaGigProbeCoordinator
+    from .services import async_setup_services
+    from .view import InvisaGigMetricsView
+    from .websocket import async_close_broadcast, async_setup_websocket
+except ModuleNotFoundError as err:
+    if not (err.name or "").startswith("homeassistant"):
+        raise
+else:
+    PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR]
+
+    CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: dict) -> bool:
+    """Set up the InvisaGig services and metrics endpoint."""
+    async_setup_services(hass)
+    async_setup_websocket(hass)
+    # Answers 404 until an entry enables metrics in its options
+    hass.http.register_view(InvisaGigMetricsView())
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -40,18 +65,29 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     coordinator = InvisaGigDataUpdateCoordinator(hass, client)
     coordinator.config_entry = entry
-
-    # Set update interval
-    if CONF_SCAN_INTERVAL in entry.options:
-        coordinator.update_interval = entry.options[CONF_SCAN_INTERVAL]
-    
-    await coordinator.async_config_entry_first_refresh()
+    coordinator.update_options(entry.options)
+
+    probe = InvisaGigProbeCoordinator(hass, client)
+    entry.async_on_unload(coordinator.async_attach_probe(probe))
+
+    # Never block startup on the modem: start from the last saved snapshot
+    # (or the one the config flow just fetched) and refresh in the background.
+    await coordinator.async_restore()
+    if coordinator.consume_seed():
+        await coordinator.async_refresh()
+    else:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {host}"
+        )
+    entry.async_create_background_task(
+        hass, probe.async_refresh(), f"{DOMAIN} first probe {host}"
+    )
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     return True
 
@@ -60,10 +96,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
     if unloaded := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        async_close_broadcast(hass, entry.entry_id)
     return unloaded
 
 
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the saved snapshot when the entry is deleted."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options without reloading the entry."""
+    coordinator: InvisaGigDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator.async_options_updated(entry.options)
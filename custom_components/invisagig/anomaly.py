@@ -0,0 +1,193 @@
+"""Rolling anomaly detection on InvisaGig signal and temperature metrics.
+
+Each metric keeps an exponentially weighted mean and variance, updated in
+place every poll. A reading is a deviation when it is more than threshold
+standard deviations from the mean so far; a metric only turns anomalous
+after deviating for duration seconds, and only clears after being back
+within the threshold for as long, like the drift tracker's dwell times.
+A lasting change of level is absorbed into the mean over roughly 1/alpha
+polls, after which it clears.
+"""
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from .parsers import parse_temp
+
+
+def _cell_value(section: str, field: str) -> Callable[[Mapping[str, Any]], Any]:
+    return lambda data: (data.get(section) or {}).get(field)
+
+
+def _nr_value(suffix: str) -> Callable[[Mapping[str, Any]], Any]:
+    """Read an NR field from the SA cell, or the NSA leg when there is none."""
+
+    def _value(data: Mapping[str, Any]) -> Any:
+        value = (data.get("saCell") or {}).get(f"sa{suffix}")
+        if value is None:
+            value = (data.get("nsaCell") or {}).get(f"nsa{suffix}")
+        return value
+
+    return _value
+
+
+# metric -> (reading, smallest standard deviation that counts, in its unit)
+METRICS: dict[str, tuple[Callable[[Mapping[str, Any]], Any], float]] = {
+    "lte_rsrp": (_cell_value("lteCell", "lteStr"), 1.0),
+    "lte_rsrq": (_cell_value("lteCell", "lteQal"), 1.0),
+    "lte_sinr": (_cell_value("lteCell", "lteSnr"), 1.0),
+    "nr_rsrp": (_nr_value("Str"), 1.0),
+    "nr_sinr": (_nr_value("Snr"), 1.0),
+    "temperature": (
+        lambda data: parse_temp((data.get("timeTemp") or {}).get("temp")),
+        0.5,
+    ),
+}
+
+
+class MetricBaseline:
+    """Exponentially weighted mean and variance of one metric."""
+
+    __slots__ = (
+        "samples",
+        "mean",
+        "variance",
+        "anomalous",
+        "z_score",
+        "value",
+        "_since",
+    )
+
+    def __init__(
+        self, samples: int = 0, mean: float = 0.0, variance: float = 0.0
+    ) -> None:
+        """Initialize."""
+        self.samples = samples
+        self.mean = mean
+        self.variance = variance
+        self.anomalous = False
+        self.z_score: float | None = None
+        self.value: float | None = None
+        # When the reading started to disagree with the confirmed state
+        self._since: float | None = None
+
+    def update(
+        self,
+        value: float,
+        now: float,
+        alpha: float,
+        min_std: float,
+        warmup: int,
+        threshold: float,
+        duration: float,
+    ) -> bool:
+        """Fold in a reading; return True if the confirmed state changed."""
+        changed = False
+        deviating = False
+        self.value = value
+        if self.samples >= warmup:
+            std = max(math.sqrt(self.variance), min_std)
+            self.z_score = (value - self.mean) / std
+            deviating = abs(self.z_score) > threshold
+            if deviating == self.anomalous:
+                self._since = None
+            elif self._since is None:
+                self._since = now
+            if self._since is not None and now - self._since >= duration:
+                self.anomalous = deviating
+                self._since = None
+                changed = True
+
+        self.samples += 1
+        if self.samples == 1:
+            self.mean = value
+            return changed
+        # West's incremental update of the weighted mean and variance.
+        # Deviating readings only move the mean: widening the variance with
+        # them would hide a sustained deviation within a few polls, while the
+        # mean still follows a lasting change until it is the new normal.
+        diff = value - self.mean
+        increment = alpha * diff
+        self.mean += increment
+        if not deviating:
+            self.variance = (1 - alpha) * (self.variance + diff * increment)
+        return changed
+
+    @property
+    def std_dev(self) -> float:
+        """Return the current standard deviation."""
+        return math.sqrt(self.variance)
+
+
+class AnomalyDetector:
+    """Sustained deviation detection over every metric in METRICS."""
+
+    def __init__(
+        self,
+        alpha: float,
+        warmup: int,
+        threshold: float,
+        duration: float,
+    ) -> None:
+        """Initialize."""
+        self.alpha = alpha
+        self.warmup = warmup
+        self.threshold = threshold
+        self.duration = duration
+        self.baselines = {metric: MetricBaseline() for metric in METRICS}
+
+    @property
+    def anomalous(self) -> list[str]:
+        """Return the metrics currently anomalous."""
+        return [
+            metric for metric, baseline in self.baselines.items() if baseline.anomalous
+        ]
+
+    def update(self, data: Mapping[str, Any], now: float) -> list[str]:
+        """Fold in a snapshot; return the metrics whose state changed."""
+        changed = []
+        for metric, (reading, min_std) in METRICS.items():
+            value = reading(data)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            if self.baselines[metric].update(
+                float(value),
+                now,
+                self.alpha,
+                min_std,
+                self.warmup,
+                self.threshold,
+                self.duration,
+            ):
+                changed.append(metric)
+        return changed
+
+    def describe(self, metric: str) -> dict[str, Any]:
+        """Return the state of one metric for events and attributes."""
+        baseline = self.baselines[metric]
+        return {
+            "metric": metric,
+            "anomalous": baseline.anomalous,
+            "value": baseline.value,
+            "mean": round(baseline.mean, 2),
+            "std_dev": round(baseline.std_dev, 2),
+            "z_score": (
+                round(baseline.z_score, 2) if baseline.z_score is not None else None
+            ),
+        }
+
+    def as_dict(self) -> dict[str, list[float]]:
+        """Return the baselines to persist."""
+        return {
+            metric: [baseline.samples, baseline.mean, baseline.variance]
+            for metric, baseline in self.baselines.items()
+            if baseline.samples
+        }
+
+    def restore(self, stored: Mapping[str, list[float]]) -> None:
+        """Load persisted baselines."""
+        for metric, (samples, mean, variance) in stored.items():
+            if metric in self.baselines:
+                self.baselines[metric] = MetricBaseline(int(samples), mean, variance)
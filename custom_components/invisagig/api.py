@@ -6,15 +6,42 @@ import json
 import logging
 import re
 import socket
+import time
+import zlib
+from collections.abc import Iterable
 from typing import Any
 
 import aiohttp
 import async_timeout
 
-from .const import TIMEOUT
+from .const import (
+    COALESCE_WINDOW,
+    ENDPOINT_INITIAL_TIMEOUT,
+    ENDPOINT_MAX_RETRY_INTERVAL,
+    ENDPOINT_MIN_TIMEOUT,
+    ENDPOINT_RETRY_INTERVAL,
+    ENDPOINT_STALE_AFTER,
+    JSON_ERROR_EXCERPT,
+    MAX_RESPONSE_BYTES,
+    PARSE_EXECUTOR_THRESHOLD,
+    PROBE_TIMEOUT,
+    READ_CHUNK_SIZE,
+    TIMEOUT,
+)
+from .repair import apply_legacy_fixes, parse_json
 
 _LOGGER = logging.getLogger(__name__)
 
+# Encodings decoded here; brotli would need an extra dependency
+ACCEPT_ENCODING = "gzip, deflate"
+_ZLIB_AUTO = 32 + zlib.MAX_WBITS  # gzip or zlib header
+_ZLIB_RAW = -zlib.MAX_WBITS  # headerless deflate some servers send
+
+
+def _has_zlib_header(data: bytes) -> bool:
+    """Return whether data starts with a zlib (RFC 1950) header."""
+    return len(data) >= 2 and data[0] & 0x0F == 8 and (data[0] << 8 | data[1]) % 31 == 0
+
 
 class InvisaGigApiClientError(Exception):
     """Exception to indicate a general API error."""
@@ -28,6 +55,103 @@ class InvisaGigApiClientAuthenticationError(InvisaGigApiClientError):
     """Exception to indicate an authentication error."""
 
 
+def parse_endpoints(text: str | None, default_port: int) -> list[tuple[str, int]]:
+    """Parse "host, host:port, [v6]:port" into (host, port) pairs.
+
+    Raises ValueError on an empty host or a bad port.
+    """
+    endpoints: list[tuple[str, int]] = []
+    for item in (text or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        host, port = item, str(default_port)
+        if item.startswith("["):
+            host, _, rest = item[1:].partition("]")
+            if rest:
+                if not rest.startswith(":"):
+                    raise ValueError(f"Invalid endpoint {item}")
+                port = rest[1:]
+        elif item.count(":") == 1:
+            host, port = item.split(":")
+        if not host or not port.isdigit() or not 0 < int(port) < 65536:
+            raise ValueError(f"Invalid endpoint {item}")
+        endpoints.append((host, int(port)))
+    return endpoints
+
+
+class Endpoint:
+    """One address of a modem with its smoothed RTT and failure state.
+
+    SRTT and RTTVAR follow RFC 6298 over whole fetches, and a failed path is
+    skipped for an exponentially growing retry interval.
+    """
+
+    def __init__(self, host: str, port: int) -> None:
+        """Initialize."""
+        self.host = host
+        self.port = port
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.sampled_at: float | None = None
+        self.failures = 0
+        self.total_failures = 0
+        self.retry_at = 0.0
+
+    def __repr__(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def record_rtt(self, rtt: float, now: float) -> None:
+        """Fold a successful fetch time into SRTT and clear the failures."""
+        if self.srtt is None:
+            self.srtt, self.rttvar = rtt, rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+        self.sampled_at = now
+        self.failures = 0
+        self.retry_at = 0.0
+
+    def record_failure(self, now: float) -> None:
+        """Back the path off after a failed fetch or an unusable response."""
+        self.failures += 1
+        self.total_failures += 1
+        backoff = ENDPOINT_RETRY_INTERVAL * 2 ** min(self.failures - 1, 16)
+        self.retry_at = now + min(backoff, ENDPOINT_MAX_RETRY_INTERVAL)
+
+    def healthy(self, now: float) -> bool:
+        """Return whether the path may be tried ahead of the others."""
+        return now >= self.retry_at
+
+    def stale(self, now: float) -> bool:
+        """Return whether the SRTT is missing or too old to rank on."""
+        return self.sampled_at is None or now - self.sampled_at > ENDPOINT_STALE_AFTER
+
+    def failover_timeout(self) -> float:
+        """Return how long to wait before moving on to the next path."""
+        if self.srtt is None:
+            return ENDPOINT_INITIAL_TIMEOUT
+        return min(max(self.srtt + 4 * self.rttvar, ENDPOINT_MIN_TIMEOUT), TIMEOUT)
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return the state shown in diagnostics."""
+        return {
+            "endpoint": repr(self),
+            "srtt_ms": round(self.srtt * 1000) if self.srtt is not None else None,
+            "rttvar_ms": round(self.rttvar * 1000) if self.rttvar is not None else None,
+            "failures": self.failures,
+            "total_failures": self.total_failures,
+            "healthy": self.healthy(now),
+        }
+
+
+# Shared by every client talking to the same modem: the fetch currently in
+# flight and the last successful result, keyed by (protocol, host, port).
+# Both hold (data, sent, received) with the request's monotonic times.
+_IN_FLIGHT: dict[tuple[str, str, int], asyncio.Task] = {}
+_RECENT: dict[tuple[str, str, int], tuple[dict[str, Any], float, float]] = {}
+
+
 class InvisaGigApiClient:
     """Sample API Client."""
 
@@ -37,32 +161,225 @@ class InvisaGigApiClient:
         port: int,
         session: aiohttp.ClientSession,
         use_ssl: bool = False,
+        parse_executor_threshold: int = PARSE_EXECUTOR_THRESHOLD,
+        max_response_bytes: int = MAX_RESPONSE_BYTES,
+        alternates: Iterable[tuple[str, int]] = (),
     ) -> None:
-        """Sample API Client."""
+        """Sample API Client.
+
+        host/port identify the modem; alternates are other addresses of the
+        same modem (e.g. Tailscale) that polls may use instead.
+        """
         self._host = host
         self._port = port
         self._session = session
         self._use_ssl = use_ssl
         self._protocol = "https" if use_ssl else "http"
+        self.parse_executor_threshold = parse_executor_threshold
+        self.parse_stats: dict[str, Any] = {}
+        self.max_response_bytes = max_response_bytes
+        self.endpoints: list[Endpoint] = []
+        self.active_endpoint: Endpoint | None = None
+        self.set_alternates(alternates)
+        # How the last async_get_data call got its document: "network" when
+        # it sent the request, "shared" when it joined another caller's and
+        # "cache" when a recent result was reused; request_times are when
+        # the request behind that document was sent and answered
+        self.request_source: str | None = None
+        self.request_times: tuple[float, float] | None = None
+
+        # Conditional requests: validators of the last full response and
+        # the document parsed from it, reused when the modem answers 304
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._last_data: dict[str, Any] | None = None
+        # Cleared if a compressed body ever fails to decode
+        self.compression_enabled = True
+        # HTTP-level bytes per device; TCP/TLS overhead isn't visible here
+        self.transfer: dict[str, Any] = {
+            "requests": 0,
+            "not_modified": 0,
+            "bytes_sent": 0,
+            "bytes_received": 0,
+            "body_bytes": 0,
+            "decoded_bytes": 0,
+            "compressed_responses": 0,
+        }
+
+    @property
+    def bytes_transferred(self) -> int:
+        """Return the HTTP bytes sent and received so far."""
+        return self.transfer["bytes_sent"] + self.transfer["bytes_received"]
+
+    @property
+    def conditional_supported(self) -> bool:
+        """Return whether the server sends validators for conditional requests."""
+        return self._etag is not None or self._last_modified is not None
+
+    def set_alternates(self, alternates: Iterable[tuple[str, int]]) -> None:
+        """Replace the alternate addresses, keeping stats of those still listed."""
+        known = {
+            (endpoint.host, endpoint.port): endpoint for endpoint in self.endpoints
+        }
+        endpoints: dict[tuple[str, int], Endpoint] = {}
+        for key in ((self._host, self._port), *alternates):
+            if key not in endpoints:
+                endpoints[key] = known.get(key) or Endpoint(*key)
+        self.endpoints = list(endpoints.values())
+        if self.active_endpoint not in self.endpoints:
+            self.active_endpoint = None
+
+    def ranked_endpoints(self, now: float) -> list[Endpoint]:
+        """Return the endpoints in the order a poll should try them.
+
+        Healthy paths come first, those that need a fresh measurement ahead
+        of the rest, then by SRTT; backed-off paths are only tried last.
+        Ties keep the configured order.
+        """
+        return sorted(
+            self.endpoints,
+            key=lambda endpoint: (
+                not endpoint.healthy(now),
+                not endpoint.stale(now),
+                0 if endpoint.stale(now) else endpoint.srtt,
+            ),
+        )
+
+    async def async_get_data(
+        self, max_age: float = COALESCE_WINDOW, shared: bool = True
+    ) -> dict[str, Any]:
+        """Get data from the API.
+
+        Concurrent callers for the same modem (other config entries, a config
+        flow validation, a manual refresh) share a single request, and a result
+        younger than max_age seconds is reused; request_source and
+        request_times say which happened. The returned dict is shared between
+        callers and must not be mutated.
+
+        With shared=False the request is this caller's alone, so cancelling
+        the call (e.g. on a timeout) also cancels the request.
+        """
+        key = (self._protocol, self._host, self._port)
+        recent = _RECENT.get(key)
+        if not shared:
+            self.request_source = "network"
+            data, *times = await self._async_timed_fetch()
+        elif recent is not None and time.monotonic() - recent[2] <= max_age:
+            self.request_source = "cache"
+            data, *times = recent
+        else:
+            task = _IN_FLIGHT.get(key)
+            self.request_source = "shared"
+            if task is None:
+                self.request_source = "network"
+                task = asyncio.ensure_future(self._async_timed_fetch())
+                _IN_FLIGHT[key] = task
+
+                def _done(task: asyncio.Task) -> None:
+                    _IN_FLIGHT.pop(key, None)
+                    if not task.cancelled() and task.exception() is None:
+                        _RECENT[key] = task.result()
+
+                task.add_done_callback(_done)
+
+            # Shield so one caller timing out doesn't cancel the shared fetch
+            data, *times = await asyncio.shield(task)
+        self.request_times = tuple(times)
+        return data
+
+    async def _async_timed_fetch(self) -> tuple[dict[str, Any], float, float]:
+        """Fetch the document along with when the request was sent and answered."""
+        sent = time.monotonic()
+        data = await self._async_fetch()
+        return data, sent, time.monotonic()
+
+    async def _async_fetch(self) -> dict[str, Any]:
+        """Fetch and parse the telemetry document.
+
+        Endpoints are tried fastest first. Every attempt but the last gets a
+        timeout derived from that path's SRTT, so a dead path costs a couple
+        of seconds instead of the full timeout before failing over.
+        """
+        endpoints = self.ranked_endpoints(time.monotonic())
+        for attempt, endpoint in enumerate(endpoints, start=1):
+            last = attempt == len(endpoints)
+            start = time.monotonic()
+            try:
+                text = await self._async_fetch_body(
+                    endpoint, TIMEOUT if last else endpoint.failover_timeout()
+                )
+            except InvisaGigApiClientError as exception:
+                # Unreachable, or answered with something that isn't the
+                # telemetry document, like a VPN login or captive portal page
+                endpoint.record_failure(time.monotonic())
+                if last:
+                    raise
+                _LOGGER.debug(
+                    "%r failed (%s), trying the next endpoint", endpoint, exception
+                )
+                continue
+            now = time.monotonic()
+            endpoint.record_rtt(now - start, now)
+            self.active_endpoint = endpoint
+            break
+
+        if text is None:
+            # 304: the document hasn't changed since the last full fetch
+            self.parse_stats = {"bytes": 0, "mode": "not_modified", "loop_block_ms": 0}
+            return self._last_data
 
-    async def async_get_data(self) -> dict[str, Any]:
-        """Get data from the API."""
-        url = f"{self._protocol}://{self._host}:{self._port}/telemetry/info.json"
-        
         try:
-            async with async_timeout.timeout(TIMEOUT):
-                response = await self._session.get(url)
-                response.raise_for_status()
-                text = await response.text()
-                
-                # Sanitize JSON
-                sanitized_text = self._sanitize_json(text)
-                
-                # Parse JSON
-                data = json.loads(sanitized_text)
-                
-                # Normalize data (recurse through and fix "null" strings, trim strings)
-                return self._normalize_data(data)
+            self._last_data = await self._async_parse(text)
+            return self._last_data
+        except json.JSONDecodeError as exception:
+            start = max(exception.pos - JSON_ERROR_EXCERPT, 0)
+            _LOGGER.debug(
+                "Invalid JSON from %s at offset %s: %r",
+                self._host,
+                exception.pos,
+                exception.doc[start : exception.pos + JSON_ERROR_EXCERPT],
+            )
+            raise InvisaGigApiClientError("Could not parse JSON response") from exception
+        except Exception as exception:  # pylint: disable=broad-except
+            raise InvisaGigApiClientError(
+                f"Something really wrong happened: {exception}"
+            ) from exception
+
+    async def _async_fetch_body(self, endpoint: Endpoint, timeout: float) -> str | None:
+        """Fetch the raw telemetry body from one endpoint.
+
+        Returns None when the server answers 304 Not Modified.
+        """
+        url = f"{self._protocol}://{endpoint.host}:{endpoint.port}/telemetry/info.json"
+        headers = {}
+        if self.compression_enabled:
+            headers[aiohttp.hdrs.ACCEPT_ENCODING] = ACCEPT_ENCODING
+        if self._last_data is not None:
+            if self._etag is not None:
+                headers[aiohttp.hdrs.IF_NONE_MATCH] = self._etag
+            if self._last_modified is not None:
+                headers[aiohttp.hdrs.IF_MODIFIED_SINCE] = self._last_modified
+
+        try:
+            async with async_timeout.timeout(timeout):
+                # Decompressed here rather than by aiohttp so the size cap
+                # applies to the decoded body and wire bytes can be counted
+                async with self._session.get(
+                    url, headers=headers, auto_decompress=False
+                ) as response:
+                    self._count_headers(response)
+                    if response.status == 304:
+                        self.transfer["not_modified"] += 1
+                        if self._last_data is None:
+                            raise InvisaGigApiClientError("Unexpected 304 response")
+                        return None
+                    response.raise_for_status()
+                    text = await self._async_read_body(response)
+                    self._etag = response.headers.get(aiohttp.hdrs.ETAG)
+                    self._last_modified = response.headers.get(
+                        aiohttp.hdrs.LAST_MODIFIED
+                    )
+                    return text
 
         except asyncio.TimeoutError as exception:
             raise InvisaGigApiClientCommunicationError(
@@ -72,30 +389,154 @@ class InvisaGigApiClient:
             raise InvisaGigApiClientCommunicationError(
                 "Error fetching information",
             ) from exception
-        except json.JSONDecodeError as exception:
-            print(f"FAILED JSON: {text}")  # For debug
-            raise InvisaGigApiClientError("Could not parse JSON response") from exception
+        except InvisaGigApiClientError:
+            raise
         except Exception as exception:  # pylint: disable=broad-except
             raise InvisaGigApiClientError(
                 f"Something really wrong happened: {exception}"
             ) from exception
 
-    def _sanitize_json(self, text: str) -> str:
-        """Sanitize JSON string from InvisaGig."""
-        # 1. replace ": ," with ": null,"
-        text = text.replace(": ,", ": null,")
-        
-        # 2. replace ":\n}" with ": null\n}"
-        text = text.replace(":\n}", ": null\n}")
-        
-        # 3. replace ": }" with ": null}"
-        text = text.replace(": }", ": null}")
-        
-        # 4. replace ": ]" with ": null]"
-        text = text.replace(": ]", ": null]")
+    def _count_headers(self, response: aiohttp.ClientResponse) -> None:
+        """Add the request line, response status line and both headers to the totals."""
+        request = response.request_info
+        sent = len(f"{request.method} {request.url.path_qs} HTTP/1.1\r\n\r\n")
+        sent += sum(len(k) + len(v) + 4 for k, v in request.headers.items())
+        received = len(f"HTTP/1.1 {response.status} {response.reason}\r\n\r\n")
+        received += sum(len(k) + len(v) + 4 for k, v in response.raw_headers)
+        self.transfer["requests"] += 1
+        self.transfer["bytes_sent"] += sent
+        self.transfer["bytes_received"] += received
+
+    async def _async_read_body(self, response: aiohttp.ClientResponse) -> str:
+        """Stream the body in chunks, refusing oversized or HTML responses.
+
+        A captive portal or misbehaving firmware answering on the modem address
+        must not be able to push megabytes into memory, so the body is capped
+        at max_response_bytes while it is read rather than after.
+        """
+        content_type = response.headers.get(aiohttp.hdrs.CONTENT_TYPE, "")
+        if "html" in content_type.lower():
+            raise InvisaGigApiClientError(
+                f"Unexpected {content_type} response, is this an InvisaGig?"
+            )
+
+        limit = self.max_response_bytes
+        if response.content_length is not None and response.content_length > limit:
+            raise InvisaGigApiClientError(
+                f"Response of {response.content_length} bytes exceeds {limit} bytes"
+            )
 
+        encoding = (
+            response.headers.get(aiohttp.hdrs.CONTENT_ENCODING, "").strip().lower()
+        )
+        decoder = None
+        if encoding in ("gzip", "x-gzip", "deflate"):
+            decoder = zlib.decompressobj(_ZLIB_AUTO)
+            self.transfer["compressed_responses"] += 1
+        elif encoding not in ("", "identity"):
+            raise InvisaGigApiClientError(f"Unsupported Content-Encoding {encoding}")
+
+        body = bytearray()
+        first = True
+        try:
+            async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+                self.transfer["body_bytes"] += len(chunk)
+                self.transfer["bytes_received"] += len(chunk)
+                if decoder is not None:
+                    if first and encoding == "deflate" and not _has_zlib_header(chunk):
+                        decoder = zlib.decompressobj(_ZLIB_RAW)
+                    first = False
+                    # Bounded output, so a compression bomb can't inflate past the cap
+                    chunk = decoder.decompress(chunk, limit + 1 - len(body))
+                body += chunk
+                if len(body) > limit:
+                    raise InvisaGigApiClientError(f"Response exceeds {limit} bytes")
+            if decoder is not None:
+                body += decoder.flush()
+                if not decoder.eof:
+                    raise zlib.error("truncated stream")
+        except zlib.error as exception:
+            # Don't ask for compression again from a server that gets it wrong
+            self.compression_enabled = False
+            raise InvisaGigApiClientError(
+                f"Could not decode {encoding} response: {exception}"
+            ) from exception
+        self.transfer["decoded_bytes"] += len(body)
+
+        text = body.decode(response.charset or "utf-8", errors="replace")
+        # Servers often label error pages as text/plain or nothing at all
+        if text.lstrip()[:1] == "<":
+            raise InvisaGigApiClientError(
+                "Unexpected HTML response, is this an InvisaGig?"
+            )
         return text
 
+    async def _async_parse(self, text: str) -> Any:
+        """Parse a body inline, or in the executor when it is large.
+
+        Small bodies are cheaper to parse on the event loop than to hand off;
+        large carrier aggregation payloads go to a worker thread so they don't
+        stall the loop. parse_stats records how long the loop was blocked.
+        """
+        start = time.perf_counter()
+        if len(text) > self.parse_executor_threshold:
+            loop = asyncio.get_running_loop()
+            mode = "executor"
+            blocked = time.perf_counter() - start
+            data, repairs = await loop.run_in_executor(None, self._parse, text)
+        else:
+            mode = "inline"
+            data, repairs = self._parse(text)
+            blocked = time.perf_counter() - start
+
+        if repairs:
+            _LOGGER.debug("Repaired malformed JSON from %s: %s", self._host, repairs)
+
+        self.parse_stats = {
+            "bytes": len(text),
+            "mode": mode,
+            "parse_ms": round((time.perf_counter() - start) * 1000, 3),
+            "loop_block_ms": round(blocked * 1000, 3),
+            "repairs": repairs,
+        }
+        return data
+
+    def _parse(self, text: str) -> tuple[Any, dict[str, int]]:
+        """Parse, repair and normalize a telemetry body. Safe to run in a thread."""
+        # Parse JSON, repairing firmware quirks when strict parsing fails
+        data, repairs = parse_json(text)
+
+        # Normalize data (recurse through and fix "null" strings, trim strings)
+        return self._normalize_data(data), repairs
+
+    async def async_probe(self) -> bool:
+        """Check whether the web server accepts connections.
+
+        This is a bare TCP connect with a short timeout; nothing is requested
+        or parsed, so it is cheap enough to run far more often than the
+        telemetry fetch. The modem counts as up when any endpoint answers,
+        trying them in poll order.
+        """
+        for endpoint in self.ranked_endpoints(time.monotonic()):
+            try:
+                async with async_timeout.timeout(PROBE_TIMEOUT):
+                    _, writer = await asyncio.open_connection(
+                        endpoint.host, endpoint.port
+                    )
+            except (asyncio.TimeoutError, OSError):
+                continue
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+            return True
+        return False
+
+    def _sanitize_json(self, text: str) -> str:
+        """Sanitize JSON string from InvisaGig."""
+        return apply_legacy_fixes(text)
+
     def _normalize_data(self, data: Any) -> Any:
         """Recursively normalize data."""
         if isinstance(data, dict):
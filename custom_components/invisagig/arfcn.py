@@ -0,0 +1,201 @@
+"""EARFCN / NR-ARFCN decoding for InvisaGig."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+DUPLEX_FDD = "FDD"
+DUPLEX_TDD = "TDD"
+DUPLEX_SDL = "SDL"
+
+# 3GPP TS 36.101 table 5.7.3-1:
+# band, F_DL_low, N_Offs-DL, last DL EARFCN, F_UL_low, N_Offs-UL (None = TDD/SDL)
+_LTE_BANDS = (
+    (1, 2110, 0, 599, 1920, 18000),
+    (2, 1930, 600, 1199, 1850, 18600),
+    (3, 1805, 1200, 1949, 1710, 19200),
+    (4, 2110, 1950, 2399, 1710, 19950),
+    (5, 869, 2400, 2649, 824, 20400),
+    (7, 2620, 2750, 3449, 2500, 20750),
+    (8, 925, 3450, 3799, 880, 21450),
+    (11, 1475.9, 4750, 4949, 1427.9, 22750),
+    (12, 729, 5010, 5179, 699, 23010),
+    (13, 746, 5180, 5279, 777, 23180),
+    (14, 758, 5280, 5379, 788, 23280),
+    (17, 734, 5730, 5849, 704, 23730),
+    (18, 860, 5850, 5999, 815, 23850),
+    (19, 875, 6000, 6149, 830, 24000),
+    (20, 791, 6150, 6449, 832, 24150),
+    (21, 1495.9, 6450, 6599, 1447.9, 24450),
+    (25, 1930, 8040, 8689, 1850, 26040),
+    (26, 859, 8690, 9039, 814, 26690),
+    (28, 758, 9210, 9659, 703, 27210),
+    (29, 717, 9660, 9769, None, None),
+    (30, 2350, 9770, 9869, 2305, 27660),
+    (32, 1452, 9920, 10359, None, None),
+    (34, 2010, 36200, 36349, None, None),
+    (38, 2570, 37750, 38249, None, None),
+    (39, 1880, 38250, 38649, None, None),
+    (40, 2300, 38650, 39649, None, None),
+    (41, 2496, 39650, 41589, None, None),
+    (42, 3400, 41590, 43589, None, None),
+    (43, 3600, 43590, 45589, None, None),
+    (46, 5150, 46790, 54539, None, None),
+    (48, 3550, 55240, 56739, None, None),
+    (66, 2110, 66436, 67335, 1710, 131972),
+    (71, 617, 68586, 68935, 663, 132972),
+)
+
+# 3GPP TS 38.104 table 5.4.2.1-1 global raster:
+# first NR-ARFCN, F_REF-Offs (MHz), ΔF_Global (MHz)
+_NR_RASTER = (
+    (0, 0.0, 0.005),
+    (600000, 3000.0, 0.015),
+    (2016667, 24250.08, 0.06),
+)
+_NR_ARFCN_MAX = 3279165
+
+# 3GPP TS 38.101-1/-2 operating bands:
+# band, DL low, DL high, UL low (MHz, None = TDD/SDL), duplex
+_NR_BANDS = (
+    (1, 2110, 2170, 1920, DUPLEX_FDD),
+    (2, 1930, 1990, 1850, DUPLEX_FDD),
+    (3, 1805, 1880, 1710, DUPLEX_FDD),
+    (5, 869, 894, 824, DUPLEX_FDD),
+    (7, 2620, 2690, 2500, DUPLEX_FDD),
+    (8, 925, 960, 880, DUPLEX_FDD),
+    (12, 729, 746, 699, DUPLEX_FDD),
+    (13, 746, 756, 777, DUPLEX_FDD),
+    (14, 758, 768, 788, DUPLEX_FDD),
+    (20, 791, 821, 832, DUPLEX_FDD),
+    (25, 1930, 1995, 1850, DUPLEX_FDD),
+    (26, 859, 894, 814, DUPLEX_FDD),
+    (28, 758, 803, 703, DUPLEX_FDD),
+    (29, 717, 728, None, DUPLEX_SDL),
+    (30, 2350, 2360, 2305, DUPLEX_FDD),
+    (38, 2570, 2620, None, DUPLEX_TDD),
+    (40, 2300, 2400, None, DUPLEX_TDD),
+    (41, 2496, 2690, None, DUPLEX_TDD),
+    (48, 3550, 3700, None, DUPLEX_TDD),
+    (66, 2110, 2200, 1710, DUPLEX_FDD),
+    (70, 1995, 2020, 1695, DUPLEX_FDD),
+    (71, 617, 652, 663, DUPLEX_FDD),
+    (75, 1432, 1517, None, DUPLEX_SDL),
+    (77, 3300, 4200, None, DUPLEX_TDD),
+    (78, 3300, 3800, None, DUPLEX_TDD),
+    (79, 4400, 5000, None, DUPLEX_TDD),
+    (258, 24250, 27500, None, DUPLEX_TDD),
+    (260, 37000, 40000, None, DUPLEX_TDD),
+    (261, 27500, 28350, None, DUPLEX_TDD),
+)
+
+
+@dataclass(frozen=True)
+class Carrier:
+    """A decoded channel number."""
+
+    band: int | None
+    dl_mhz: float
+    ul_mhz: float | None
+    duplex: str | None
+
+
+def _build_lte_table():
+    rows = sorted(_LTE_BANDS, key=lambda row: row[2])
+    return [row[2] for row in rows], rows
+
+
+def _build_nr_table():
+    """Split overlapping NR bands into disjoint frequency segments.
+
+    Each segment keeps every band covering it, narrowest first, so the
+    lookup is one bisect regardless of how many bands overlap.
+    """
+    edges = sorted({edge for row in _NR_BANDS for edge in (row[1], row[2])})
+    starts: list[float] = []
+    candidates: list[tuple] = []
+    for low, high in zip(edges, edges[1:]):
+        covering = sorted(
+            (row for row in _NR_BANDS if row[1] <= low and high <= row[2]),
+            key=lambda row: row[2] - row[1],
+        )
+        starts.append(low)
+        candidates.append((high, tuple(covering)))
+    return starts, candidates
+
+
+# Built once at import; per-poll lookups are a single bisect each
+_LTE_STARTS, _LTE_ROWS = _build_lte_table()
+_NR_STARTS, _NR_SEGMENTS = _build_nr_table()
+_NR_RASTER_STARTS = [row[0] for row in _NR_RASTER]
+
+
+def decode_earfcn(earfcn: int | None) -> Carrier | None:
+    """Return the band and DL/UL frequencies for an LTE downlink EARFCN."""
+    if not isinstance(earfcn, int) or earfcn < 0:
+        return None
+    index = bisect_right(_LTE_STARTS, earfcn) - 1
+    if index < 0:
+        return None
+    band, dl_low, dl_offset, dl_last, ul_low, ul_offset = _LTE_ROWS[index]
+    if earfcn > dl_last:
+        return None
+    dl_mhz = round(dl_low + 0.1 * (earfcn - dl_offset), 1)
+    if ul_low is not None:
+        ul_mhz = round(ul_low + 0.1 * (earfcn - dl_offset), 1)
+        duplex = DUPLEX_FDD
+    elif band in (29, 32):
+        ul_mhz, duplex = None, DUPLEX_SDL
+    else:
+        ul_mhz, duplex = dl_mhz, DUPLEX_TDD
+    return Carrier(band, dl_mhz, ul_mhz, duplex)
+
+
+def nr_arfcn_to_mhz(arfcn: int | None) -> float | None:
+    """Return the reference frequency of an NR-ARFCN."""
+    if not isinstance(arfcn, int) or not 0 <= arfcn <= _NR_ARFCN_MAX:
+        return None
+    first, offset_mhz, step_mhz = _NR_RASTER[bisect_right(_NR_RASTER_STARTS, arfcn) - 1]
+    return round(offset_mhz + step_mhz * (arfcn - first), 3)
+
+
+def decode_nr_arfcn(arfcn: int | None, band_hint: int | None = None) -> Carrier | None:
+    """Return the band and DL/UL frequencies for an NR downlink NR-ARFCN.
+
+    NR bands overlap (n77/n78/n48, n2/n25, n1/n66...), so the band reported
+    by the modem is used when it covers the frequency; otherwise the
+    narrowest covering band is assumed.
+    """
+    dl_mhz = nr_arfcn_to_mhz(arfcn)
+    if dl_mhz is None:
+        return None
+    index = bisect_right(_NR_STARTS, dl_mhz) - 1
+    # Band edges are inclusive, so the top edge belongs to the segment below
+    if index > 0 and dl_mhz == _NR_STARTS[index] and not _NR_SEGMENTS[index][1]:
+        index -= 1
+    if index < 0 or dl_mhz > _NR_SEGMENTS[index][0]:
+        return Carrier(None, dl_mhz, None, None)
+    covering = _NR_SEGMENTS[index][1]
+    if not covering:
+        return Carrier(None, dl_mhz, None, None)
+    row = next((row for row in covering if row[0] == band_hint), covering[0])
+    band, dl_low, _, ul_low, duplex = row
+    if duplex == DUPLEX_FDD:
+        ul_mhz = round(dl_mhz - (dl_low - ul_low), 3)
+    elif duplex == DUPLEX_TDD:
+        ul_mhz = dl_mhz
+    else:
+        ul_mhz = None
+    return Carrier(band, dl_mhz, ul_mhz, duplex)
+
+
+def serving_nr_arfcn(data: Mapping[str, Any]) -> tuple[Any, Any]:
+    """Return the (NR-ARFCN, band) of the serving NR carrier in a snapshot."""
+    # SA carries the traffic when present, otherwise the NSA secondary leg
+    sa_cell = data.get("saCell") or {}
+    if sa_cell.get("saFreq") is not None:
+        return sa_cell.get("saFreq"), sa_cell.get("saBand")
+    nsa_cell = data.get("nsaCell") or {}
+    return nsa_cell.get("nsaFreq"), nsa_cell.get("nsaBand")
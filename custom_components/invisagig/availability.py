@@ -0,0 +1,194 @@
+"""Availability and outage tracking for InvisaGig.
+
+Each poll outcome covers the time since the previous poll with the state
+that poll saw, so an outage runs from the first failed poll to the first
+successful one. Covered time is summed into fixed size buckets, and each
+rolling window keeps running totals that buckets are added to as they fill
+and subtracted from as they age out, so a poll costs the same whether the
+window is a day or a month. Gaps longer than max_gap (Home Assistant
+stopped, or the loop stalled) are not counted either way.
+"""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+# Fields of a bucket: [index, up seconds, down seconds, outages, reboots]
+_UP, _DOWN, _OUTAGES, _REBOOTS = 1, 2, 3, 4
+
+
+class AvailabilityTracker:
+    """Rolling availability, outage log, MTBF/MTTR and reboots of one modem."""
+
+    def __init__(
+        self,
+        windows: tuple[float, ...],
+        bucket: float,
+        log_size: int,
+        max_gap: float,
+    ) -> None:
+        """Initialize."""
+        self.windows = windows
+        self.bucket = bucket
+        self.max_gap = max_gap
+        self._buckets: deque[list] = deque()
+        # Buckets popped off the left, so a window's absolute position maps
+        # to a deque index after the longest window evicts
+        self._dropped = 0
+        # Per window: [absolute position of its oldest bucket, up, down,
+        # outages, reboots]
+        self._sums = {window: [0, 0.0, 0.0, 0, 0] for window in windows}
+
+        self.outages: deque[tuple[float, float]] = deque(maxlen=log_size)
+        self.outage_start: float | None = None
+        self.reboots = 0
+        self.last_reboot: float | None = None
+        self._last: tuple[float, bool] | None = None
+        self._uptime: float | None = None
+
+    def record(self, ok: bool, now: float, uptime: float | None = None) -> None:
+        """Fold in the outcome of a poll made at wall time now."""
+        if self._last is not None:
+            last_time, last_ok = self._last
+            if now - last_time > self.max_gap or now < last_time:
+                # Nothing is known about the gap; end an outage where we lost
+                # sight of it
+                if self.outage_start is not None:
+                    self._end_outage(last_time)
+            else:
+                self._add_span(last_time, now, last_ok)
+        self._last = (now, ok)
+
+        if not ok and self.outage_start is None:
+            self.outage_start = now
+            self._count(now, _OUTAGES, 1)
+        elif ok and self.outage_start is not None:
+            self._end_outage(now)
+
+        if uptime is not None:
+            if self._uptime is not None and uptime < self._uptime:
+                self.reboots += 1
+                self.last_reboot = now - uptime
+                self._count(now, _REBOOTS, 1)
+            self._uptime = uptime
+        self._evict(now)
+
+    def _end_outage(self, end: float) -> None:
+        self.outages.append((self.outage_start, end))
+        self.outage_start = None
+
+    def _add_span(self, start: float, end: float, up: bool) -> None:
+        """Add [start, end) to the buckets it falls in."""
+        field = _UP if up else _DOWN
+        while start < end:
+            split = min(end, (start // self.bucket + 1) * self.bucket)
+            self._count(start, field, split - start)
+            start = split
+
+    def _count(self, when: float, field: int, amount: float) -> None:
+        """Add to the bucket covering when and to every window's totals.
+
+        Time only moves forward here, so that bucket is always the newest
+        one, and the newest bucket is inside every window.
+        """
+        index = int(when // self.bucket)
+        if not self._buckets or self._buckets[-1][0] < index:
+            self._buckets.append([index, 0.0, 0.0, 0, 0])
+        self._buckets[-1][field] += amount
+        for sums in self._sums.values():
+            sums[field] += amount
+
+    def _evict(self, now: float) -> None:
+        """Subtract buckets that have aged out of each window."""
+        current = int(now // self.bucket)
+        for window, sums in self._sums.items():
+            first = current - int(window // self.bucket) + 1
+            while sums[0] - self._dropped < len(self._buckets):
+                bucket = self._buckets[sums[0] - self._dropped]
+                if bucket[0] >= first:
+                    break
+                for field in (_UP, _DOWN, _OUTAGES, _REBOOTS):
+                    sums[field] -= bucket[field]
+                sums[0] += 1
+        oldest = min(sums[0] for sums in self._sums.values())
+        while self._dropped < oldest:
+            self._buckets.popleft()
+            self._dropped += 1
+
+    def availability(self, window: float) -> float | None:
+        """Return the percentage of observed time the modem answered."""
+        sums = self._sums[window]
+        observed = sums[_UP] + sums[_DOWN]
+        if not observed:
+            return None
+        return round(sums[_UP] / observed * 100, 3)
+
+    def outage_count(self, window: float) -> int:
+        """Return the outages that started within the window."""
+        return self._sums[window][_OUTAGES]
+
+    def reboot_count(self, window: float) -> int:
+        """Return the reboots detected within the window."""
+        return self._sums[window][_REBOOTS]
+
+    def mtbf(self, window: float) -> float | None:
+        """Return the mean up time between outages, in seconds."""
+        sums = self._sums[window]
+        if not sums[_OUTAGES]:
+            return None
+        return round(sums[_UP] / sums[_OUTAGES])
+
+    def mttr(self, window: float) -> float | None:
+        """Return the mean outage duration, in seconds."""
+        sums = self._sums[window]
+        if not sums[_OUTAGES]:
+            return None
+        return round(sums[_DOWN] / sums[_OUTAGES])
+
+    def outage_log(self, now: float) -> list[dict[str, Any]]:
+        """Return the logged outages, newest first, with any ongoing one."""
+        log = [(start, end) for start, end in self.outages]
+        if self.outage_start is not None:
+            log.append((self.outage_start, None))
+        return [
+            {
+                "start": start,
+                "end": end,
+                "duration": round((end if end is not None else now) - start),
+            }
+            for start, end in reversed(log)
+        ]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state to persist."""
+        return {
+            "buckets": [
+                [bucket[0], round(bucket[_UP], 1), round(bucket[_DOWN], 1), *bucket[3:]]
+                for bucket in self._buckets
+            ],
+            "outages": list(self.outages),
+            "outage_start": self.outage_start,
+            "reboots": self.reboots,
+            "last_reboot": self.last_reboot,
+            "last": self._last,
+            "uptime": self._uptime,
+        }
+
+    def restore(self, stored: dict[str, Any], now: float) -> None:
+        """Load persisted state and rebuild the window totals."""
+        self._buckets = deque(list(bucket) for bucket in stored.get("buckets", []))
+        self._dropped = 0
+        for sums in self._sums.values():
+            sums[:] = [0, 0.0, 0.0, 0, 0]
+            for bucket in self._buckets:
+                for field in (_UP, _DOWN, _OUTAGES, _REBOOTS):
+                    sums[field] += bucket[field]
+        self.outages.extend(tuple(outage) for outage in stored.get("outages", []))
+        self.outage_start = stored.get("outage_start")
+        self.reboots = stored.get("reboots", 0)
+        self.last_reboot = stored.get("last_reboot")
+        last = stored.get("last")
+        self._last = tuple(last) if last else None
+        self._uptime = stored.get("uptime")
+        self._evict(now)
+
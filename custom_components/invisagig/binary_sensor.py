@@ -1,18 +1,21 @@
 """Binary sensors for InvisaGig."""
 from __future__ import annotations
 
+import time
+
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, CONF_PREFERRED_MODE, MODE_NONE
+from .const import CONF_PREFERRED_MODE, DOMAIN, MODE_NONE
 from .coordinator import InvisaGigDataUpdateCoordinator
-from .sensor import derive_connection_mode
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -22,14 +25,65 @@ async def async_setup_entry(
     """Set up binary sensors."""
     coordinator: InvisaGigDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    # Only create if preferred mode is set to something other than none
-    preferred = entry.options.get(CONF_PREFERRED_MODE, MODE_NONE)
-    if preferred != MODE_NONE:
-        async_add_entities([InvisaGigNetworkDriftSensor(coordinator, preferred)])
+    async_add_entities(
+        [InvisaGigConnectivitySensor(coordinator), InvisaGigAnomalySensor(coordinator)]
+    )
+
+    drift: InvisaGigNetworkDriftSensor | None = None
+
+    @callback
+    def _async_sync_optional_entities() -> None:
+        """Add, update or remove the drift sensor to match the options."""
+        nonlocal drift
+        # Only create if preferred mode is set to something other than none
+        preferred = entry.options.get(CONF_PREFERRED_MODE, MODE_NONE)
+        if preferred == MODE_NONE:
+            if drift is not None and drift.entity_id:
+                er.async_get(hass).async_remove(drift.entity_id)
+            drift = None
+        elif drift is None:
+            drift = InvisaGigNetworkDriftSensor(coordinator, preferred)
+            async_add_entities([drift])
+        elif drift.preferred_mode != preferred:
+            drift.preferred_mode = preferred
+            drift.async_force_write()
+
+    _async_sync_optional_entities()
+    entry.async_on_unload(
+        coordinator.async_add_options_listener(_async_sync_optional_entities)
+    )
+
+
+class InvisaGigConnectivitySensor(CoordinatorEntity, BinarySensorEntity):
+    """Binary sensor driven by the fast reachability probe."""
+
+    _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+
+    def __init__(self, coordinator: InvisaGigDataUpdateCoordinator) -> None:
+        super().__init__(coordinator.probe)
+        self._attr_unique_id = f"{coordinator.api._host}_reachable"
+        self._attr_name = "Reachable"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, coordinator.api._host)},
+        }
+
+    @property
+    def available(self) -> bool:
+        """The probe result is meaningful even when the probe fails."""
+        return self.coordinator.data is not None
+
+    @property
+    def is_on(self) -> bool:
+        """Return true if the modem answers."""
+        return bool(self.coordinator.data)
 
 
 class InvisaGigNetworkDriftSensor(CoordinatorEntity, BinarySensorEntity):
-    """Binary sensor that alerts when network mode drifts from preferred."""
+    """Binary sensor that alerts when network mode drifts from preferred.
+
+    The debouncing lives in the coordinator's drift tracker; this entity only
+    writes state when the confirmed drift state (or availability) changes.
+    """
     
     _attr_device_class = BinarySensorDeviceClass.PROBLEM
 
@@ -41,29 +95,88 @@ class InvisaGigNetworkDriftSensor(CoordinatorEntity, BinarySensorEntity):
         self._attr_device_info = {
             "identifiers": {(DOMAIN, coordinator.api._host)},
         }
+        self._written: tuple[bool, bool] | None = None
 
     @property
     def is_on(self) -> bool:
         """Return true if ON (Problem: Drifted)."""
-        current_mode = derive_connection_mode(self.coordinator.data or {})
-        
-        # If unknown, maybe don't trigger? Or trigger? 
-        # Requirement: "If actual connection_mode drops to LTE or 5G_NSA"
-        
-        if current_mode == "UNKNOWN":
-            return False # Conservative
-            
-        if self.preferred_mode == MODE_NONE:
-            return False
-
-        if current_mode != self.preferred_mode:
-            return True
-            
-        return False
+        drift = self.coordinator.drift
+        return bool(drift and drift.drifted)
 
     @property
     def extra_state_attributes(self):
+        drift = self.coordinator.drift
+        if drift is None:
+            return {"preferred": self.preferred_mode}
+        return drift.attributes(time.monotonic())
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write state on confirmed transitions."""
+        current = (self.available, self.is_on)
+        if current == self._written:
+            return
+        self._written = current
+        self.async_write_ha_state()
+
+    @callback
+    def async_force_write(self) -> None:
+        """Write state even without a transition, e.g. after an options change."""
+        if self.hass is None:
+            return
+        self._written = (self.available, self.is_on)
+        self.async_write_ha_state()
+
+    async def async_added_to_hass(self) -> None:
+        """Record the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._written = (self.available, self.is_on)
+
+
+class InvisaGigAnomalySensor(CoordinatorEntity, BinarySensorEntity):
+    """Binary sensor that is on while any metric is anomalous.
+
+    The baselines and dwell times live in the coordinator's anomaly detector;
+    this entity only writes state when the set of anomalous metrics changes.
+    """
+
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+
+    def __init__(self, coordinator: InvisaGigDataUpdateCoordinator) -> None:
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.api._host}_anomaly"
+        self._attr_name = "Anomaly"
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, coordinator.api._host)},
+        }
+        self._written: tuple[bool, tuple[str, ...]] | None = None
+
+    @property
+    def is_on(self) -> bool:
+        """Return true if any metric is anomalous."""
+        return bool(self.coordinator.anomaly.anomalous)
+
+    @property
+    def extra_state_attributes(self):
+        anomaly = self.coordinator.anomaly
         return {
-            "preferred": self.preferred_mode,
-            "actual": derive_connection_mode(self.coordinator.data or {})
+            "metrics": {
+                metric: anomaly.describe(metric) for metric in anomaly.anomalous
+            },
+            "threshold": anomaly.threshold,
+            "duration": anomaly.duration,
         }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Only write state when the anomalous metrics change."""
+        current = (self.available, tuple(self.coordinator.anomaly.anomalous))
+        if current == self._written:
+            return
+        self._written = current
+        self.async_write_ha_state()
+
+    async def async_added_to_hass(self) -> None:
+        """Record the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._written = (self.available, tuple(self.coordinator.anomaly.anomalous))
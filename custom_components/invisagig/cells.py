@@ -0,0 +1,154 @@
+"""Per serving cell performance scoreboard for InvisaGig.
+
+Every successful poll adds its signal readings and health score to the
+running means of the cell it was served by, and the time since the previous
+poll to the dwell time of the cell that poll saw. Only the running totals
+are kept, in a table bounded to the most recently served cells.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from .drift import derive_connection_mode
+
+# Identity of a serving cell, in key order
+CELL_FIELDS = ("mcc", "mnc", "tac", "cid", "pci", "band")
+# Running means kept per cell: name -> field suffix in the cell section
+SIGNALS = {"rsrp": "Str", "rsrq": "Qal", "sinr": "Snr"}
+
+CellIdentity = tuple[Any, ...]
+
+
+def _section(data: Mapping[str, Any]) -> tuple[str, Mapping[str, Any]]:
+    """Return the field prefix and section of the serving (anchor) cell."""
+    sa_cell = data.get("saCell") or {}
+    if derive_connection_mode(data) == "5G_SA" and (
+        sa_cell.get("saCid") is not None or sa_cell.get("saPci") is not None
+    ):
+        return "sa", sa_cell
+    return "lte", data.get("lteCell") or {}
+
+
+def serving_cell(
+    data: Mapping[str, Any], mcc: str | None, mnc: str | None
+) -> tuple[CellIdentity | None, dict[str, Any]]:
+    """Return the serving cell identity and its signal readings.
+
+    The identity is None when the snapshot names no cell.
+    """
+    prefix, cell = _section(data)
+    signals = {name: cell.get(f"{prefix}{suffix}") for name, suffix in SIGNALS.items()}
+    cid = cell.get(f"{prefix}Cid")
+    pci = cell.get(f"{prefix}Pci")
+    if cid is None and pci is None:
+        return None, signals
+    tac = cell.get(f"{prefix}Tac", cell.get(f"{prefix}Lac"))
+    return (mcc, mnc, tac, cid, pci, cell.get(f"{prefix}Band")), signals
+
+
+@dataclass
+class CellStats:
+    """Running statistics of one serving cell."""
+
+    first_seen: float
+    last_seen: float
+    samples: int = 0
+    dwell: float = 0.0
+    # name -> [count, mean]; readings can be missing, so each has its own count
+    means: dict[str, list[float]] = field(default_factory=dict)
+
+    def add(self, name: str, value: Any) -> None:
+        """Fold a reading into its running mean."""
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return
+        count, mean = self.means.get(name, (0, 0.0))
+        count += 1
+        self.means[name] = [count, mean + (value - mean) / count]
+
+    def mean(self, name: str) -> float | None:
+        """Return the running mean of a reading, if there were any."""
+        if name not in self.means:
+            return None
+        return self.means[name][1]
+
+
+class CellScoreboard:
+    """Signal, health and dwell statistics per serving cell, LRU bounded."""
+
+    def __init__(self, size: int, max_gap: float) -> None:
+        """Initialize."""
+        self.size = size
+        self.max_gap = max_gap
+        self._cells: OrderedDict[CellIdentity, CellStats] = OrderedDict()
+        # The cell the last poll saw, and when
+        self.current: CellIdentity | None = None
+        self._last_poll: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def update(
+        self,
+        identity: CellIdentity | None,
+        signals: Mapping[str, Any],
+        health: int | None,
+        now: float,
+    ) -> None:
+        """Fold in a successful poll made at wall time now."""
+        if self.current is not None and self._last_poll is not None:
+            gap = now - self._last_poll
+            stats = self._cells.get(self.current)
+            if stats is not None and 0 < gap <= self.max_gap:
+                stats.dwell += gap
+        self.current = identity
+        self._last_poll = now
+        if identity is None:
+            return
+
+        stats = self._cells.get(identity)
+        if stats is None:
+            stats = self._cells[identity] = CellStats(first_seen=now, last_seen=now)
+            if len(self._cells) > self.size:
+                self._cells.popitem(last=False)
+        else:
+            self._cells.move_to_end(identity)
+        stats.last_seen = now
+        stats.samples += 1
+        for name, value in signals.items():
+            stats.add(name, value)
+        stats.add("health", health)
+
+    def ranked(self) -> list[tuple[CellIdentity, CellStats]]:
+        """Return the cells best first: by mean health, then dwell time."""
+        return sorted(
+            self._cells.items(),
+            key=lambda item: (
+                item[1].mean("health") is not None,
+                item[1].mean("health") or 0,
+                item[1].dwell,
+            ),
+            reverse=True,
+        )
+
+    def rank(self, identity: CellIdentity | None) -> int | None:
+        """Return the 1-based rank of a cell, or None if it isn't tracked."""
+        for rank, (ranked_identity, _) in enumerate(self.ranked(), 1):
+            if ranked_identity == identity:
+                return rank
+        return None
+
+    def as_list(self) -> list[list[Any]]:
+        """Return the table to persist, least recently served first."""
+        return [
+            [list(identity), asdict(stats)] for identity, stats in self._cells.items()
+        ]
+
+    def restore(self, stored: list[list[Any]]) -> None:
+        """Load a persisted table."""
+        self._cells = OrderedDict(
+            (tuple(identity), CellStats(**stats))
+            for identity, stats in stored[-self.size :]
+        )
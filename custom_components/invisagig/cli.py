@@ -0,0 +1,145 @@
+"""Poll a fleet of InvisaGig modems from the command line.
+
+    python -m custom_components.invisagig.cli 192.168.225.1 10.0.0.0/28
+    python -m custom_components.invisagig.cli -f hosts.txt --format csv
+
+Writes one NDJSON object or CSV row per host to stdout as each poll
+completes. Needs only aiohttp and async_timeout, not Home Assistant.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+from collections.abc import Sequence
+from typing import Any, TextIO
+
+import aiohttp
+
+from .const import CLI_CONCURRENCY, DEFAULT_PORT_HTTP, DEFAULT_PORT_HTTPS
+from .discovery import expand_candidates
+from .snapshot import RECORD_FIELDS, async_poll
+
+FORMAT_NDJSON = "ndjson"
+FORMAT_CSV = "csv"
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="invisagig",
+        description="Poll InvisaGig modems and stream their telemetry to stdout.",
+    )
+    parser.add_argument("hosts", nargs="*", help="hosts, IPs or CIDR ranges")
+    parser.add_argument(
+        "-f",
+        "--hosts-file",
+        type=argparse.FileType("r"),
+        help="file with one host or range per line ('-' for stdin, # comments)",
+    )
+    parser.add_argument(
+        "--format", choices=(FORMAT_NDJSON, FORMAT_CSV), default=FORMAT_NDJSON
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=CLI_CONCURRENCY,
+        help=f"modems polled at once (default {CLI_CONCURRENCY})",
+    )
+    parser.add_argument("--port", type=int, help="port (default 80, or 443 with --ssl)")
+    parser.add_argument("--ssl", action="store_true", help="use https")
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="include the full snapshot as 'data' (ndjson only)",
+    )
+    return parser
+
+
+def _read_hosts(args: argparse.Namespace) -> list[str]:
+    candidates = list(args.hosts)
+    if args.hosts_file is not None:
+        for line in args.hosts_file:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                candidates.append(line)
+    return expand_candidates(candidates)
+
+
+class _Writer:
+    """Stream records in the chosen format, flushing after each one."""
+
+    def __init__(self, out: TextIO, output_format: str, raw: bool) -> None:
+        self._out = out
+        self._raw = raw and output_format == FORMAT_NDJSON
+        self._csv = None
+        if output_format == FORMAT_CSV:
+            self._csv = csv.DictWriter(
+                out, fieldnames=RECORD_FIELDS, extrasaction="ignore"
+            )
+            self._csv.writeheader()
+
+    def write(self, record: dict[str, Any], data: dict[str, Any] | None) -> None:
+        if self._csv is not None:
+            self._csv.writerow(record)
+        else:
+            if self._raw:
+                record = {**record, "data": data}
+            self._out.write(json.dumps(record, separators=(",", ":"), default=str))
+            self._out.write("\n")
+        self._out.flush()
+
+
+async def async_poll_fleet(
+    hosts: Sequence[str],
+    writer: _Writer,
+    port: int,
+    use_ssl: bool,
+    concurrency: int,
+) -> int:
+    """Poll every host, at most concurrency at a time; return the failure count."""
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def _poll(session: aiohttp.ClientSession, host: str):
+        async with semaphore:
+            return await async_poll(session, host, port, use_ssl)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [asyncio.ensure_future(_poll(session, host)) for host in hosts]
+        for future in asyncio.as_completed(tasks):
+            record, data = await future
+            failures += not record["ok"]
+            writer.write(record, data)
+    return failures
+
+
+async def async_main(
+    argv: Sequence[str] | None = None, out: TextIO | None = None
+) -> int:
+    """Run the CLI; exits 1 if any host failed, 2 on bad arguments."""
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    hosts = _read_hosts(args)
+    if not hosts:
+        parser.error("no hosts given")
+    port = args.port or (DEFAULT_PORT_HTTPS if args.ssl else DEFAULT_PORT_HTTP)
+    writer = _Writer(out or sys.stdout, args.format, args.raw)
+    failures = await async_poll_fleet(hosts, writer, port, args.ssl, args.concurrency)
+    return 1 if failures else 0
+
+
+def main() -> None:
+    try:
+        sys.exit(asyncio.run(async_main()))
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
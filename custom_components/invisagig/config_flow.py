@@ -1,46 +1,117 @@
 """Config flow for InvisaGig integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
+import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
-
 from homeassistant import config_entries
-from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL, CONF_NAME
+from homeassistant.components import network
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_SCAN_INTERVAL
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
-import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
 
-from .api import InvisaGigApiClient
+from .api import InvisaGigApiClient, parse_endpoints
 from .const import (
-    DOMAIN,
-    CONF_USE_SSL,
+    CONF_ANOMALY_DURATION,
+    CONF_ANOMALY_THRESHOLD,
+    CONF_DRIFT_CLEAR_DWELL,
+    CONF_DRIFT_MIN_DWELL,
+    CONF_DRIFT_WINDOW,
+    CONF_ENDPOINTS,
+    CONF_HEALTH_NR_WEIGHT,
+    CONF_HEALTH_RSRP_MAX,
+    CONF_HEALTH_RSRP_MIN,
+    CONF_HEALTH_RSRP_WEIGHT,
+    CONF_HEALTH_RSRQ_MAX,
+    CONF_HEALTH_RSRQ_MIN,
+    CONF_HEALTH_RSRQ_WEIGHT,
+    CONF_HEALTH_SINR_MAX,
+    CONF_HEALTH_SINR_MIN,
+    CONF_HEALTH_SINR_WEIGHT,
+    CONF_HEALTH_SMOOTHING,
     CONF_INCLUDE_RAW_JSON,
-    CONF_PREFERRED_MODE,
+    CONF_MAX_RESPONSE_SIZE,
     CONF_MCC,
+    CONF_METRICS,
     CONF_MNC,
-    DEFAULT_NAME,
+    CONF_PARSE_THRESHOLD,
+    CONF_PHASE_LOCK,
+    CONF_PREFERRED_MODE,
+    CONF_RSRP_DEADBAND,
+    CONF_RSRP_STEP,
+    CONF_RSRQ_DEADBAND,
+    CONF_RSRQ_STEP,
+    CONF_SCAN_CANDIDATES,
+    CONF_SCAN_LOCAL,
+    CONF_SIM1_QUOTA,
+    CONF_SIM2_QUOTA,
+    CONF_SINR_DEADBAND,
+    CONF_SINR_STEP,
+    CONF_USE_SSL,
+    DATA_SEEDS,
+    DEFAULT_ANOMALY_DURATION,
+    DEFAULT_ANOMALY_THRESHOLD,
+    DEFAULT_DEADBAND,
+    DEFAULT_DRIFT_CLEAR_DWELL,
+    DEFAULT_DRIFT_MIN_DWELL,
+    DEFAULT_DRIFT_WINDOW,
+    DEFAULT_HEALTH_NR_WEIGHT,
+    DEFAULT_HEALTH_RSRP_MAX,
+    DEFAULT_HEALTH_RSRP_MIN,
+    DEFAULT_HEALTH_RSRP_WEIGHT,
+    DEFAULT_HEALTH_RSRQ_MAX,
+    DEFAULT_HEALTH_RSRQ_MIN,
+    DEFAULT_HEALTH_RSRQ_WEIGHT,
+    DEFAULT_HEALTH_SINR_MAX,
+    DEFAULT_HEALTH_SINR_MIN,
+    DEFAULT_HEALTH_SINR_WEIGHT,
+    DEFAULT_HEALTH_SMOOTHING,
     DEFAULT_HOST,
+    DEFAULT_INCLUDE_RAW_JSON,
+    DEFAULT_MAX_RESPONSE_SIZE,
+    DEFAULT_METRICS,
+    DEFAULT_NAME,
+    DEFAULT_PARSE_THRESHOLD,
+    DEFAULT_PHASE_LOCK,
     DEFAULT_PORT_HTTP,
     DEFAULT_PORT_HTTPS,
-    DEFAULT_USE_SSL,
+    DEFAULT_PREFERRED_MODE,
+    DEFAULT_QUOTA,
     DEFAULT_SCAN_INTERVAL,
-    MIN_SCAN_INTERVAL,
+    DEFAULT_STEP,
+    DEFAULT_USE_SSL,
+    DOMAIN,
     MAX_SCAN_INTERVAL,
-    DEFAULT_INCLUDE_RAW_JSON,
-    DEFAULT_PREFERRED_MODE,
-    MODE_NONE,
-    MODE_LTE,
+    MIN_SCAN_INTERVAL,
     MODE_5G_NSA,
     MODE_5G_SA,
+    MODE_LTE,
+    MODE_NONE,
     TIMEOUT,
 )
+from .discovery import async_discover, local_subnets
+from .health import HealthConfig
 
 _LOGGER = logging.getLogger(__name__)
 
+PICK_MANUAL = "manual"
+
+STEP_USER_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_HOST, default=DEFAULT_HOST): str,
+        vol.Optional(CONF_NAME, default=DEFAULT_NAME): str,
+        vol.Optional(CONF_USE_SSL, default=DEFAULT_USE_SSL): bool,
+        vol.Optional(CONF_SCAN_LOCAL, default=False): bool,
+        vol.Optional(CONF_SCAN_CANDIDATES): str,
+    }
+)
+
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect."""
@@ -68,14 +139,29 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     if not model:
         raise InvalidAuth("Missing model in response")
 
+    _seed(hass, host, result)
+
     return {"title": data.get(CONF_NAME, DEFAULT_NAME)}
 
 
+def _seed(hass: HomeAssistant, host: str, data: dict[str, Any]) -> None:
+    """Let the new entry start from this snapshot instead of fetching again."""
+    hass.data.setdefault(DATA_SEEDS, {})[host] = (dt_util.utcnow(), data)
+
+
 class InvisaGigConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for InvisaGig."""
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self._discovered: dict[str, str] = {}
+        self._snapshots: dict[str, dict[str, Any]] = {}
+        self._scan_candidates: list[str] = []
+        self._scan_local = False
+        self._scan_task: asyncio.Task[bool] | None = None
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -83,10 +169,25 @@ class InvisaGigConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
         description_placeholders = {"discovery_note": ""}
         
-        if user_input is not None:
+        if user_input is not None and (
+            user_input.get(CONF_SCAN_LOCAL) or user_input.get(CONF_SCAN_CANDIDATES)
+        ):
+            # Scan the local network and/or the user supplied hosts/subnets
+            # instead of connecting
+            candidates = user_input.get(CONF_SCAN_CANDIDATES) or ""
+            self._scan_candidates = candidates.split(",")
+            self._scan_local = user_input.get(CONF_SCAN_LOCAL, False)
+            return await self.async_step_scan()
+        elif user_input is not None:
+             self._async_abort_entries_match({CONF_HOST: user_input[CONF_HOST]})
              try:
                 info = await validate_input(self.hass, user_input)
-                return self.async_create_entry(title=info["title"], data=user_input)
+                data = {
+                    key: value
+                    for key, value in user_input.items()
+                    if key not in (CONF_SCAN_LOCAL, CONF_SCAN_CANDIDATES)
+                }
+                return self.async_create_entry(title=info["title"], data=data)
              except CannotConnect:
                 errors["base"] = "cannot_connect"
              except InvalidAuth:
@@ -96,50 +197,123 @@ class InvisaGigConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "unknown"
 
         # Auto-Discovery Logic (Check Default IP)
-        # Only check if no user input and no errors (first run)
-        if user_input is None:
-             try:
-                # optimistic check
-                # We use a short timeout locally just to check presence
-                session = async_get_clientsession(self.hass)
-                client = InvisaGigApiClient(
-                    host=DEFAULT_HOST,
-                    port=DEFAULT_PORT_HTTP,
-                    session=session,
-                    use_ssl=DEFAULT_USE_SSL,
-                )
-                # We assume if we can get data, it's there. 
-                # Use a very short timeout for this probe
-                import async_timeout
-                async with async_timeout.timeout(2):
-                     await client.async_get_data()
-                
-                # If we get here, we found it!
-                description_placeholders = {
-                    "ip": DEFAULT_HOST,
-                    "discovery_note": f"\n\n**Success!** We detected a device at {DEFAULT_HOST}."
-                }
-                
-                # Pre-fill title placeholders if any
-                self.context["title_placeholders"] = {"name": DEFAULT_NAME}
+        # Only check if no user input (first run); the local subnets are
+        # only swept on request, from the scan step
+        if user_input is None and await self._async_discover(
+            [DEFAULT_HOST], include_local=False
+        ):
+            return await self.async_step_pick()
+
+        return self.async_show_form(
+            step_id="user",
+            data_schema=STEP_USER_DATA_SCHEMA,
+            errors=errors,
+            description_placeholders=description_placeholders,
+        )
 
-             except Exception:
-                # Not found or timeout, just show standard form
-                pass
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Scan for modems in the background, showing progress meanwhile."""
+        if self._scan_task is None:
+            self._scan_task = self.hass.async_create_task(
+                self._async_discover(self._scan_candidates, self._scan_local)
+            )
+        if not self._scan_task.done():
+            return self.async_show_progress(
+                step_id="scan",
+                progress_action="scan",
+                progress_task=self._scan_task,
+            )
+        found = self._scan_task.result()
+        self._scan_task = None
+        return self.async_show_progress_done(
+            next_step_id="pick" if found else "scan_failed"
+        )
 
+    async def async_step_scan_failed(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Return to the manual form when the scan found nothing."""
         return self.async_show_form(
             step_id="user",
+            data_schema=STEP_USER_DATA_SCHEMA,
+            errors={"base": "no_devices_found"},
+            description_placeholders={"discovery_note": ""},
+        )
+
+    async def async_step_pick(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Let the user pick one of the discovered modems."""
+        if user_input is not None:
+            host = user_input[CONF_HOST]
+            if host == PICK_MANUAL:
+                return self.async_show_form(
+                    step_id="user",
+                    data_schema=STEP_USER_DATA_SCHEMA,
+                    description_placeholders={"discovery_note": ""},
+                )
+            self._async_abort_entries_match({CONF_HOST: host})
+            # Already validated by discovery, no need to fetch again
+            if (data := self._snapshots.get(host)) is not None:
+                _seed(self.hass, host, data)
+            name = user_input.get(CONF_NAME, DEFAULT_NAME)
+            return self.async_create_entry(
+                title=name,
+                data={CONF_HOST: host, CONF_NAME: name, CONF_USE_SSL: False},
+            )
+
+        hosts = {
+            host: f"{model} ({host})" for host, model in self._discovered.items()
+        }
+        hosts[PICK_MANUAL] = "Enter manually"
+        return self.async_show_form(
+            step_id="pick",
             data_schema=vol.Schema(
                 {
-                    vol.Required(CONF_HOST, default=DEFAULT_HOST): str,
+                    vol.Required(CONF_HOST, default=next(iter(hosts))): vol.In(hosts),
                     vol.Optional(CONF_NAME, default=DEFAULT_NAME): str,
-                    vol.Optional(CONF_USE_SSL, default=DEFAULT_USE_SSL): bool,
                 }
             ),
-            errors=errors,
-            description_placeholders=description_placeholders,
+            description_placeholders={"count": str(len(self._discovered))},
         )
 
+    async def _async_discover(
+        self, candidates: list[str], include_local: bool = True
+    ) -> bool:
+        """Scan for modems, skipping hosts that are already configured."""
+        if include_local:
+            addresses: list[tuple[str, int]] = []
+            try:
+                for adapter in await network.async_get_adapters(self.hass):
+                    if not adapter["enabled"]:
+                        continue
+                    addresses.extend(
+                        (ipv4["address"], ipv4["network_prefix"])
+                        for ipv4 in adapter["ipv4"]
+                    )
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.debug("Could not list network adapters", exc_info=True)
+            candidates = [*candidates, *local_subnets(addresses)]
+
+        configured = {
+            entry.data.get(CONF_HOST) for entry in self._async_current_entries()
+        }
+        try:
+            found = await async_discover(
+                async_get_clientsession(self.hass),
+                candidates,
+                snapshots=self._snapshots,
+            )
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.debug("Discovery failed", exc_info=True)
+            found = {}
+        self._discovered = {
+            host: model for host, model in found.items() if host not in configured
+        }
+        return bool(self._discovered)
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
@@ -158,13 +332,47 @@ class InvisaGigOptionsFlowHandler(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            try:
+                parse_endpoints(user_input.get(CONF_ENDPOINTS), DEFAULT_PORT_HTTP)
+            except ValueError:
+                errors[CONF_ENDPOINTS] = "invalid_endpoints"
+            health = HealthConfig.from_options(user_input)
+            for key, low, high in (
+                (CONF_HEALTH_RSRP_MIN, health.rsrp_min, health.rsrp_max),
+                (CONF_HEALTH_SINR_MIN, health.sinr_min, health.sinr_max),
+                (CONF_HEALTH_RSRQ_MIN, health.rsrq_min, health.rsrq_max),
+            ):
+                if low >= high:
+                    errors[key] = "invalid_health_range"
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
 
         return self.async_show_form(
             step_id="init",
+            errors=errors,
             data_schema=vol.Schema(
                 {
+                    vol.Optional(
+                        CONF_SCAN_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
+                    ),
+                    vol.Optional(
+                        CONF_PHASE_LOCK,
+                        default=self.config_entry.options.get(
+                            CONF_PHASE_LOCK, DEFAULT_PHASE_LOCK
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_ENDPOINTS,
+                        default=self.config_entry.options.get(CONF_ENDPOINTS, ""),
+                    ): str,
                     vol.Optional(
                         CONF_INCLUDE_RAW_JSON,
                         default=self.config_entry.options.get(CONF_INCLUDE_RAW_JSON, DEFAULT_INCLUDE_RAW_JSON)
@@ -173,6 +381,48 @@ class InvisaGigOptionsFlowHandler(config_entries.OptionsFlow):
                         CONF_PREFERRED_MODE,
                         default=self.config_entry.options.get(CONF_PREFERRED_MODE, DEFAULT_PREFERRED_MODE),
                     ): vol.In([MODE_NONE, MODE_LTE, MODE_5G_NSA, MODE_5G_SA]),
+                    vol.Optional(
+                        CONF_DRIFT_MIN_DWELL,
+                        default=self.config_entry.options.get(
+                            CONF_DRIFT_MIN_DWELL, DEFAULT_DRIFT_MIN_DWELL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        CONF_DRIFT_CLEAR_DWELL,
+                        default=self.config_entry.options.get(
+                            CONF_DRIFT_CLEAR_DWELL, DEFAULT_DRIFT_CLEAR_DWELL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        CONF_DRIFT_WINDOW,
+                        default=self.config_entry.options.get(
+                            CONF_DRIFT_WINDOW, DEFAULT_DRIFT_WINDOW
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=168)),
+                    vol.Optional(
+                        CONF_ANOMALY_THRESHOLD,
+                        default=self.config_entry.options.get(
+                            CONF_ANOMALY_THRESHOLD, DEFAULT_ANOMALY_THRESHOLD
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=1, max=10)),
+                    vol.Optional(
+                        CONF_ANOMALY_DURATION,
+                        default=self.config_entry.options.get(
+                            CONF_ANOMALY_DURATION, DEFAULT_ANOMALY_DURATION
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        CONF_SIM1_QUOTA,
+                        default=self.config_entry.options.get(
+                            CONF_SIM1_QUOTA, DEFAULT_QUOTA
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100000)),
+                    vol.Optional(
+                        CONF_SIM2_QUOTA,
+                        default=self.config_entry.options.get(
+                            CONF_SIM2_QUOTA, DEFAULT_QUOTA
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100000)),
                     vol.Optional(
                          CONF_MCC,
                          default=self.config_entry.options.get(CONF_MCC, 0)
@@ -181,10 +431,72 @@ class InvisaGigOptionsFlowHandler(config_entries.OptionsFlow):
                          CONF_MNC,
                          default=self.config_entry.options.get(CONF_MNC, 0)
                     ): int,
+                    **self._health_schema(),
+                    **self._write_filter_schema(),
+                    vol.Optional(
+                        CONF_METRICS,
+                        default=self.config_entry.options.get(
+                            CONF_METRICS, DEFAULT_METRICS
+                        ),
+                    ): bool,
+                    vol.Optional(
+                        CONF_PARSE_THRESHOLD,
+                        default=self.config_entry.options.get(
+                            CONF_PARSE_THRESHOLD, DEFAULT_PARSE_THRESHOLD
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=16384)),
+                    vol.Optional(
+                        CONF_MAX_RESPONSE_SIZE,
+                        default=self.config_entry.options.get(
+                            CONF_MAX_RESPONSE_SIZE, DEFAULT_MAX_RESPONSE_SIZE
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=16, max=65536)),
                 }
             ),
         )
 
+    def _write_filter_schema(self) -> dict:
+        """Build the per-signal deadband and rounding fields."""
+        options = self.config_entry.options
+        validator = vol.All(vol.Coerce(float), vol.Range(min=0, max=20))
+        fields = {
+            CONF_RSRP_DEADBAND: DEFAULT_DEADBAND,
+            CONF_RSRQ_DEADBAND: DEFAULT_DEADBAND,
+            CONF_SINR_DEADBAND: DEFAULT_DEADBAND,
+            CONF_RSRP_STEP: DEFAULT_STEP,
+            CONF_RSRQ_STEP: DEFAULT_STEP,
+            CONF_SINR_STEP: DEFAULT_STEP,
+        }
+        return {
+            vol.Optional(key, default=options.get(key, default)): validator
+            for key, default in fields.items()
+        }
+
+    def _health_schema(self) -> dict:
+        """Build the connection health weight/threshold fields."""
+        options = self.config_entry.options
+        weight = vol.All(vol.Coerce(int), vol.Range(min=0, max=100))
+        fields = {
+            CONF_HEALTH_RSRP_WEIGHT: (DEFAULT_HEALTH_RSRP_WEIGHT, weight),
+            CONF_HEALTH_SINR_WEIGHT: (DEFAULT_HEALTH_SINR_WEIGHT, weight),
+            CONF_HEALTH_RSRQ_WEIGHT: (DEFAULT_HEALTH_RSRQ_WEIGHT, weight),
+            CONF_HEALTH_NR_WEIGHT: (DEFAULT_HEALTH_NR_WEIGHT, weight),
+            CONF_HEALTH_RSRP_MIN: (DEFAULT_HEALTH_RSRP_MIN, int),
+            CONF_HEALTH_RSRP_MAX: (DEFAULT_HEALTH_RSRP_MAX, int),
+            CONF_HEALTH_SINR_MIN: (DEFAULT_HEALTH_SINR_MIN, int),
+            CONF_HEALTH_SINR_MAX: (DEFAULT_HEALTH_SINR_MAX, int),
+            CONF_HEALTH_RSRQ_MIN: (DEFAULT_HEALTH_RSRQ_MIN, int),
+            CONF_HEALTH_RSRQ_MAX: (DEFAULT_HEALTH_RSRQ_MAX, int),
+            CONF_HEALTH_SMOOTHING: (
+                DEFAULT_HEALTH_SMOOTHING,
+                vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+            ),
+        }
+        return {
+            vol.Optional(key, default=options.get(key, default)): validator
+            for key, (default, validator) in fields.items()
+        }
+
 
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
@@ -6,6 +6,37 @@ CONF_INCLUDE_RAW_JSON = "include_raw_json"
 CONF_MCC = "mcc"
 CONF_MNC = "mnc"
 CONF_PREFERRED_MODE = "preferred_mode"
+CONF_SCAN_CANDIDATES = "scan_candidates"
+CONF_SCAN_LOCAL = "scan_local"
+CONF_PARSE_THRESHOLD = "parse_threshold"
+CONF_MAX_RESPONSE_SIZE = "max_response_size"
+CONF_HEALTH_RSRP_WEIGHT = "health_rsrp_weight"
+CONF_HEALTH_SINR_WEIGHT = "health_sinr_weight"
+CONF_HEALTH_RSRQ_WEIGHT = "health_rsrq_weight"
+CONF_HEALTH_NR_WEIGHT = "health_nr_weight"
+CONF_HEALTH_RSRP_MIN = "health_rsrp_min"
+CONF_HEALTH_RSRP_MAX = "health_rsrp_max"
+CONF_HEALTH_SINR_MIN = "health_sinr_min"
+CONF_HEALTH_SINR_MAX = "health_sinr_max"
+CONF_HEALTH_RSRQ_MIN = "health_rsrq_min"
+CONF_HEALTH_RSRQ_MAX = "health_rsrq_max"
+CONF_HEALTH_SMOOTHING = "health_smoothing"
+CONF_DRIFT_MIN_DWELL = "drift_min_dwell"
+CONF_DRIFT_CLEAR_DWELL = "drift_clear_dwell"
+CONF_DRIFT_WINDOW = "drift_window"
+CONF_RSRP_DEADBAND = "rsrp_deadband"
+CONF_RSRQ_DEADBAND = "rsrq_deadband"
+CONF_SINR_DEADBAND = "sinr_deadband"
+CONF_RSRP_STEP = "rsrp_step"
+CONF_RSRQ_STEP = "rsrq_step"
+CONF_SINR_STEP = "sinr_step"
+CONF_METRICS = "enable_metrics"
+CONF_ENDPOINTS = "endpoints"
+CONF_PHASE_LOCK = "phase_lock"
+CONF_ANOMALY_THRESHOLD = "anomaly_threshold"
+CONF_ANOMALY_DURATION = "anomaly_duration"
+CONF_SIM1_QUOTA = "sim1_quota"
+CONF_SIM2_QUOTA = "sim2_quota"
 
 DEFAULT_SCAN_INTERVAL = 60
 MIN_SCAN_INTERVAL = 60
@@ -18,10 +49,99 @@ DEFAULT_PORT_HTTPS = 443
 DEFAULT_USE_SSL = False
 DEFAULT_INCLUDE_RAW_JSON = False
 DEFAULT_PREFERRED_MODE = "none"
+DEFAULT_HEALTH_RSRP_WEIGHT = 40
+DEFAULT_HEALTH_SINR_WEIGHT = 40
+DEFAULT_HEALTH_RSRQ_WEIGHT = 20
+DEFAULT_HEALTH_NR_WEIGHT = 50
+DEFAULT_HEALTH_RSRP_MIN = -120
+DEFAULT_HEALTH_RSRP_MAX = -80
+DEFAULT_HEALTH_SINR_MIN = 0
+DEFAULT_HEALTH_SINR_MAX = 20
+DEFAULT_HEALTH_RSRQ_MIN = -20
+DEFAULT_HEALTH_RSRQ_MAX = -10
+DEFAULT_HEALTH_SMOOTHING = 5  # samples
+DEFAULT_DRIFT_MIN_DWELL = 120  # seconds off preferred before alerting
+DEFAULT_DRIFT_CLEAR_DWELL = 300  # seconds back on preferred before clearing
+DEFAULT_DRIFT_WINDOW = 24  # hours
+DEFAULT_PARSE_THRESHOLD = 64  # KiB
+DEFAULT_MAX_RESPONSE_SIZE = 1024  # KiB
+DEFAULT_DEADBAND = 0  # dB change needed before a signal state is written, 0 = off
+DEFAULT_STEP = 0  # dB a signal value is rounded to, 0 = off
+DEFAULT_METRICS = False
+DEFAULT_PHASE_LOCK = True
+DEFAULT_ANOMALY_THRESHOLD = 3.0  # standard deviations from the rolling mean
+DEFAULT_ANOMALY_DURATION = 300  # seconds a deviation must last to be an anomaly
+DEFAULT_QUOTA = 0  # GB per billing cycle, 0 = no quota
 
 MODE_LTE = "LTE"
 MODE_5G_NSA = "5G_NSA"
 MODE_5G_SA = "5G_SA"
 MODE_NONE = "none"
 
+DATA_SEEDS = f"{DOMAIN}_seeds"
+DATA_BROADCASTS = f"{DOMAIN}_broadcasts"
+EVENT_ANOMALY = f"{DOMAIN}_anomaly"
+
+SERVICE_REFRESH = "refresh"
+SERVICE_GET_HISTORY = "get_history"
+ATTR_ENTRY_ID = "entry_id"
+ATTR_DEVICE_ID = "device_id"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_METRICS = "metrics"
+ATTR_RESOLUTION = "resolution"
+ATTR_AGGREGATE = "aggregate"
+STORAGE_VERSION = 1
+SAVE_DELAY = 60  # seconds, snapshots are flushed at shutdown regardless
+SEED_MAX_AGE = 300  # seconds a config flow snapshot may seed the first refresh
+
 TIMEOUT = 10
+PARSE_EXECUTOR_THRESHOLD = DEFAULT_PARSE_THRESHOLD * 1024  # bytes
+MAX_RESPONSE_BYTES = DEFAULT_MAX_RESPONSE_SIZE * 1024
+READ_CHUNK_SIZE = 16 * 1024
+JSON_ERROR_EXCERPT = 80  # characters logged either side of a JSON error
+PARSE_CACHE_SIZE = 128  # raw values remembered per sensor value converter
+COALESCE_WINDOW = 2  # seconds a fetched snapshot is shared with later callers
+MANUAL_REFRESH_MIN_INTERVAL = 10  # seconds between honoured refresh service calls
+BOOT_TIME_TOLERANCE = 10  # seconds of last boot jitter ignored between polls
+PROBE_INTERVAL = 10  # seconds between reachability probes
+PROBE_TIMEOUT = 2
+
+# Alternate addresses (LAN, Tailscale...) of one modem
+ENDPOINT_INITIAL_TIMEOUT = 4  # seconds an unmeasured path gets before failing over
+ENDPOINT_MIN_TIMEOUT = 2  # floor for the SRTT-based failover timeout
+ENDPOINT_RETRY_INTERVAL = 60  # seconds a failed path is skipped, doubling per failure
+ENDPOINT_MAX_RETRY_INTERVAL = 900
+ENDPOINT_STALE_AFTER = 600  # seconds before a standby path is measured again
+
+# Aligning polls with the modem's own info.json refresh
+DEVICE_REFRESH_PERIOD = 60  # seconds, nominal; the actual period is learned
+PHASE_MARGIN = 2  # seconds polled after the latest possible refresh
+PHASE_LOCK_WIDTH = 3  # seconds of phase uncertainty considered locked
+PHASE_DRIFT_RATE = 2e-4  # window widening per second to follow clock drift
+PHASE_RECHECK_POLLS = 30  # polls between checks that the refresh hasn't moved earlier
+PHASE_MIN_DELAY = 1  # seconds
+
+# Rolling availability and outage tracking
+AVAILABILITY_WINDOWS = {"24h": 24 * 3600, "7d": 7 * 24 * 3600, "30d": 30 * 24 * 3600}
+AVAILABILITY_BUCKET = 900  # seconds of poll outcomes summed per bucket
+AVAILABILITY_MAX_GAP_POLLS = 3  # longer gaps between polls are not counted
+OUTAGE_LOG_SIZE = 20
+# Rolling anomaly detection
+ANOMALY_ALPHA = 0.02  # weight of each poll in the rolling mean and variance
+ANOMALY_WARMUP = 30  # polls learned before a metric can be anomalous
+
+# Billing cycle usage forecasts
+USAGE_MIN_SPAN = 6 * 3600  # seconds of samples in a cycle before forecasting
+MB_PER_GB = 1000  # carriers count quotas in decimal units
+
+HISTORY_SIZE = 1440  # polls of metric history kept in memory, a day at 60 s
+
+CELL_TABLE_SIZE = 32  # serving cells kept in the scoreboard, least recent evicted
+
+DISCOVERY_CONCURRENCY = 64
+DISCOVERY_CONNECT_TIMEOUT = 0.3
+DISCOVERY_FETCH_TIMEOUT = 2
+DISCOVERY_MAX_HOSTS = 1024
+
+CLI_CONCURRENCY = 16  # modems polled at once by the fleet CLI
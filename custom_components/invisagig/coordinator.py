@@ -2,23 +2,106 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta, datetime
+import time
+from collections import deque
+from collections.abc import Callable, Mapping
+from datetime import datetime, timedelta
+from statistics import median
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
-from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.util import dt as dt_util
 
+from .anomaly import METRICS, AnomalyDetector
 from .api import (
     InvisaGigApiClient,
     InvisaGigApiClientAuthenticationError,
     InvisaGigApiClientError,
+    parse_endpoints,
+)
+from .availability import AvailabilityTracker
+from .cells import CellScoreboard, serving_cell
+from .const import (
+    ANOMALY_ALPHA,
+    ANOMALY_WARMUP,
+    AVAILABILITY_BUCKET,
+    AVAILABILITY_MAX_GAP_POLLS,
+    AVAILABILITY_WINDOWS,
+    BOOT_TIME_TOLERANCE,
+    CELL_TABLE_SIZE,
+    CONF_ANOMALY_DURATION,
+    CONF_ANOMALY_THRESHOLD,
+    CONF_DRIFT_CLEAR_DWELL,
+    CONF_DRIFT_MIN_DWELL,
+    CONF_DRIFT_WINDOW,
+    CONF_ENDPOINTS,
+    CONF_HEALTH_SMOOTHING,
+    CONF_MAX_RESPONSE_SIZE,
+    CONF_MCC,
+    CONF_METRICS,
+    CONF_MNC,
+    CONF_PARSE_THRESHOLD,
+    CONF_PHASE_LOCK,
+    CONF_PREFERRED_MODE,
+    CONF_RSRP_DEADBAND,
+    CONF_RSRP_STEP,
+    CONF_RSRQ_DEADBAND,
+    CONF_RSRQ_STEP,
+    CONF_SIM1_QUOTA,
+    CONF_SIM2_QUOTA,
+    CONF_SINR_DEADBAND,
+    CONF_SINR_STEP,
+    DATA_SEEDS,
+    DEFAULT_ANOMALY_DURATION,
+    DEFAULT_ANOMALY_THRESHOLD,
+    DEFAULT_DEADBAND,
+    DEFAULT_DRIFT_CLEAR_DWELL,
+    DEFAULT_DRIFT_MIN_DWELL,
+    DEFAULT_DRIFT_WINDOW,
+    DEFAULT_HEALTH_SMOOTHING,
+    DEFAULT_MAX_RESPONSE_SIZE,
+    DEFAULT_METRICS,
+    DEFAULT_PARSE_THRESHOLD,
+    DEFAULT_PHASE_LOCK,
+    DEFAULT_PREFERRED_MODE,
+    DEFAULT_QUOTA,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STEP,
+    DEVICE_REFRESH_PERIOD,
+    DOMAIN,
+    EVENT_ANOMALY,
+    HISTORY_SIZE,
+    MANUAL_REFRESH_MIN_INTERVAL,
+    MB_PER_GB,
+    MODE_NONE,
+    OUTAGE_LOG_SIZE,
+    PHASE_DRIFT_RATE,
+    PHASE_LOCK_WIDTH,
+    PHASE_MARGIN,
+    PHASE_MIN_DELAY,
+    PHASE_RECHECK_POLLS,
+    PROBE_INTERVAL,
+    SAVE_DELAY,
+    SEED_MAX_AGE,
+    STORAGE_VERSION,
+    USAGE_MIN_SPAN,
 )
-from .const import DOMAIN, CONF_MCC, CONF_MNC
+from .drift import ModeDriftTracker, derive_connection_mode
+from .health import HealthConfig, compute_health
+from .history import MetricHistory
+from .metrics import TYPE_COUNTER, TYPE_GAUGE, Families, collect
+from .parsers import parse_boot_time
+from .phase import RefreshPhaseTracker
+from .plmn import Plmn, plmn_identity, resolve_plmn
+from .usage import UsageTracker
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,19 +123,348 @@ class InvisaGigDataUpdateCoordinator(DataUpdateCoordinator):
             hass=hass,
             logger=_LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=60),  # Will be updated from config
+            update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
         )
         self.api = client
+        # update_interval is moved per poll to follow the modem's refresh;
+        # this is the configured cadence it is derived from
+        self.scan_interval = self.update_interval
+        self.phase: RefreshPhaseTracker | None = None
+
+        # Derived values, computed once per snapshot
+        self.health_config = HealthConfig()
+        self.health: dict[str, Any] | None = None
+        self.health_smoothed: int | None = None
+        self._health_history: deque[int] = deque(maxlen=DEFAULT_HEALTH_SMOOTHING)
+        self.drift: ModeDriftTracker | None = None
+        self.last_boot: datetime | None = None
+        self.availability = AvailabilityTracker(
+            tuple(AVAILABILITY_WINDOWS.values()),
+            AVAILABILITY_BUCKET,
+            OUTAGE_LOG_SIZE,
+            AVAILABILITY_MAX_GAP_POLLS * DEFAULT_SCAN_INTERVAL,
+        )
+        self.cells = CellScoreboard(
+            CELL_TABLE_SIZE, AVAILABILITY_MAX_GAP_POLLS * DEFAULT_SCAN_INTERVAL
+        )
+        self.anomaly = AnomalyDetector(
+            ANOMALY_ALPHA,
+            ANOMALY_WARMUP,
+            DEFAULT_ANOMALY_THRESHOLD,
+            DEFAULT_ANOMALY_DURATION,
+        )
+        self.usage = UsageTracker(USAGE_MIN_SPAN)
+        self.history = MetricHistory(HISTORY_SIZE, (*METRICS, "health"))
+        # {SIM slot: data quota in MB}, only for SIMs with a quota set
+        self.quotas: dict[str, float] = {}
+
+        # {filter kind: (deadband, step)} applied by signal sensors
+        self.write_filters: dict[str, tuple[float, float]] = {}
+        self.suppressed_writes = 0
+
+        self.metrics_enabled = False
+        self._metrics: Families | None = None
+        self._metrics_source: tuple | None = None
+        # Bumped whenever the snapshot or anything derived from it changes
+        self._revision = 0
+
+        self.probe: InvisaGigProbeCoordinator | None = None
+        self._probe_was_up: bool | None = None
+
+        self.poll_stats: dict[str, Any] = {}
+        self._mcc_override = None
+        self._mnc_override = None
+        self.plmn: Plmn | None = None
+        self._plmn_identity: tuple | None = None
+        self._options_listeners: list[Callable[[], None]] = []
+
+        self._last_manual_refresh: float | None = None
+
+        self._store: Store | None = None
+        self._seed: dict[str, Any] | None = None
+        self.restored = False
+
+    async def async_restore(self) -> bool:
+        """Restore the last good snapshot so entities start with values.
+
+        Returns False when there is nothing to restore; entities then stay
+        unavailable until the first live refresh succeeds.
+        """
+        self._store = Store(
+            self.hass, STORAGE_VERSION, f"{DOMAIN}.{self.config_entry.entry_id}"
+        )
+        stored = await self._store.async_load()
+        if (stored or {}).get("availability"):
+            self.availability.restore(stored["availability"], time.time())
+        if (stored or {}).get("cells"):
+            self.cells.restore(stored["cells"])
+        if (stored or {}).get("anomaly"):
+            self.anomaly.restore(stored["anomaly"])
+        if (stored or {}).get("usage"):
+            self.usage.restore(stored["usage"])
+        snapshot = (stored or {}).get("snapshot")
+        if not snapshot:
+            self.last_update_success = False
+            return False
+
+        self._update_health(snapshot)
+        self._update_last_boot(snapshot)
+        self._update_plmn(snapshot)
+        self.data = snapshot
+        self.restored = True
+        return True
+
+    def consume_seed(self) -> bool:
+        """Use the snapshot fetched by the config flow for the first refresh."""
+        seeds = self.hass.data.get(DATA_SEEDS, {})
+        seed = seeds.pop(self.api._host, None)
+        if seed is None:
+            return False
+        fetched, data = seed
+        if (dt_util.utcnow() - fetched).total_seconds() > SEED_MAX_AGE:
+            return False
+        self._seed = data
+        return True
+
+    @callback
+    def _data_to_store(self) -> dict[str, Any]:
+        """Return the state persisted between restarts."""
+        return {
+            "snapshot": self.data,
+            "availability": self.availability.as_dict(),
+            "cells": self.cells.as_list(),
+            "anomaly": self.anomaly.as_dict(),
+            "usage": self.usage.as_dict(),
+        }
+
+    @callback
+    def async_add_options_listener(
+        self, update_callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Register a platform callback run after options are applied in place."""
+        self._options_listeners.append(update_callback)
 
+        @callback
+        def remove_listener() -> None:
+            self._options_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_options_updated(self, options: Mapping[str, Any]) -> None:
+        """Reconfigure in place and let the platforms add or remove entities."""
+        health_config = self.health_config
+        self.update_options(options)
+        if self.health_config != health_config:
+            # Scores under the old weights don't mix with new ones: restart
+            # the smoothing window from the current snapshot
+            self._health_history.clear()
+            if self.data is not None:
+                self._update_health(self.data)
+        elif self._health_history:
+            # The smoothing window may have shrunk
+            self.health_smoothed = round(median(self._health_history))
+        if self.data is not None:
+            # Resolved again only if the MCC/MNC overrides changed
+            self._update_plmn(self.data)
+        self._revision += 1
+        for update_callback in list(self._options_listeners):
+            update_callback()
+        self.async_update_listeners()
+
+    async def async_manual_refresh(self) -> bool:
+        """Refresh on request, at most once per MANUAL_REFRESH_MIN_INTERVAL.
+
+        Returns False when the call was rate limited. Calls that get through
+        are still debounced by the coordinator and coalesced per modem by the
+        API client, so they never queue duplicate fetches.
+        """
+        now = time.monotonic()
+        if (
+            self._last_manual_refresh is not None
+            and now - self._last_manual_refresh < MANUAL_REFRESH_MIN_INTERVAL
+        ):
+            return False
+        self._last_manual_refresh = now
+        await self.async_request_refresh()
+        return True
+
+    @callback
+    def async_attach_probe(
+        self, probe: InvisaGigProbeCoordinator
+    ) -> Callable[[], None]:
+        """Use a reachability probe to gate and trigger telemetry fetches."""
+        self.probe = probe
+        return probe.async_add_listener(self._handle_probe_update)
+
+    @callback
+    def _handle_probe_update(self) -> None:
+        """Refresh telemetry as soon as the modem comes back."""
+        is_up = bool(self.probe.data)
+        if is_up and self._probe_was_up is False:
+            self.hass.async_create_task(self.async_request_refresh())
+        self._probe_was_up = is_up
+
+    def update_options(self, options: Mapping[str, Any]) -> None:
+        """Apply config entry options to the running coordinator.
+
+        Called at setup and again, in place, whenever the options change, so
+        history buffers and trackers survive unless an option invalidates them.
+        """
+        if CONF_SCAN_INTERVAL in options:
+            self.scan_interval = timedelta(seconds=options[CONF_SCAN_INTERVAL])
+            self.update_interval = self.scan_interval
+        self.availability.max_gap = (
+            AVAILABILITY_MAX_GAP_POLLS * self.scan_interval.total_seconds()
+        )
+        self.cells.max_gap = self.availability.max_gap
+        self.anomaly.threshold = options.get(
+            CONF_ANOMALY_THRESHOLD, DEFAULT_ANOMALY_THRESHOLD
+        )
+        self.anomaly.duration = options.get(
+            CONF_ANOMALY_DURATION, DEFAULT_ANOMALY_DURATION
+        )
+        self.quotas = {
+            sim: quota * MB_PER_GB
+            for sim, key in (("SIM1", CONF_SIM1_QUOTA), ("SIM2", CONF_SIM2_QUOTA))
+            if (quota := options.get(key, DEFAULT_QUOTA))
+        }
+        if not options.get(CONF_PHASE_LOCK, DEFAULT_PHASE_LOCK):
+            self.phase = None
+            self.update_interval = self.scan_interval
+        elif self.phase is None:
+            self.phase = RefreshPhaseTracker(
+                DEVICE_REFRESH_PERIOD,
+                PHASE_MARGIN,
+                PHASE_LOCK_WIDTH,
+                PHASE_DRIFT_RATE,
+                PHASE_RECHECK_POLLS,
+            )
+        self.api.parse_executor_threshold = (
+            options.get(CONF_PARSE_THRESHOLD, DEFAULT_PARSE_THRESHOLD) * 1024
+        )
+        self.api.max_response_bytes = (
+            options.get(CONF_MAX_RESPONSE_SIZE, DEFAULT_MAX_RESPONSE_SIZE) * 1024
+        )
+        self.metrics_enabled = options.get(CONF_METRICS, DEFAULT_METRICS)
+        try:
+            self.api.set_alternates(
+                parse_endpoints(options.get(CONF_ENDPOINTS), self.api._port)
+            )
+        except ValueError as err:
+            _LOGGER.warning(
+                "Ignoring alternate endpoints for %s: %s", self.api._host, err
+            )
+        self._mcc_override = options.get(CONF_MCC)
+        self._mnc_override = options.get(CONF_MNC)
+
+        self.health_config = HealthConfig.from_options(options)
+        window = max(
+            1, int(options.get(CONF_HEALTH_SMOOTHING, DEFAULT_HEALTH_SMOOTHING))
+        )
+        if window != self._health_history.maxlen:
+            self._health_history = deque(self._health_history, maxlen=window)
+
+        self.write_filters = {
+            "rsrp": (
+                options.get(CONF_RSRP_DEADBAND, DEFAULT_DEADBAND),
+                options.get(CONF_RSRP_STEP, DEFAULT_STEP),
+            ),
+            "rsrq": (
+                options.get(CONF_RSRQ_DEADBAND, DEFAULT_DEADBAND),
+                options.get(CONF_RSRQ_STEP, DEFAULT_STEP),
+            ),
+            "sinr": (
+                options.get(CONF_SINR_DEADBAND, DEFAULT_DEADBAND),
+                options.get(CONF_SINR_STEP, DEFAULT_STEP),
+            ),
+        }
+
+        preferred = options.get(CONF_PREFERRED_MODE, DEFAULT_PREFERRED_MODE)
+        min_dwell = options.get(CONF_DRIFT_MIN_DWELL, DEFAULT_DRIFT_MIN_DWELL)
+        clear_dwell = options.get(CONF_DRIFT_CLEAR_DWELL, DEFAULT_DRIFT_CLEAR_DWELL)
+        drift_window = options.get(CONF_DRIFT_WINDOW, DEFAULT_DRIFT_WINDOW) * 3600
+        if preferred == MODE_NONE:
+            self.drift = None
+        elif self.drift is None or self.drift.preferred_mode != preferred:
+            self.drift = ModeDriftTracker(
+                preferred, min_dwell, clear_dwell, drift_window
+            )
+        else:
+            self.drift.min_dwell = min_dwell
+            self.drift.clear_dwell = clear_dwell
+            self.drift.window = drift_window
 
     async def _async_update_data(self):
-        """Update data via library."""
+        """Update data via library, recording the outcome for availability."""
         try:
-            data = await self.api.async_get_data()
-            
-            # Extract MCC/MNC for sensors
-            self._extract_mcc_mnc(data)
-            
+            data = await self._async_poll()
+        except (UpdateFailed, ConfigEntryAuthFailed):
+            self._record_outcome(None)
+            raise
+        self._record_outcome(data)
+        return data
+
+    def _record_outcome(self, data: dict | None) -> None:
+        """Fold a poll into the availability model and schedule a save."""
+        uptime = ((data or {}).get("timeTemp") or {}).get("upTime")
+        if not isinstance(uptime, (int, float)) or isinstance(uptime, bool):
+            uptime = None
+        self.availability.record(data is not None, time.time(), uptime)
+        if data is None and not self.last_update_success:
+            # The base class only notifies listeners when a failure follows a
+            # success, which would freeze the availability sensors for the
+            # length of an outage
+            self.async_update_listeners()
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_store, SAVE_DELAY)
+
+    async def _async_poll(self):
+        """Fetch a snapshot and update everything derived from it."""
+        # Failed polls, including ones skipped while the modem is down, fall
+        # back to the configured cadence
+        self.update_interval = self.scan_interval
+        if self.probe is not None and self.probe.data is False:
+            # Don't burn the full fetch timeout while the modem is known down;
+            # the probe requests a refresh once it answers again.
+            raise UpdateFailed(f"{self.api._host} is not reachable")
+
+        try:
+            if self._seed is not None:
+                data, self._seed = self._seed, None
+            else:
+                data = await self.api.async_get_data()
+                if self.phase is not None:
+                    # A cached document was already folded in when it was
+                    # fetched; a shared one is timed by the caller's request
+                    if self.api.request_source in ("network", "shared"):
+                        self.phase.update(data, *self.api.request_times)
+                    self._schedule_after_refresh()
+
+            start = time.perf_counter()
+
+            self._update_plmn(data)
+            self._update_health(data)
+            self._update_last_boot(data)
+            self._update_cells(data)
+            self._update_anomalies(data)
+            self.usage.update(data, time.time())
+            self._update_history(data)
+            if self.drift is not None:
+                self.drift.update(derive_connection_mode(data), time.monotonic())
+
+            derived_ms = (time.perf_counter() - start) * 1000
+            self.poll_stats = {
+                **self.api.parse_stats,
+                "derived_ms": round(derived_ms, 3),
+                "loop_block_ms": round(
+                    self.api.parse_stats.get("loop_block_ms", 0) + derived_ms, 3
+                ),
+                "threshold_bytes": self.api.parse_executor_threshold,
+            }
+
+            self.restored = False
+            self._revision += 1
             return data
             
         except InvisaGigApiClientAuthenticationError as exception:
@@ -60,63 +472,130 @@ class InvisaGigDataUpdateCoordinator(DataUpdateCoordinator):
         except InvisaGigApiClientError as exception:
             raise UpdateFailed(exception) from exception
 
-    def _extract_mcc_mnc(self, data: dict):
-        """Extract MCC/MNC from various sources in data."""
-        lte_cell = data.get("lteCell", {})
-        
-        # We need MCC/MNC for sensors
-        mcc = self.config_entry.options.get(CONF_MCC)
-        mnc = self.config_entry.options.get(CONF_MNC)
-
-        # Try to find in data (Check sim first then cell)
-        if not mcc or not mnc:
-            sim = data.get("activeSim", {})
-            mcc = sim.get("mcc")
-            mnc = sim.get("mnc")
-        
-        if not mcc or not mnc:
-            # Check lteCell
-            mcc = lte_cell.get("mcc") or lte_cell.get("plmn_mcc")
-            mnc = lte_cell.get("mnc") or lte_cell.get("plmn_mnc")
-            
-            # Check for combined PLMN string
-            if not mcc and not mnc:
-                plmn = lte_cell.get("plmn")
-                if plmn:
-                    plmn = str(plmn)
-                    if len(plmn) >= 5:
-                        mcc = plmn[:3]
-                        mnc = plmn[3:]
-        
-        # Check activeSim for PLMN if still missing
-        if not mcc or not mnc:
-             sim = data.get("activeSim", {})
-             plmn = sim.get("plmn")
-             if plmn:
-                plmn = str(plmn)
-                if len(plmn) >= 5:
-                    mcc = plmn[:3]
-                    mnc = plmn[3:]
-
-        # Fallback: Infer from Carrier Name (Best Effort)
-        if not mcc or not mnc:
-             carrier = data.get("activeSim", {}).get("carrier", "").lower()
-             if "verizon" in carrier:
-                 mcc = "311"
-                 mnc = "480"
-             elif "t-mobile" in carrier:
-                 mcc = "310"
-                 mnc = "260"
-             elif "at&t" in carrier:
-                 mcc = "310"
-                 mnc = "410"
-
-        # Persist extracted values back to data for sensors to pick up
-        if mcc and mnc:
-             if "lteCell" not in data:
-                 data["lteCell"] = {}
-             # We write them as 'mcc' and 'mnc' or update existing if None
-             if not data["lteCell"].get("mcc"):
-                 data["lteCell"]["mcc"] = str(mcc)
-             if not data["lteCell"].get("mnc"):
-                 data["lteCell"]["mnc"] = str(mnc)
+    def _schedule_after_refresh(self) -> None:
+        """Time the next poll just after the modem's next expected refresh."""
+        delay = self.phase.next_delay(
+            time.monotonic(), self.scan_interval.total_seconds()
+        )
+        if delay is not None:
+            self.update_interval = timedelta(seconds=max(delay, PHASE_MIN_DELAY))
+
+    def phase_attributes(self) -> dict[str, Any]:
+        """Return the refresh phase state for diagnostics."""
+        if self.phase is None:
+            return {}
+        return self.phase.attributes(
+            time.monotonic(), self.scan_interval.total_seconds()
+        )
+
+    def _update_health(self, data: dict) -> None:
+        """Score the new snapshot and fold it into the smoothing window."""
+        self.health = compute_health(data, self.health_config)
+        if self.health is None:
+            self.health_smoothed = None
+            return
+        self._health_history.append(self.health["score"])
+        # Median rather than mean so a single noisy sample cannot move it
+        self.health_smoothed = round(median(self._health_history))
+
+    def _update_cells(self, data: dict) -> None:
+        """Add the poll to the scoreboard entry of the serving cell."""
+        identity, signals = serving_cell(
+            data,
+            self.plmn.mcc if self.plmn else None,
+            self.plmn.mnc if self.plmn else None,
+        )
+        health = self.health["score"] if self.health else None
+        self.cells.update(identity, signals, health, time.time())
+
+    def _update_anomalies(self, data: dict) -> None:
+        """Fold the snapshot into the metric baselines; fire an event per change."""
+        for metric in self.anomaly.update(data, time.monotonic()):
+            self.hass.bus.async_fire(
+                EVENT_ANOMALY,
+                {
+                    "entry_id": self.config_entry.entry_id,
+                    "host": self.api._host,
+                    **self.anomaly.describe(metric),
+                },
+            )
+
+    def _update_history(self, data: dict) -> None:
+        """Append the snapshot's metrics and health score to the history."""
+        values = {metric: reading(data) for metric, (reading, _) in METRICS.items()}
+        values["health"] = self.health["score"] if self.health else None
+        self.history.append(time.time(), values)
+
+    def _update_last_boot(self, data: dict) -> None:
+        """Derive the boot time, moving it only when the modem restarts.
+
+        timeDate - upTime jitters by a second or two between polls; holding
+        the previous value within BOOT_TIME_TOLERANCE keeps the sensor from
+        writing a new state every poll the way the raw uptime did.
+        """
+        boot = parse_boot_time(data.get("timeTemp"))
+        if boot is None:
+            return
+        if (
+            self.last_boot is None
+            or abs((boot - self.last_boot).total_seconds()) > BOOT_TIME_TOLERANCE
+        ):
+            self.last_boot = boot.replace(microsecond=0)
+
+    def metrics_families(self) -> Families:
+        """Return OpenMetrics families for the latest snapshot.
+
+        Rebuilt only after a poll, a failed poll or an options change, so
+        scrapes in between reuse the same object.
+        """
+        source = (self._revision, self.last_update_success)
+        if self._metrics is None or source != self._metrics_source:
+            self._metrics = collect(
+                self.api._host,
+                self.data,
+                {
+                    "up": (TYPE_GAUGE, int(self.last_update_success)),
+                    "health_score": (TYPE_GAUGE, (self.health or {}).get("score")),
+                    "health_smoothed_score": (TYPE_GAUGE, self.health_smoothed),
+                    "boot_time_seconds": (
+                        TYPE_GAUGE,
+                        self.last_boot.timestamp() if self.last_boot else None,
+                    ),
+                    "drift": (
+                        TYPE_COUNTER,
+                        self.drift.drift_count if self.drift else None,
+                    ),
+                    "suppressed_writes": (TYPE_COUNTER, self.suppressed_writes),
+                },
+            )
+            self._metrics_source = source
+        return self._metrics
+
+    def _update_plmn(self, data: dict) -> None:
+        """Resolve MCC/MNC and operator, once per SIM/network identity."""
+        identity = plmn_identity(data, self._mcc_override, self._mnc_override)
+        if identity != self._plmn_identity:
+            self._plmn_identity = identity
+            self.plmn = resolve_plmn(data, self._mcc_override, self._mnc_override)
+
+
+class InvisaGigProbeCoordinator(DataUpdateCoordinator[bool]):
+    """Fast reachability probe, polled independently of the telemetry fetch."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: InvisaGigApiClient,
+    ) -> None:
+        """Initialize."""
+        super().__init__(
+            hass=hass,
+            logger=_LOGGER,
+            name=f"{DOMAIN}_probe",
+            update_interval=timedelta(seconds=PROBE_INTERVAL),
+        )
+        self.api = client
+
+    async def _async_update_data(self) -> bool:
+        """Probe the modem."""
+        return await self.api.async_probe()
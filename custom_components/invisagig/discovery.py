@@ -0,0 +1,145 @@
+"""Concurrent LAN discovery for InvisaGig modems."""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+import aiohttp
+import async_timeout
+
+from .api import InvisaGigApiClient, InvisaGigApiClientError
+from .const import (
+    DEFAULT_PORT_HTTP,
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_CONNECT_TIMEOUT,
+    DISCOVERY_FETCH_TIMEOUT,
+    DISCOVERY_MAX_HOSTS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Never sweep these even if an adapter sits on them
+_SKIP_NETWORKS = (
+    ipaddress.ip_network("127.0.0.0/8"),
+    ipaddress.ip_network("169.254.0.0/16"),
+    ipaddress.ip_network("100.64.0.0/10"),  # CGNAT / Tailscale, list hosts explicitly
+)
+
+
+def local_subnets(addresses: Iterable[tuple[str, int]]) -> list[str]:
+    """Return the /24 (or smaller) networks around local IPv4 addresses."""
+    subnets: list[str] = []
+    for address, prefix in addresses:
+        try:
+            net = ipaddress.ip_network(f"{address}/{max(prefix, 24)}", strict=False)
+        except ValueError:
+            continue
+        if net.version != 4 or any(net.subnet_of(skip) for skip in _SKIP_NETWORKS):
+            continue
+        if str(net) not in subnets:
+            subnets.append(str(net))
+    return subnets
+
+
+def expand_candidates(candidates: Iterable[str]) -> list[str]:
+    """Expand hosts, IPs and CIDR ranges into an ordered, de-duplicated host list."""
+    hosts: dict[str, None] = {}
+    for candidate in candidates:
+        candidate = candidate.strip()
+        if not candidate:
+            continue
+        if "/" not in candidate:
+            hosts[candidate] = None
+            continue
+        try:
+            net = ipaddress.ip_network(candidate, strict=False)
+        except ValueError:
+            _LOGGER.debug("Ignoring invalid discovery candidate %s", candidate)
+            continue
+        for address in net.hosts() if net.num_addresses > 1 else (net.network_address,):
+            hosts[str(address)] = None
+            if len(hosts) >= DISCOVERY_MAX_HOSTS:
+                break
+        if len(hosts) >= DISCOVERY_MAX_HOSTS:
+            _LOGGER.warning("Discovery limited to %s hosts", DISCOVERY_MAX_HOSTS)
+            break
+    return list(hosts)
+
+
+async def _async_port_open(host: str, port: int, timeout: float) -> bool:
+    """Return True if a TCP connection can be opened."""
+    try:
+        async with async_timeout.timeout(timeout):
+            _, writer = await asyncio.open_connection(host, port)
+    except (asyncio.TimeoutError, OSError):
+        return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
+
+async def _async_identify(
+    session: aiohttp.ClientSession, host: str, port: int
+) -> dict[str, Any] | None:
+    """Fetch telemetry from an open host and return it, if it is an InvisaGig.
+
+    The request isn't shared with other callers, so timing out cancels it
+    rather than leaving it running after the scan.
+    """
+    client = InvisaGigApiClient(host=host, port=port, session=session)
+    try:
+        async with async_timeout.timeout(DISCOVERY_FETCH_TIMEOUT):
+            data = await client.async_get_data(shared=False)
+    except (asyncio.TimeoutError, InvisaGigApiClientError):
+        return None
+    if not isinstance(data, dict) or not (data.get("device") or {}).get("model"):
+        return None
+    return data
+
+
+async def async_discover(
+    session: aiohttp.ClientSession,
+    candidates: Iterable[str],
+    port: int = DEFAULT_PORT_HTTP,
+    concurrency: int = DISCOVERY_CONCURRENCY,
+    connect_timeout: float = DISCOVERY_CONNECT_TIMEOUT,
+    snapshots: dict[str, dict[str, Any]] | None = None,
+) -> dict[str, str]:
+    """Scan candidates concurrently and return {host: model} for every modem found.
+
+    Each host gets a very short TCP connect first, so silent addresses cost at
+    most connect_timeout; only hosts with an open port are asked for telemetry
+    and accepted when it carries a device model. If snapshots is given, the
+    telemetry of every modem found is added to it by host.
+    """
+    hosts = expand_candidates(candidates)
+    semaphore = asyncio.Semaphore(concurrency)
+    found: dict[str, str] = {}
+
+    async def _check(host: str) -> tuple[str, dict[str, Any] | None]:
+        async with semaphore:
+            if not await _async_port_open(host, port, connect_timeout):
+                return host, None
+            return host, await _async_identify(session, host, port)
+
+    tasks = [asyncio.create_task(_check(host)) for host in hosts]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            host, data = await next_done
+            if data is not None:
+                found[host] = data["device"]["model"]
+                if snapshots is not None:
+                    snapshots[host] = data
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Report in candidate order rather than completion order
+    return {host: found[host] for host in hosts if host in found}
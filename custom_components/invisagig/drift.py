@@ -0,0 +1,143 @@
+"""Network mode drift detection for InvisaGig."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+MODE_UNKNOWN = "UNKNOWN"
+
+
+def derive_connection_mode(data):
+    active_sim = data.get("activeSim", {})
+    mode = active_sim.get("networkMode")
+
+    # Prefer activeSim.networkMode, fall back to inferring it from which of
+    # the SA/NSA metrics are present
+    if mode:
+        return mode
+
+    sa_cell = data.get("saCell", {})
+    nsa_cell = data.get("nsaCell", {})
+
+    # Check if SA has data
+    if sa_cell and any(v is not None for v in sa_cell.values()):
+        return "5G_SA"
+    if nsa_cell and any(v is not None for v in nsa_cell.values()):
+        return "5G_NSA"
+
+    return MODE_UNKNOWN
+
+
+class ModeDriftTracker:
+    """Debounced drift detector with separate enter/clear dwell times.
+
+    A drift is only confirmed after the modem has been off the preferred mode
+    for ``min_dwell`` seconds, and only cleared after it has been back on the
+    preferred mode for ``clear_dwell`` seconds. Short blips never change the
+    confirmed state.
+    """
+
+    def __init__(
+        self,
+        preferred_mode: str,
+        min_dwell: float,
+        clear_dwell: float,
+        window: float,
+    ) -> None:
+        """Initialize."""
+        self.preferred_mode = preferred_mode
+        self.min_dwell = min_dwell
+        self.clear_dwell = clear_dwell
+        self.window = window
+
+        self.drifted = False
+        self.drift_count = 0
+        self.mode: str | None = None
+        self._mode_since: float | None = None
+        self._candidate_since: float | None = None
+        self._last_update: float | None = None
+
+        # (start, end, on_preferred) segments covering the rolling window
+        self._segments: deque[list] = deque()
+        self._preferred_time = 0.0
+        self._total_time = 0.0
+
+    def update(self, mode: str, now: float) -> bool:
+        """Feed a new sample. Return True if the confirmed state changed."""
+        if self._last_update is not None and self.mode is not None:
+            self._account(self._last_update, now, self.mode == self.preferred_mode)
+        self._last_update = now
+
+        # Unknown samples neither confirm nor clear a drift
+        if mode == MODE_UNKNOWN:
+            return False
+
+        if mode != self.mode:
+            self.mode = mode
+            self._mode_since = now
+
+        off_preferred = mode != self.preferred_mode
+        if off_preferred == self.drifted:
+            self._candidate_since = None
+            return False
+
+        if self._candidate_since is None:
+            self._candidate_since = now
+        dwell = self.min_dwell if off_preferred else self.clear_dwell
+        if now - self._candidate_since < dwell:
+            return False
+
+        self.drifted = off_preferred
+        self._candidate_since = None
+        if off_preferred:
+            self.drift_count += 1
+        return True
+
+    def time_in_mode(self, now: float) -> float | None:
+        """Seconds spent in the current mode."""
+        if self._mode_since is None:
+            return None
+        return now - self._mode_since
+
+    @property
+    def preferred_percent(self) -> float | None:
+        """Percentage of the rolling window spent on the preferred mode."""
+        if not self._total_time:
+            return None
+        return round(self._preferred_time / self._total_time * 100, 1)
+
+    def attributes(self, now: float) -> dict[str, Any]:
+        """Return the tracker state for entity attributes."""
+        time_in_mode = self.time_in_mode(now)
+        return {
+            "preferred": self.preferred_mode,
+            "actual": self.mode,
+            "time_in_mode": round(time_in_mode) if time_in_mode is not None else None,
+            "drift_count": self.drift_count,
+            "preferred_percent": self.preferred_percent,
+        }
+
+    def _account(self, start: float, end: float, on_preferred: bool) -> None:
+        """Add a time span to the rolling window and evict expired spans."""
+        if end <= start:
+            return
+        last = self._segments[-1] if self._segments else None
+        if last is not None and last[2] == on_preferred and last[1] == start:
+            last[1] = end
+        else:
+            self._segments.append([start, end, on_preferred])
+        self._total_time += end - start
+        if on_preferred:
+            self._preferred_time += end - start
+
+        cutoff = end - self.window
+        while self._segments and self._segments[0][0] < cutoff:
+            seg = self._segments[0]
+            expired = min(seg[1], cutoff) - seg[0]
+            self._total_time -= expired
+            if seg[2]:
+                self._preferred_time -= expired
+            if seg[1] <= cutoff:
+                self._segments.popleft()
+            else:
+                seg[0] = cutoff
@@ -0,0 +1,145 @@
+"""Connection health scoring for InvisaGig."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    CONF_HEALTH_NR_WEIGHT,
+    CONF_HEALTH_RSRP_MAX,
+    CONF_HEALTH_RSRP_MIN,
+    CONF_HEALTH_RSRP_WEIGHT,
+    CONF_HEALTH_RSRQ_MAX,
+    CONF_HEALTH_RSRQ_MIN,
+    CONF_HEALTH_RSRQ_WEIGHT,
+    CONF_HEALTH_SINR_MAX,
+    CONF_HEALTH_SINR_MIN,
+    CONF_HEALTH_SINR_WEIGHT,
+    DEFAULT_HEALTH_NR_WEIGHT,
+    DEFAULT_HEALTH_RSRP_MAX,
+    DEFAULT_HEALTH_RSRP_MIN,
+    DEFAULT_HEALTH_RSRP_WEIGHT,
+    DEFAULT_HEALTH_RSRQ_MAX,
+    DEFAULT_HEALTH_RSRQ_MIN,
+    DEFAULT_HEALTH_RSRQ_WEIGHT,
+    DEFAULT_HEALTH_SINR_MAX,
+    DEFAULT_HEALTH_SINR_MIN,
+    DEFAULT_HEALTH_SINR_WEIGHT,
+)
+
+# section, RSRP key, SINR key, RSRQ key for each radio leg
+LTE_LEG = ("lteCell", "lteStr", "lteSnr", "lteQal")
+NSA_LEG = ("nsaCell", "nsaStr", "nsaSnr", "nsaQal")
+SA_LEG = ("saCell", "saStr", "saSnr", "saQal")
+
+
+@dataclass(frozen=True)
+class HealthConfig:
+    """Weights and thresholds used to score a snapshot."""
+
+    rsrp_weight: float = DEFAULT_HEALTH_RSRP_WEIGHT
+    sinr_weight: float = DEFAULT_HEALTH_SINR_WEIGHT
+    rsrq_weight: float = DEFAULT_HEALTH_RSRQ_WEIGHT
+    # Share (0-100) of the combined score given to the NR leg when both legs exist
+    nr_weight: float = DEFAULT_HEALTH_NR_WEIGHT
+    rsrp_min: float = DEFAULT_HEALTH_RSRP_MIN
+    rsrp_max: float = DEFAULT_HEALTH_RSRP_MAX
+    sinr_min: float = DEFAULT_HEALTH_SINR_MIN
+    sinr_max: float = DEFAULT_HEALTH_SINR_MAX
+    rsrq_min: float = DEFAULT_HEALTH_RSRQ_MIN
+    rsrq_max: float = DEFAULT_HEALTH_RSRQ_MAX
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> HealthConfig:
+        """Build a config from config entry options, falling back to defaults."""
+        defaults = cls()
+        return cls(
+            rsrp_weight=options.get(CONF_HEALTH_RSRP_WEIGHT, defaults.rsrp_weight),
+            sinr_weight=options.get(CONF_HEALTH_SINR_WEIGHT, defaults.sinr_weight),
+            rsrq_weight=options.get(CONF_HEALTH_RSRQ_WEIGHT, defaults.rsrq_weight),
+            nr_weight=options.get(CONF_HEALTH_NR_WEIGHT, defaults.nr_weight),
+            rsrp_min=options.get(CONF_HEALTH_RSRP_MIN, defaults.rsrp_min),
+            rsrp_max=options.get(CONF_HEALTH_RSRP_MAX, defaults.rsrp_max),
+            sinr_min=options.get(CONF_HEALTH_SINR_MIN, defaults.sinr_min),
+            sinr_max=options.get(CONF_HEALTH_SINR_MAX, defaults.sinr_max),
+            rsrq_min=options.get(CONF_HEALTH_RSRQ_MIN, defaults.rsrq_min),
+            rsrq_max=options.get(CONF_HEALTH_RSRQ_MAX, defaults.rsrq_max),
+        )
+
+
+def _normalize(val: float, min_val: float, max_val: float) -> float:
+    """Scale val into 0..1 between min_val (worst) and max_val (best)."""
+    if val <= min_val:
+        return 0.0
+    if val >= max_val:
+        return 1.0
+    return (val - min_val) / (max_val - min_val)
+
+
+def score_leg(
+    rsrp: float | None,
+    sinr: float | None,
+    rsrq: float | None,
+    config: HealthConfig,
+) -> dict[str, float] | None:
+    """Score a single radio leg, returning the leg score and its sub-scores."""
+    if rsrp is None or sinr is None:
+        return None
+
+    rsrp_score = _normalize(rsrp, config.rsrp_min, config.rsrp_max)
+    sinr_score = _normalize(sinr, config.sinr_min, config.sinr_max)
+    total = rsrp_score * config.rsrp_weight + sinr_score * config.sinr_weight
+    weight = config.rsrp_weight + config.sinr_weight
+    result = {
+        "rsrp_score": rsrp_score * 100,
+        "sinr_score": sinr_score * 100,
+    }
+
+    # If RSRQ is missing the remaining weights are rescaled to 100%
+    if rsrq is not None:
+        rsrq_score = _normalize(rsrq, config.rsrq_min, config.rsrq_max)
+        total += rsrq_score * config.rsrq_weight
+        weight += config.rsrq_weight
+        result["rsrq_score"] = rsrq_score * 100
+
+    result["score"] = total / weight * 100 if weight else 0.0
+    return result
+
+
+def _leg_metrics(data: dict[str, Any], leg: tuple[str, str, str, str]):
+    section = data.get(leg[0]) or {}
+    return section.get(leg[1]), section.get(leg[2]), section.get(leg[3])
+
+
+def compute_health(
+    data: dict[str, Any], config: HealthConfig
+) -> dict[str, Any] | None:
+    """Compute the combined LTE/NR health score for a snapshot."""
+    lte = score_leg(*_leg_metrics(data, LTE_LEG), config)
+
+    # SA carries the traffic when present, otherwise the NSA secondary leg
+    nr_leg = "sa"
+    nr = score_leg(*_leg_metrics(data, SA_LEG), config)
+    if nr is None:
+        nr_leg = "nsa"
+        nr = score_leg(*_leg_metrics(data, NSA_LEG), config)
+
+    if lte is None and nr is None:
+        return None
+
+    if lte is not None and nr is not None:
+        share = min(max(config.nr_weight, 0), 100) / 100
+        score = lte["score"] * (1 - share) + nr["score"] * share
+    else:
+        score = (lte or nr)["score"]
+
+    result: dict[str, Any] = {"score": round(score)}
+    for name, leg in (("lte", lte), ("nr", nr)):
+        if leg is None:
+            continue
+        for key, value in leg.items():
+            result[f"{name}_{key}"] = round(value)
+    if nr is not None:
+        result["nr_leg"] = nr_leg
+    return result
@@ -0,0 +1,125 @@
+"""In-memory columnar metric history for InvisaGig.
+
+Each metric is a fixed size ring of values next to a shared ring of poll
+timestamps, so a window is found by bisecting the timestamps and read with
+list slices, and downsampling works on those slices with built-ins.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+AGGREGATES = {
+    "mean": lambda values: round(sum(values) / len(values), 2),
+    "min": min,
+    "max": max,
+}
+
+
+class _Ring:
+    """Logical, oldest first view of the timestamp ring for bisect."""
+
+    __slots__ = ("_history",)
+
+    def __init__(self, history: MetricHistory) -> None:
+        self._history = history
+
+    def __len__(self) -> int:
+        return self._history.size
+
+    def __getitem__(self, index: int) -> float:
+        history = self._history
+        return history._times[(history._head + index) % history.capacity]
+
+
+class MetricHistory:
+    """Fixed capacity history of numeric metrics, one ring per column."""
+
+    def __init__(self, capacity: int, metrics: Iterable[str]) -> None:
+        """Initialize."""
+        self.capacity = capacity
+        self.metrics = tuple(metrics)
+        self.size = 0
+        # Physical index of the oldest sample
+        self._head = 0
+        self._times: list[float | None] = [None] * capacity
+        self._columns: dict[str, list[float | None]] = {
+            metric: [None] * capacity for metric in self.metrics
+        }
+
+    def append(self, now: float, values: Mapping[str, Any]) -> None:
+        """Add one poll's values; missing or non-numeric ones are stored as None."""
+        if self.size:
+            # Keep the timestamps sorted if the wall clock steps back
+            now = max(now, self._times[(self._head + self.size - 1) % self.capacity])
+        if self.size < self.capacity:
+            index = (self._head + self.size) % self.capacity
+            self.size += 1
+        else:
+            index = self._head
+            self._head = (self._head + 1) % self.capacity
+        self._times[index] = now
+        for metric, column in self._columns.items():
+            value = values.get(metric)
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                value = None
+            column[index] = value
+
+    def _slice(self, column: list, start: int, stop: int) -> list:
+        """Return logical samples start..stop of a ring as a list."""
+        first = (self._head + start) % self.capacity
+        last = first + (stop - start)
+        if last <= self.capacity:
+            return column[first:last]
+        return column[first:] + column[: last - self.capacity]
+
+    def query(
+        self,
+        start: float | None = None,
+        end: float | None = None,
+        metrics: Iterable[str] | None = None,
+        resolution: float | None = None,
+        aggregates: Iterable[str] = ("mean",),
+    ) -> dict[str, list]:
+        """Return {"time": [...], <metric>: [...]} for samples in [start, end].
+
+        With a resolution, samples are grouped into buckets of that many
+        seconds (timestamped by the bucket start) and each metric becomes one
+        column per aggregate, named <metric>_<aggregate>. Buckets without any
+        samples are left out; a bucket aggregate without values is None.
+        """
+        metrics = self.metrics if metrics is None else tuple(metrics)
+        ring = _Ring(self)
+        first = 0 if start is None else bisect_left(ring, start)
+        stop = self.size if end is None else bisect_right(ring, end)
+        stop = max(stop, first)
+        times = self._slice(self._times, first, stop)
+        columns = {
+            metric: self._slice(self._columns[metric], first, stop)
+            for metric in metrics
+        }
+        if not resolution:
+            return {"time": times, **columns}
+
+        # Split points between buckets, found by bisecting the sorted times
+        bounds = [0]
+        bucket_times = []
+        while bounds[-1] < len(times):
+            bucket = times[bounds[-1]] // resolution * resolution
+            bucket_times.append(bucket)
+            bounds.append(bisect_left(times, bucket + resolution, bounds[-1]))
+
+        result: dict[str, list] = {"time": bucket_times}
+        aggregates = tuple(aggregates)
+        for metric, column in columns.items():
+            outputs = {aggregate: [] for aggregate in aggregates}
+            for low, high in zip(bounds, bounds[1:]):
+                values = column[low:high]
+                if None in values:
+                    values = [value for value in values if value is not None]
+                for aggregate, output in outputs.items():
+                    output.append(AGGREGATES[aggregate](values) if values else None)
+            for aggregate, output in outputs.items():
+                result[f"{metric}_{aggregate}"] = output
+        return result
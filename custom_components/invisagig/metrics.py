@@ -0,0 +1,163 @@
+"""OpenMetrics rendering of InvisaGig telemetry snapshots."""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PREFIX = "invisagig"
+
+TYPE_GAUGE = "gauge"
+TYPE_COUNTER = "counter"
+TYPE_INFO = "info"
+
+# Extra labels for each cell section: label -> field in the section
+_CELL_LABELS = {
+    "lteCell": {"band": "lteBand", "cell": "lteCid", "pci": "ltePci"},
+    "nsaCell": {"band": "nsaBand", "cell": "nsaCid", "pci": "nsaPci"},
+    "saCell": {"band": "saBand", "cell": "saCid", "pci": "saPci"},
+}
+# Sections rendered as an info metric from their string fields
+_INFO_SECTIONS = ("device", "activeSim")
+# Fields that only ever grow until the billing cycle resets them
+_COUNTER_FIELDS = ("txMBytes", "rxMBytes", "totalMBytes")
+
+_CAMEL = re.compile(r"([a-z0-9])([A-Z])")
+_INVALID = re.compile(r"[^a-zA-Z0-9_]")
+
+# (labels, value) per sample, labels as a sorted tuple of pairs
+Sample = tuple[tuple[tuple[str, str], ...], float]
+Families = dict[str, tuple[str, list[Sample]]]
+
+
+def metric_name(*parts: str) -> str:
+    """Build a metric name from camelCase path parts."""
+    name = "_".join(_CAMEL.sub(r"\1_\2", part) for part in parts)
+    return f"{PREFIX}_{_INVALID.sub('_', name).lower()}"
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _add(
+    families: Families,
+    name: str,
+    kind: str,
+    labels: Mapping[str, Any],
+    value: float,
+) -> None:
+    family = families.setdefault(name, (kind, []))
+    family[1].append(
+        (tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None)), value)
+    )
+
+
+def _add_numbers(
+    families: Families,
+    section: str,
+    values: Mapping[str, Any],
+    labels: Mapping[str, Any],
+    *path: str,
+) -> None:
+    for key, value in values.items():
+        if _is_number(value):
+            kind = TYPE_COUNTER if key in _COUNTER_FIELDS else TYPE_GAUGE
+            _add(families, metric_name(section, *path, key), kind, labels, value)
+
+
+def collect(
+    device: str,
+    data: Mapping[str, Any] | None,
+    derived: Mapping[str, tuple[str, float | None]] | None = None,
+) -> Families:
+    """Turn one snapshot into metric families.
+
+    Every numeric field becomes a gauge (or a counter for data usage),
+    labelled with the device and, where it applies, the SIM, band and cell.
+    derived adds values computed by the integration as {name: (type, value)}.
+    """
+    families: Families = {}
+    base = {"device": device}
+    data = data or {}
+    sim = (data.get("activeSim") or {}).get("slot")
+
+    for section, values in data.items():
+        if not isinstance(values, Mapping):
+            continue
+        if section in _INFO_SECTIONS:
+            info = {
+                _CAMEL.sub(r"\1_\2", key).lower(): value
+                for key, value in values.items()
+                if isinstance(value, str)
+            }
+            _add(families, metric_name(section), TYPE_INFO, {**base, **info}, 1)
+        if section in _CELL_LABELS:
+            labels = {
+                **base,
+                "sim": sim,
+                **{
+                    label: values.get(field)
+                    for label, field in _CELL_LABELS[section].items()
+                },
+            }
+            _add_numbers(families, section, values, labels)
+        elif section == "dataUsed":
+            for slot, usage in values.items():
+                if isinstance(usage, Mapping):
+                    _add_numbers(families, section, usage, {**base, "sim": slot})
+        elif section == "carAgg":
+            for radio, components in values.items():
+                for index, component in enumerate(components or ()):
+                    if not isinstance(component, Mapping):
+                        continue
+                    labels = {
+                        **base,
+                        "radio": radio,
+                        "index": index,
+                        "band": component.get("band"),
+                        "pci": component.get("pci"),
+                        "state": component.get("state"),
+                    }
+                    _add_numbers(families, section, component, labels)
+        else:
+            _add_numbers(families, section, values, {**base, "sim": sim})
+
+    for name, (kind, value) in (derived or {}).items():
+        if _is_number(value):
+            _add(families, f"{PREFIX}_{name}", kind, base, value)
+    return families
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def render(blocks: Iterable[Families]) -> str:
+    """Render the families of several devices as one OpenMetrics exposition.
+
+    Samples of a family must be contiguous, so families are merged across
+    devices before rendering.
+    """
+    merged: dict[str, tuple[str, list[Sample]]] = {}
+    for block in blocks:
+        for name, (kind, samples) in block.items():
+            merged.setdefault(name, (kind, []))[1].extend(samples)
+
+    lines: list[str] = []
+    for name in sorted(merged):
+        kind, samples = merged[name]
+        lines.append(f"# TYPE {name} {kind}")
+        suffix = {TYPE_COUNTER: "_total", TYPE_INFO: "_info"}.get(kind, "")
+        for labels, value in samples:
+            label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+            lines.append(f"{name}{suffix}{{{label_text}}} {_format_value(value)}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,78 @@
+"""Converters for raw InvisaGig telemetry values."""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+
+from .const import PARSE_CACHE_SIZE
+
+
+def parse_temp(value):
+    if value and isinstance(value, str) and value.lower().endswith("c"):
+        try:
+            return float(value[:-1])
+        except ValueError:
+            return None
+    return None
+
+
+_MONTHS = {
+    name: index
+    for index, name in enumerate(
+        "Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec".split(),
+        start=1,
+    )
+}
+_WEEKDAYS = frozenset(("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"))
+
+
+def parse_date(value):
+    if not value or not isinstance(value, str):
+        return None
+    return _parse_date(value)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_date(value):
+    # Fixed "Sat Dec 27 00:45:18 UTC 2025" format from the modem's date
+    # command; parsed by hand since strptime's locale handling is slow and
+    # would reject English names on non-English hosts. Busybox pads single
+    # digit days with a space, which split() absorbs.
+    parts = value.split()
+    if len(parts) != 6 or parts[0] not in _WEEKDAYS or parts[4] != "UTC":
+        return None
+    month = _MONTHS.get(parts[1])
+    clock = parts[3].split(":")
+    if month is None or len(clock) != 3:
+        return None
+    try:
+        return datetime(
+            int(parts[5]),
+            month,
+            int(parts[2]),
+            int(clock[0]),
+            int(clock[1]),
+            int(clock[2]),
+            tzinfo=timezone.utc,
+        )
+    except ValueError:
+        return None
+
+
+def parse_iso_date(value):
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def parse_boot_time(time_temp):
+    """Return timeDate - upTime from the timeTemp section, or None."""
+    time_temp = time_temp or {}
+    uptime = time_temp.get("upTime")
+    if not isinstance(uptime, (int, float)):
+        return None
+    now = parse_date(time_temp.get("timeDate")) or datetime.now(timezone.utc)
+    return now - timedelta(seconds=uptime)
@@ -0,0 +1,182 @@
+"""Refresh phase tracking for InvisaGig telemetry.
+
+The modem rewrites info.json on its own timer (about every 60 s). Each poll
+tells us the device timestamp of the document it got (upTime, or timeDate
+when upTime is missing) and the local time window it was fetched in. With
+the device clock written as local time B + device time, a document stamped
+d seen at local time t proves
+
+    t_end - d >= B > t_start - d - period - resolution
+
+because it was already written when the response arrived and the next one
+had not been written yet when the request left. Intersecting these bounds
+poll after poll pins down B, i.e. when the next refresh will happen.
+Polling at the middle of the window halves it every poll, and once it is
+narrow each poll lands just after a refresh.
+
+The window is widened a little over time so clock drift is followed. Polls
+that land after the refresh can never show it moving earlier, so every
+recheck_polls polls one extra poll goes just before the window: a new
+document there, a poll showing the refresh came later than the window
+allows, or the device clock going backwards (a reboot) starts over.
+"""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+from statistics import median
+from typing import Any
+
+from .parsers import parse_date
+
+# Device timestamps are whole seconds
+_RESOLUTION = 1.0
+# Document gaps remembered for the period estimate
+_PERIOD_SAMPLES = 16
+
+
+class RefreshPhaseTracker:
+    """Learn the modem's refresh period and phase from successive polls."""
+
+    def __init__(
+        self,
+        nominal_period: float,
+        margin: float,
+        lock_width: float,
+        drift_rate: float,
+        recheck_polls: int,
+    ) -> None:
+        """Initialize."""
+        self.nominal_period = nominal_period
+        self.margin = margin
+        self.lock_width = lock_width
+        self.drift_rate = drift_rate
+        self.recheck_polls = recheck_polls
+        self._polls = 0
+        # The next poll checks the early edge; the one after it follows at once
+        self._checking = False
+        self._checked = False
+        self._periods: deque[float] = deque(maxlen=_PERIOD_SAMPLES)
+        # Window for B, and the device time and local time of the last poll
+        self._bounds: tuple[float, float] | None = None
+        self._last: tuple[float, float] | None = None
+        self.resyncs = 0
+
+    @staticmethod
+    def device_time(data: Mapping[str, Any]) -> float | None:
+        """Return the device timestamp of a snapshot in seconds."""
+        time_temp = data.get("timeTemp") or {}
+        uptime = time_temp.get("upTime")
+        if isinstance(uptime, (int, float)) and not isinstance(uptime, bool):
+            return float(uptime)
+        date = parse_date(time_temp.get("timeDate"))
+        return date.timestamp() if date is not None else None
+
+    @property
+    def period(self) -> float:
+        """Return the learned refresh period, or the nominal one."""
+        return median(self._periods) if self._periods else self.nominal_period
+
+    @property
+    def uncertainty(self) -> float | None:
+        """Return the width of the phase window in seconds."""
+        if self._bounds is None:
+            return None
+        return self._bounds[1] - self._bounds[0]
+
+    @property
+    def locked(self) -> bool:
+        """Return whether the refresh instant is known within lock_width."""
+        width = self.uncertainty
+        return width is not None and width <= self.lock_width
+
+    def reset(self) -> None:
+        """Forget the phase and period, e.g. after a reboot."""
+        self._periods.clear()
+        self._bounds = None
+        self._last = None
+        self._polls = 0
+        self._checking = self._checked = False
+
+    def update(self, data: Mapping[str, Any], t_start: float, t_end: float) -> None:
+        """Fold in a poll whose request left at t_start and returned at t_end."""
+        device = self.device_time(data)
+        if device is None:
+            return
+        if self._last is not None:
+            if device < self._last[0]:
+                # Rebooted (upTime restarted) or the clock was set back
+                self.reset()
+                self.resyncs += 1
+            elif device > self._last[0]:
+                self._learn_period(device - self._last[0])
+
+        low = t_start - device - self.period - _RESOLUTION
+        high = t_end - device
+        if self._bounds is not None:
+            slack = self.drift_rate * (t_end - self._last[1])
+            narrowed = (
+                max(low, self._bounds[0] - slack),
+                min(high, self._bounds[1] + slack),
+            )
+            if narrowed[0] < narrowed[1]:
+                low, high = narrowed
+            else:
+                # The refresh came later than the window allows (a jump
+                # in the modem's timer): start over from this poll alone
+                self.resyncs += 1
+        self._bounds = (low, high)
+        self._last = (device, t_end)
+
+        self._polls += 1
+        self._checked, self._checking = self._checking, False
+        if self.locked and not self._checked and self._polls >= self.recheck_polls:
+            self._checking = True
+            self._polls = 0
+
+    def _learn_period(self, gap: float) -> None:
+        """Record a gap between documents, divided by the refreshes it spans."""
+        refreshes = round(gap / self.nominal_period)
+        if refreshes >= 1:
+            self._periods.append(gap / refreshes)
+
+    def next_delay(self, now: float, interval: float) -> float | None:
+        """Return seconds until the poll that best follows a refresh.
+
+        Picks the first expected refresh at least half a period short of
+        interval from now (interval is never less than one period). Once
+        locked the poll lands margin seconds after the latest possible
+        refresh instant; until then it goes to the middle of the window, so
+        whichever document it gets halves the window.
+        """
+        if self._bounds is None:
+            return None
+        low, high = self._bounds
+        period = self.period
+        earliest = now + max(interval, period) - period / 2
+        if not self.locked:
+            offset = (low + high) / 2
+        elif self._checking:
+            offset = low - self.margin
+        else:
+            offset = high + self.margin
+            if self._checked:
+                # Straight after the check, for the refresh it preceded
+                earliest = now
+        target = offset + self._last[0]
+        refreshes = max(0, -(-(earliest - target) // period))
+        return max(target + refreshes * period - now, 0.0)
+
+    def attributes(self, now: float, interval: float) -> dict[str, Any]:
+        """Return the tracker state for entity attributes."""
+        delay = self.next_delay(now, interval)
+        uncertainty = self.uncertainty
+        return {
+            "refresh_period": round(self.period, 2),
+            "phase_locked": self.locked,
+            "phase_uncertainty": (
+                round(uncertainty, 2) if uncertainty is not None else None
+            ),
+            "next_poll_in": round(delay, 1) if delay is not None else None,
+            "phase_resyncs": self.resyncs,
+        }
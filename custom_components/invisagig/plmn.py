@@ -0,0 +1,187 @@
+"""MCC/MNC and operator resolution for InvisaGig."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+# mcc mnc operator; the first row for an operator is its primary PLMN.
+# Kept as text and indexed on first use so importing costs nothing.
+_PLMN_TABLE = """
+311 480 Verizon
+310 004 Verizon
+310 012 Verizon
+310 260 T-Mobile
+310 160 T-Mobile
+310 490 T-Mobile
+311 490 T-Mobile
+312 250 T-Mobile
+310 120 T-Mobile
+310 410 AT&T
+310 150 AT&T
+310 170 AT&T
+310 280 AT&T
+310 380 AT&T
+310 560 AT&T
+310 680 AT&T
+311 180 AT&T
+313 100 FirstNet
+311 580 UScellular
+313 340 Dish
+302 720 Rogers
+302 370 Fido
+302 610 Bell
+302 220 Telus
+302 490 Freedom Mobile
+302 500 Videotron
+334 020 Telcel
+334 050 AT&T Mexico
+334 030 Movistar
+234 30 EE
+234 10 O2
+234 15 Vodafone
+234 20 Three
+262 01 Telekom
+262 02 Vodafone
+262 03 O2
+208 01 Orange
+208 10 SFR
+208 15 Free
+208 20 Bouygues Telecom
+505 01 Telstra
+505 02 Optus
+505 03 Vodafone
+"""
+
+# Carrier name spellings seen in activeSim.carrier
+_ALIASES = {
+    "tmobile": "T-Mobile",
+    "t-mobile": "T-Mobile",
+    "att": "AT&T",
+    "at&t": "AT&T",
+    "verizon wireless": "Verizon",
+    "us cellular": "UScellular",
+}
+
+
+@dataclass(frozen=True)
+class Plmn:
+    """A resolved network identity."""
+
+    mcc: str
+    mnc: str
+    operator: str | None
+    source: str
+
+
+@cache
+def _index() -> tuple[dict[tuple[str, str], str], dict[str, tuple[str, str]]]:
+    """Build the PLMN -> operator and operator -> primary PLMN indexes."""
+    by_plmn: dict[tuple[str, str], str] = {}
+    by_name: dict[str, tuple[str, str]] = {}
+    for line in _PLMN_TABLE.strip().splitlines():
+        mcc, mnc, operator = line.split(" ", 2)
+        by_plmn[(mcc, mnc)] = operator
+        by_name.setdefault(operator.lower(), (mcc, mnc))
+    for alias, operator in _ALIASES.items():
+        by_name[alias] = by_name[operator.lower()]
+    return by_plmn, by_name
+
+
+def operator_name(mcc: str, mnc: str) -> str | None:
+    """Return the operator for an MCC/MNC pair."""
+    return _index()[0].get((mcc, mnc))
+
+
+def _normalize(mcc: Any, mnc: Any) -> tuple[str, str] | None:
+    """Return (mcc, mnc) as strings, restoring leading zeros lost to ints.
+
+    0 means unset for either, as the options flow defaults both to it.
+    """
+    if mcc in (None, "", 0) or mnc in (None, "", 0):
+        return None
+    mcc = str(mcc).strip().zfill(3)
+    if isinstance(mnc, int):
+        # 4 could be "04" or "004"; prefer whichever the index knows
+        for width in (3, 2):
+            if operator_name(mcc, str(mnc).zfill(width)):
+                return mcc, str(mnc).zfill(width)
+        return mcc, str(mnc).zfill(2)
+    return mcc, str(mnc).strip()
+
+
+def _split_plmn(plmn: Any) -> tuple[str, str] | None:
+    plmn = str(plmn or "").replace("-", "").strip()
+    if len(plmn) < 5 or not plmn.isdigit():
+        return None
+    return plmn[:3], plmn[3:]
+
+
+def _from_carrier(carrier: Any) -> tuple[str, str] | None:
+    if not isinstance(carrier, str) or not carrier.strip():
+        return None
+    by_name = _index()[1]
+    name = carrier.strip().lower()
+    if name in by_name:
+        return by_name[name]
+    # Longest name first so "AT&T Mexico" isn't read as AT&T
+    for known in sorted(by_name, key=len, reverse=True):
+        if known in name:
+            return by_name[known]
+    return None
+
+
+def plmn_identity(
+    data: Mapping[str, Any], mcc_override: Any = None, mnc_override: Any = None
+) -> tuple:
+    """Return the raw inputs resolve_plmn depends on.
+
+    Cheap to build every poll; resolution only has to run again when this
+    changes, i.e. on a SIM swap, roaming or an options change.
+    """
+    sim = data.get("activeSim") or {}
+    cell = data.get("lteCell") or {}
+    return (
+        mcc_override,
+        mnc_override,
+        sim.get("slot"),
+        sim.get("mcc"),
+        sim.get("mnc"),
+        sim.get("plmn"),
+        sim.get("carrier"),
+        cell.get("mcc") or cell.get("plmn_mcc"),
+        cell.get("mnc") or cell.get("plmn_mnc"),
+        cell.get("plmn"),
+    )
+
+
+def resolve_plmn(
+    data: Mapping[str, Any], mcc_override: Any = None, mnc_override: Any = None
+) -> Plmn | None:
+    """Resolve the serving MCC/MNC and operator from a snapshot.
+
+    Sources in order: the configured override, activeSim MCC/MNC, lteCell
+    MCC/MNC, a combined PLMN string on the cell or SIM, and finally the
+    carrier name looked up in the bundled index.
+    """
+    sim = data.get("activeSim") or {}
+    cell = data.get("lteCell") or {}
+    candidates = (
+        ("override", lambda: _normalize(mcc_override, mnc_override)),
+        ("sim", lambda: _normalize(sim.get("mcc"), sim.get("mnc"))),
+        (
+            "cell",
+            lambda: _normalize(
+                cell.get("mcc") or cell.get("plmn_mcc"),
+                cell.get("mnc") or cell.get("plmn_mnc"),
+            ),
+        ),
+        ("cell_plmn", lambda: _split_plmn(cell.get("plmn"))),
+        ("sim_plmn", lambda: _split_plmn(sim.get("plmn"))),
+        ("carrier", lambda: _from_carrier(sim.get("carrier"))),
+    )
+    for source, resolve in candidates:
+        if (pair := resolve()) is not None:
+            return Plmn(pair[0], pair[1], operator_name(*pair), source)
+    return None
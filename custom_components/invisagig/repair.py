@@ -0,0 +1,376 @@
+"""Tolerant JSON parsing for malformed InvisaGig firmware output.
+
+Well-formed bodies take the fast path, a single strict json.loads. Bodies
+with the long-known empty-value quirk get the four substring fixes the client
+always applied and a second json.loads. Anything that still fails goes through
+a single-pass repairing tokenizer that fixes the catalogued malformations below
+and, for truncated bodies, keeps every member that arrived intact instead of
+dropping the whole update.
+
+Repairs, as reported by parse_json:
+
+- missing_value: ``"key": ,`` / ``"key":\\r\\n}`` / ``[1,,2]``, becomes null
+- trailing_comma: ``,`` directly before ``}`` or ``]``, dropped
+- missing_comma: two members or elements with nothing between them
+- missing_colon: ``"key" 1`` inside an object
+- bare_literal: ``nan``, ``inf``, ``undefined``, ``None`` and friends, null
+- bare_word: unquoted strings such as ``REGISTERED``, quoted
+- unquoted_key: ``{key: 1}``, key quoted
+- number_format: ``+5``, ``.5``, ``5.``, ``007``, normalized
+- control_character: raw newlines/tabs inside strings, escaped
+- invalid_escape: backslashes not starting a JSON escape, escaped
+- mismatched_bracket: closers that don't match the open container
+- unexpected_character: stray characters that can't start a value, dropped
+- trailing_data: anything after the top-level value, dropped
+- truncated: body ended early; incomplete trailing members are dropped and
+  open containers closed
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_CHUNK = re.compile(r'[^"\\\x00-\x1f]*')
+_WORD = re.compile(r"[A-Za-z0-9_+\-.]+")
+_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?\Z")
+_LOOSE_NUMBER = re.compile(r"[+-]?[0-9]*\.?[0-9]*(?:[eE][+-]?[0-9]+)?\Z")
+
+_LITERALS = {"true": "true", "false": "false", "null": "null"}
+_NULL_WORDS = {
+    "nan",
+    "-nan",
+    "+nan",
+    "inf",
+    "-inf",
+    "+inf",
+    "infinity",
+    "-infinity",
+    "+infinity",
+    "undefined",
+    "none",
+    "nil",
+}
+_ESCAPABLE = set('"\\/bfnrtu')
+_HEX = set("0123456789abcdefABCDEF")
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+_CLOSERS = {"{": "}", "[": "]"}
+
+# Container states
+_KEY = 0  # object: expecting a key or "}"
+_COLON = 1  # object: expecting ":"
+_VALUE = 2  # expecting a value
+_NEXT = 3  # expecting "," or the closer
+
+
+def apply_legacy_fixes(text: str) -> str:
+    """Apply the four substring fixes the firmware has always needed."""
+    # 1. replace ": ," with ": null,"
+    text = text.replace(": ,", ": null,")
+
+    # 2. replace ":\n}" with ": null\n}"
+    text = text.replace(":\n}", ": null\n}")
+
+    # 3. replace ": }" with ": null}"
+    text = text.replace(": }", ": null}")
+
+    # 4. replace ": ]" with ": null]"
+    text = text.replace(": ]", ": null]")
+
+    return text
+
+
+def parse_json(text: str) -> tuple[Any, dict[str, int]]:
+    """Parse firmware JSON, repairing it if needed.
+
+    Returns the parsed document and a {repair: count} dict, empty when the
+    body parsed without the repairing tokenizer (NaN/Infinity constants are
+    still mapped to None and counted as bare_literal). Raises
+    json.JSONDecodeError, from the strict parse, when the body can't be
+    turned into an object or array.
+    """
+    repairs: dict[str, int] = {}
+
+    def _constant(_: str) -> None:
+        repairs["bare_literal"] = repairs.get("bare_literal", 0) + 1
+        return None
+
+    # Strict first, so the legacy substring fixes never touch string contents
+    # of bodies that didn't need them
+    try:
+        return json.loads(text, parse_constant=_constant), repairs
+    except json.JSONDecodeError as error:
+        original = error
+    try:
+        return json.loads(apply_legacy_fixes(text), parse_constant=_constant), repairs
+    except json.JSONDecodeError:
+        repairs.clear()
+
+    repaired, repairs = repair_json(text)
+    data = json.loads(repaired)
+    # A lone repaired scalar means the body wasn't a document at all
+    if not isinstance(data, (dict, list)):
+        raise original
+    return data, repairs
+
+
+def repair_json(text: str) -> tuple[str, dict[str, int]]:
+    """Rewrite malformed JSON into valid JSON in a single pass."""
+    return _Repairer(text).run()
+
+
+class _Frame:
+    """An open object or array."""
+
+    __slots__ = ("opener", "state", "safe")
+
+    def __init__(self, opener: str, safe: int) -> None:
+        self.opener = opener
+        self.state = _KEY if opener == "{" else _VALUE
+        # Output length after the last complete member; truncation rolls back here
+        self.safe = safe
+
+
+class _Repairer:
+    """Single-pass repairing tokenizer; whitespace is dropped from the output."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.pos = 0
+        self.out: list[str] = []
+        self.stack: list[_Frame] = []
+        self.repairs: dict[str, int] = {}
+        self.done = False
+
+    def note(self, repair: str) -> None:
+        self.repairs[repair] = self.repairs.get(repair, 0) + 1
+
+    def run(self) -> tuple[str, dict[str, int]]:
+        text = self.text
+        end = len(text)
+        while True:
+            self.pos = _WHITESPACE.match(text, self.pos).end()
+            if self.pos >= end:
+                break
+            if self.done:
+                self.note("trailing_data")
+                break
+            self.step(text[self.pos])
+        self.finish()
+        return "".join(self.out), self.repairs
+
+    def value_done(self) -> None:
+        """Record that a complete value was emitted."""
+        if self.stack:
+            frame = self.stack[-1]
+            frame.state = _NEXT
+            frame.safe = len(self.out)
+        else:
+            self.done = True
+
+    def step(self, char: str) -> None:
+        frame = self.stack[-1] if self.stack else None
+        state = frame.state if frame else _VALUE
+
+        if char in "}]":
+            self.close(char)
+            return
+
+        if state == _NEXT:
+            if char == ",":
+                self.out.append(",")
+                frame.state = _KEY if frame.opener == "{" else _VALUE
+                self.pos += 1
+            elif char == ":" and frame.opener == "{":
+                self.note("unexpected_character")
+                self.pos += 1
+            else:
+                # Another member/element follows without a separator
+                self.note("missing_comma")
+                self.out.append(",")
+                frame.state = _KEY if frame.opener == "{" else _VALUE
+            return
+
+        if state == _KEY:
+            if char == '"':
+                self.read_string()
+                frame.state = _COLON
+            elif char == ",":
+                self.note("unexpected_character")
+                self.pos += 1
+            elif _WORD.match(self.text, self.pos):
+                word = _WORD.match(self.text, self.pos).group()
+                self.pos += len(word)
+                self.note("unquoted_key")
+                self.out.append(json.dumps(word))
+                frame.state = _COLON
+            else:
+                self.note("unexpected_character")
+                self.pos += 1
+            return
+
+        if state == _COLON:
+            if char in ":=":
+                self.out.append(":")
+                frame.state = _VALUE
+                self.pos += 1
+            else:
+                self.note("missing_colon")
+                self.out.append(":")
+                frame.state = _VALUE
+            return
+
+        # Expecting a value
+        if char == ",":
+            if frame is None:
+                self.note("unexpected_character")
+                self.pos += 1
+                return
+            # "key": ,  or  [1,,2]
+            self.note("missing_value")
+            self.out.append("null")
+            self.value_done()
+        elif char in "{[":
+            self.out.append(char)
+            self.stack.append(_Frame(char, len(self.out)))
+            self.pos += 1
+        elif char == '"':
+            if self.read_string():
+                self.value_done()
+        elif _WORD.match(self.text, self.pos):
+            if self.read_word():
+                self.value_done()
+        else:
+            self.note("unexpected_character")
+            self.pos += 1
+
+    def close(self, char: str) -> None:
+        if not self.stack:
+            self.note("unexpected_character")
+            self.pos += 1
+            return
+        frame = self.stack[-1]
+        closer = _CLOSERS[frame.opener]
+        if char != closer:
+            if not any(_CLOSERS[f.opener] == char for f in self.stack):
+                # Nothing open that this would close
+                self.note("unexpected_character")
+                self.pos += 1
+                return
+            # Close the inner container and let the outer one take this closer
+            self.note("mismatched_bracket")
+        else:
+            self.pos += 1
+
+        if frame.state == _VALUE and frame.opener == "{":
+            # "key": }
+            self.note("missing_value")
+            self.out.append("null")
+        elif frame.state == _COLON:
+            self.note("missing_value")
+            self.out.append(":null")
+        elif frame.state in (_KEY, _VALUE) and self.out[-1] == ",":
+            self.note("trailing_comma")
+            self.out.pop()
+        self.out.append(closer)
+        self.stack.pop()
+        self.value_done()
+
+    def read_string(self) -> bool:
+        """Copy a string starting at the opening quote, fixing its contents.
+
+        Returns False if the body ended inside the string.
+        """
+        text = self.text
+        end = len(text)
+        pos = self.pos + 1
+        parts = ['"']
+        while True:
+            chunk_end = _STRING_CHUNK.match(text, pos).end()
+            parts.append(text[pos:chunk_end])
+            pos = chunk_end
+            if pos >= end:
+                self.pos = pos
+                return False
+            char = text[pos]
+            if char == '"':
+                pos += 1
+                break
+            if char == "\\":
+                nxt = text[pos + 1] if pos + 1 < end else ""
+                if nxt == "u" and pos + 6 <= end and all(
+                    c in _HEX for c in text[pos + 2 : pos + 6]
+                ):
+                    parts.append(text[pos : pos + 6])
+                    pos += 6
+                elif nxt in _ESCAPABLE and nxt != "u":
+                    parts.append(text[pos : pos + 2])
+                    pos += 2
+                else:
+                    self.note("invalid_escape")
+                    parts.append("\\\\")
+                    pos += 1
+                continue
+            # Raw control character
+            self.note("control_character")
+            parts.append(_CONTROL_ESCAPES.get(char, f"\\u{ord(char):04x}"))
+            pos += 1
+        parts.append('"')
+        self.out.append("".join(parts))
+        self.pos = pos
+        return True
+
+    def read_word(self) -> bool:
+        """Copy a number or literal, normalizing or quoting what JSON rejects.
+
+        Returns False if the word ran into the end of a truncated body, since
+        ``-11`` may well have been ``-110``.
+        """
+        word = _WORD.match(self.text, self.pos).group()
+        self.pos += len(word)
+        if self.pos >= len(self.text) and self.stack:
+            return False
+        lower = word.lower()
+        if word in _LITERALS:
+            self.out.append(word)
+        elif lower in _LITERALS:
+            self.note("bare_literal")
+            self.out.append(_LITERALS[lower])
+        elif lower in _NULL_WORDS:
+            self.note("bare_literal")
+            self.out.append("null")
+        elif _NUMBER.match(word):
+            self.out.append(word)
+        elif (number := _loose_number(word)) is not None:
+            self.note("number_format")
+            self.out.append(json.dumps(number))
+        else:
+            self.note("bare_word")
+            self.out.append(json.dumps(word))
+        return True
+
+    def finish(self) -> None:
+        """Close whatever is still open, dropping incomplete trailing members."""
+        if self.stack:
+            self.note("truncated")
+        while self.stack:
+            frame = self.stack.pop()
+            if frame.state != _NEXT:
+                del self.out[frame.safe :]
+            self.out.append(_CLOSERS[frame.opener])
+            self.value_done()
+        if not self.out:
+            raise json.JSONDecodeError("No JSON value found", self.text, 0)
+
+
+def _loose_number(word: str) -> int | float | None:
+    """Parse numbers JSON rejects (``+5``, ``.5``, ``5.``, ``007``)."""
+    if not _LOOSE_NUMBER.match(word) or not any(c.isdigit() for c in word):
+        return None
+    try:
+        if "." in word or "e" in word or "E" in word:
+            return float(word)
+        return int(word)
+    except ValueError:
+        return None
@@ -2,9 +2,10 @@
 from __future__ import annotations
 
 import logging
+import time
 from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import datetime, date
+from datetime import datetime, timezone
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -15,20 +16,26 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
     UnitOfDataRate,
+    UnitOfFrequency,
     UnitOfInformation,
     UnitOfLength,
     UnitOfTemperature,
     UnitOfTime,
-    EntityCategory,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, CONF_INCLUDE_RAW_JSON
+from .arfcn import decode_earfcn, decode_nr_arfcn, serving_nr_arfcn
+from .cells import CELL_FIELDS
+from .const import AVAILABILITY_WINDOWS, CONF_INCLUDE_RAW_JSON, DOMAIN
 from .coordinator import InvisaGigDataUpdateCoordinator
+from .drift import derive_connection_mode
+from .parsers import parse_date, parse_iso_date, parse_temp
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,6 +47,15 @@ class InvisaGigSensorEntityDescription(SensorEntityDescription):
     value_fn: Callable[[dict[str, Any]], Any] | None = None
     params: dict[str, Any] | None = None
     exists_fn: Callable[[dict[str, Any]], bool] | None = None
+    # For values kept on the coordinator rather than in the snapshot
+    coordinator_fn: Callable[[InvisaGigDataUpdateCoordinator], Any] | None = None
+    attr_fn: (
+        Callable[[InvisaGigDataUpdateCoordinator], dict[str, Any] | None] | None
+    ) = None
+    # Key into coordinator.write_filters for deadband/rounding of noisy signals
+    write_filter: str | None = None
+    # Values that describe the polls themselves stay available when they fail
+    always_available: bool = False
 
 
 # Helper functions
@@ -61,51 +77,14 @@ def get_nsa_info(data, key):
 def get_sa_info(data, key):
     return data.get("saCell", {}).get(key)
 
-def parse_temp(value):
-    if value and isinstance(value, str) and value.lower().endswith("c"):
-        try:
-            return float(value[:-1])
-        except ValueError:
-            return None
-    return None
-
-def parse_date(value):
-    if not value:
-        return None
-    try:
-        # Try Parsing "Sat Dec 27 00:45:18 UTC 2025"
-        # Since HA handles datetime objects, we should try to return a datetime object
-        # However, the string format is specific. 
-        # Actually simpler to let HA handle it if it is ISO, but this is weird format.
-        # "Sat Dec 27 00:45:18 UTC 2025"
-        # Ignore timezone for a sec and assume UTC as string says
-        # Remove UTC and parse
-        fmt = "%a %b %d %H:%M:%S UTC %Y"
-        dt = datetime.strptime(value, fmt)
-        return dt.replace(tzinfo=dt_util.UTC)
-    except ValueError:
-        return None
-
-def parse_iso_date(value):
-    if not value: 
-        return None
-    try:
-        return date.fromisoformat(value)
-    except ValueError:
-        return None
-
-def parse_epoch(value):
-    if not value:
-        return None
-    try:
-        return dt_util.as_local(dt_util.utc_from_timestamp(value / 1000))
-    except (ValueError, TypeError):
-        return None
-        
-def parse_mhz(value):
-    if value and isinstance(value, str):
-        return value.replace(" MHz", "")
-    return value
+def _quantize(value, step):
+    """Round a numeric value to a multiple of step (0 leaves it alone)."""
+    if not step or not isinstance(value, (int, float)):
+        return value
+    rounded = round(value / step) * step
+    if isinstance(value, int) and float(rounded).is_integer():
+        return int(rounded)
+    return round(rounded, 3)
 
 def get_ca_count(data, radio):
     agg = data.get("carAgg", {}).get(radio)
@@ -113,28 +92,131 @@ def get_ca_count(data, radio):
         return 0
     return sum(1 for x in agg if x and x.get("state") == "active")
 
-def derive_connection_mode(data):
-    active_sim = data.get("activeSim", {})
-    mode = active_sim.get("networkMode")
-    
-    # Simple logic? 
-    # If 5G SA metrics present -> 5G SA?
-    # Requirement: "Prefer activeSim.networkMode, Fallback inference from presence of SA/NSA metrics"
-    
-    if mode:
-        return mode
-        
-    sa_cell = data.get("saCell", {})
-    nsa_cell = data.get("nsaCell", {})
-    
-    # Check if SA has data
-    if sa_cell and any(v is not None for v in sa_cell.values()):
-        return "5G_SA"
-    if nsa_cell and any(v is not None for v in nsa_cell.values()):
-        return "5G_NSA"
-    
-    return "UNKNOWN"
+def decode_carrier(radio, arfcn, band=None):
+    if radio == "lte":
+        return decode_earfcn(arfcn)
+    return decode_nr_arfcn(arfcn, band)
+
+def carrier_attributes(carrier, arfcn):
+    if carrier is None:
+        return None
+    return {
+        "arfcn": arfcn,
+        "band": carrier.band,
+        "uplink_mhz": carrier.ul_mhz,
+        "duplex": carrier.duplex,
+    }
+
+def get_endpoint_attributes(coordinator):
+    now = time.monotonic()
+    return {
+        "endpoints": [endpoint.as_dict(now) for endpoint in coordinator.api.endpoints]
+    }
+
+def get_endpoint_latency(coordinator):
+    endpoint = coordinator.api.active_endpoint
+    if endpoint is None or endpoint.srtt is None:
+        return None
+    return round(endpoint.srtt * 1000)
 
+def _timestamp(epoch):
+    if epoch is None:
+        return None
+    moment = datetime.fromtimestamp(epoch, timezone.utc).replace(microsecond=0)
+    return moment.isoformat()
+
+# The longest window, over which outages, MTBF and MTTR are reported
+OUTAGE_WINDOW = max(AVAILABILITY_WINDOWS.values())
+
+def get_availability_attributes(coordinator, window):
+    return {
+        "outages": coordinator.availability.outage_count(window),
+        "reboots": coordinator.availability.reboot_count(window),
+    }
+
+def get_outage_attributes(coordinator):
+    availability = coordinator.availability
+    return {
+        "ongoing": availability.outage_start is not None,
+        "log": [
+            {
+                **outage,
+                "start": _timestamp(outage["start"]),
+                "end": _timestamp(outage["end"]),
+            }
+            for outage in availability.outage_log(time.time())
+        ],
+    }
+
+def get_reboot_attributes(coordinator):
+    availability = coordinator.availability
+    return {
+        "last_reboot": _timestamp(availability.last_reboot),
+        **{
+            f"reboots_{label}": availability.reboot_count(window)
+            for label, window in AVAILABILITY_WINDOWS.items()
+        },
+    }
+
+def get_cell_attributes(coordinator):
+    cells = coordinator.cells
+    current = cells.current
+    rows = []
+    for rank, (identity, stats) in enumerate(cells.ranked(), 1):
+        rows.append(
+            {
+                "rank": rank,
+                **dict(zip(CELL_FIELDS, identity)),
+                **{name: round(stats.mean(name), 1) for name in stats.means},
+                "samples": stats.samples,
+                "dwell": round(stats.dwell),
+                "first_seen": _timestamp(stats.first_seen),
+                "last_seen": _timestamp(stats.last_seen),
+            }
+        )
+    return {
+        "cell": dict(zip(CELL_FIELDS, current)) if current else None,
+        "cells_tracked": len(cells),
+        "cells": rows,
+    }
+
+def _round(value, digits=2):
+    return round(value, digits) if value is not None else None
+
+def get_forecast_attributes(coordinator, sim_id):
+    forecast = coordinator.usage.forecasts[sim_id]
+    quota = coordinator.quotas.get(sim_id)
+    projected = forecast.projected
+    return {
+        "cycle_start": _timestamp(forecast.cycle[0]) if forecast.cycle else None,
+        "cycle_end": _timestamp(forecast.cycle[1]) if forecast.cycle else None,
+        "samples": forecast.samples,
+        "quota_mb": quota,
+        "projected_quota_percent": (
+            round(projected / quota * 100, 1)
+            if quota and projected is not None
+            else None
+        ),
+    }
+
+def get_ca_components(data, radio):
+    components = []
+    for component in data.get("carAgg", {}).get(radio) or []:
+        if not component:
+            continue
+        arfcn = component.get("freq")
+        carrier = decode_carrier(radio, arfcn, component.get("band"))
+        components.append(
+            {
+                "state": component.get("state"),
+                "band": component.get("band"),
+                "pci": component.get("pci"),
+                "arfcn": arfcn,
+                "downlink_mhz": carrier.dl_mhz if carrier else None,
+                "uplink_mhz": carrier.ul_mhz if carrier else None,
+            }
+        )
+    return {"components": components} if components else None
 
 SENSOR_TYPES: tuple[InvisaGigSensorEntityDescription, ...] = (
     # Device Group
@@ -177,11 +259,10 @@ SENSOR_TYPES: tuple[InvisaGigSensorEntityDescription, ...] = (
     
     # TimeTemp
     InvisaGigSensorEntityDescription(
-        key="uptime",
-        name="Uptime",
-        device_class=SensorDeviceClass.DURATION,
-        native_unit_of_measurement=UnitOfTime.SECONDS,
-        value_fn=lambda data: get_timetemp_info(data, "upTime"),
+        key="last_boot",
+        name="Last Boot",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        coordinator_fn=lambda coordinator: coordinator.last_boot,
     ),
     InvisaGigSensorEntityDescription(
         key="timedate",
@@ -249,7 +330,28 @@ SENSOR_TYPES: tuple[InvisaGigSensorEntityDescription, ...] = (
     InvisaGigSensorEntityDescription(
         key="lte_freq",
         name="LTE Frequency",
-        value_fn=lambda data: get_lte_info(data, "lteFreq"),
+        device_class=SensorDeviceClass.FREQUENCY,
+        native_unit_of_measurement=UnitOfFrequency.MEGAHERTZ,
+        value_fn=lambda data: getattr(
+            decode_earfcn(get_lte_info(data, "lteFreq")), "dl_mhz", None
+        ),
+        attr_fn=lambda coordinator: carrier_attributes(
+            decode_earfcn(get_lte_info(coordinator.data or {}, "lteFreq")),
+            get_lte_info(coordinator.data or {}, "lteFreq"),
+        ),
+    ),
+    InvisaGigSensorEntityDescription(
+        key="nr_freq",
+        name="NR Frequency",
+        device_class=SensorDeviceClass.FREQUENCY,
+        native_unit_of_measurement=UnitOfFrequency.MEGAHERTZ,
+        value_fn=lambda data: getattr(
+            decode_nr_arfcn(*serving_nr_arfcn(data)), "dl_mhz", None
+        ),
+        attr_fn=lambda coordinator: carrier_attributes(
+            decode_nr_arfcn(*serving_nr_arfcn(coordinator.data or {})),
+            serving_nr_arfcn(coordinator.data or {})[0],
+        ),
     ),
     InvisaGigSensorEntityDescription(
         key="lte_rssi",
@@ -258,6 +360,7 @@ SENSOR_TYPES: tuple[InvisaGigSensorEntityDescription, ...] = (
         native_unit_of_measurement="dBm",
         value_fn=lambda data: get_lte_info(data, "lteRss"), # RSS logic
         state_class=SensorStateClass.MEASUREMENT,
+        write_filter="rsrp",
     ),
     InvisaGigSensorEntityDescription(
         key="lte_rsrp",
@@ -266,6 +369,7 @@ SENSOR_TYPES: tuple[InvisaGigSensorEntityDescription, ...] = (
         native_unit_of_measurement="dBm",
         value_fn=lambda data: get_lte_info(data, "lteStr"), # Str usually maps to RSRP in these modems
         state_class=SensorStateClass.MEASUREMENT,
+        write_filter="rsrp",
     ),
      InvisaGigSensorEntityDescription(
         key="lte_rsrq",
@@ -274,6 +378,7 @@ SENSOR_TYPES: tuple[InvisaGigSensorEntityDescription, ...] = (
         native_unit_of_measurement="dB",
         value_fn=lambda data: get_lte_info(data, "lteQal"), # Qal usually maps to RSRQ
         state_class=SensorStateClass.MEASUREMENT,
+        write_filter="rsrq",
     ),
     InvisaGigSensorEntityDescription(
         key="lte_sinr",
@@ -282,6 +387,7 @@ SENSOR_TYPES: tuple[InvisaGigSensorEntityDescription, ...] = (
         native_unit_of_measurement="dB",
         value_fn=lambda data: get_lte_info(data, "lteSnr"),
         state_class=SensorStateClass.MEASUREMENT,
+        write_filter="sinr",
     ),
     InvisaGigSensorEntityDescription(
         key="lte_cid",
@@ -298,13 +404,17 @@ SENSOR_TYPES: tuple[InvisaGigSensorEntityDescription, ...] = (
     InvisaGigSensorEntityDescription(
         key="lte_mcc",
         name="LTE MCC",
-        value_fn=lambda data: get_lte_info(data, "mcc") or get_activesim_info(data, "mcc"),
+        coordinator_fn=lambda coordinator: coordinator.plmn and coordinator.plmn.mcc,
+        attr_fn=lambda coordinator: coordinator.plmn and {
+            "operator": coordinator.plmn.operator,
+            "source": coordinator.plmn.source,
+        },
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
     InvisaGigSensorEntityDescription(
         key="lte_mnc",
         name="LTE MNC",
-        value_fn=lambda data: get_lte_info(data, "mnc") or get_activesim_info(data, "mnc"),
+        coordinator_fn=lambda coordinator: coordinator.plmn and coordinator.plmn.mnc,
         entity_category=EntityCategory.DIAGNOSTIC,
     ),
     InvisaGigSensorEntityDescription(
@@ -319,13 +429,132 @@ SENSOR_TYPES: tuple[InvisaGigSensorEntityDescription, ...] = (
         key="ca_active_lte",
         name="LTE CA Active Count",
         value_fn=lambda data: get_ca_count(data, "lte"),
+        attr_fn=lambda coordinator: get_ca_components(coordinator.data or {}, "lte"),
         state_class=SensorStateClass.MEASUREMENT,
     ),
     InvisaGigSensorEntityDescription(
         key="ca_active_nr5g",
         name="NR5G CA Active Count",
         value_fn=lambda data: get_ca_count(data, "nr5g"),
+        attr_fn=lambda coordinator: get_ca_components(coordinator.data or {}, "nr5g"),
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+
+    InvisaGigSensorEntityDescription(
+        key="serving_cell_rank",
+        name="Serving Cell Rank",
+        coordinator_fn=lambda coordinator: coordinator.cells.rank(
+            coordinator.cells.current
+        ),
+        attr_fn=get_cell_attributes,
+    ),
+
+    # Availability, from poll outcomes
+    *(
+        InvisaGigSensorEntityDescription(
+            key=f"availability_{label}",
+            name=f"Availability {label}",
+            native_unit_of_measurement=PERCENTAGE,
+            state_class=SensorStateClass.MEASUREMENT,
+            coordinator_fn=lambda coordinator, window=window: (
+                coordinator.availability.availability(window)
+            ),
+            attr_fn=lambda coordinator, window=window: (
+                get_availability_attributes(coordinator, window)
+            ),
+            always_available=True,
+        )
+        for label, window in AVAILABILITY_WINDOWS.items()
+    ),
+    InvisaGigSensorEntityDescription(
+        key="outages",
+        name="Outages",
+        state_class=SensorStateClass.MEASUREMENT,
+        coordinator_fn=lambda coordinator: coordinator.availability.outage_count(
+            OUTAGE_WINDOW
+        ),
+        attr_fn=get_outage_attributes,
+        always_available=True,
+    ),
+    InvisaGigSensorEntityDescription(
+        key="mtbf",
+        name="Mean Time Between Failures",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.MEASUREMENT,
+        coordinator_fn=lambda coordinator: coordinator.availability.mtbf(OUTAGE_WINDOW),
+        entity_category=EntityCategory.DIAGNOSTIC,
+        always_available=True,
+    ),
+    InvisaGigSensorEntityDescription(
+        key="mttr",
+        name="Mean Time To Recovery",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_unit_of_measurement=UnitOfTime.MINUTES,
         state_class=SensorStateClass.MEASUREMENT,
+        coordinator_fn=lambda coordinator: coordinator.availability.mttr(OUTAGE_WINDOW),
+        entity_category=EntityCategory.DIAGNOSTIC,
+        always_available=True,
+    ),
+    InvisaGigSensorEntityDescription(
+        key="reboots",
+        name="Reboots",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        coordinator_fn=lambda coordinator: coordinator.availability.reboots,
+        attr_fn=get_reboot_attributes,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        always_available=True,
+    ),
+
+    # Integration diagnostics
+    InvisaGigSensorEntityDescription(
+        key="poll_loop_block",
+        name="Poll Loop Blocking Time",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        coordinator_fn=lambda coordinator: coordinator.poll_stats.get("loop_block_ms"),
+        attr_fn=lambda coordinator: {
+            **coordinator.poll_stats,
+            "suppressed_writes": coordinator.suppressed_writes,
+            **coordinator.phase_attributes(),
+        },
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    InvisaGigSensorEntityDescription(
+        key="bytes_transferred",
+        name="Data Transferred",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        suggested_unit_of_measurement=UnitOfInformation.MEBIBYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        coordinator_fn=lambda coordinator: coordinator.api.bytes_transferred,
+        attr_fn=lambda coordinator: {
+            **coordinator.api.transfer,
+            "compression": coordinator.api.compression_enabled,
+            "conditional_requests": coordinator.api.conditional_supported,
+        },
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    InvisaGigSensorEntityDescription(
+        key="active_endpoint",
+        name="Active Endpoint",
+        coordinator_fn=lambda coordinator: (
+            repr(coordinator.api.active_endpoint)
+            if coordinator.api.active_endpoint
+            else None
+        ),
+        attr_fn=get_endpoint_attributes,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    InvisaGigSensorEntityDescription(
+        key="endpoint_latency",
+        name="Endpoint Latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        coordinator_fn=get_endpoint_latency,
+        entity_category=EntityCategory.DIAGNOSTIC,
     ),
 )
 
@@ -347,15 +576,39 @@ async def async_setup_entry(
     for sim in ["SIM1", "SIM2"]:
          entities.extend(_create_data_sensors(coordinator, sim))
 
-    # Add Raw JSON if enabled
-    if entry.options.get(CONF_INCLUDE_RAW_JSON):
-        entities.append(InvisaGigRawJsonSensor(coordinator))
-
-    # Add Signal Health Sensor
+    # Add Signal Health Sensors
     entities.append(InvisaGigSignalHealthSensor(coordinator))
+    entities.append(InvisaGigSignalHealthSensor(coordinator, smoothed=True))
 
     async_add_entities(entities)
 
+    # Uptime wrote a new state every poll; Last Boot replaces it
+    registry = er.async_get(hass)
+    if uptime_id := registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{coordinator.api._host}_uptime"
+    ):
+        registry.async_remove(uptime_id)
+
+    raw_json: InvisaGigRawJsonSensor | None = None
+
+    @callback
+    def _async_sync_optional_entities() -> None:
+        """Add or remove the Raw JSON sensor to match the options."""
+        nonlocal raw_json
+        wanted = entry.options.get(CONF_INCLUDE_RAW_JSON, False)
+        if wanted and raw_json is None:
+            raw_json = InvisaGigRawJsonSensor(coordinator)
+            async_add_entities([raw_json])
+        elif not wanted and raw_json is not None:
+            if raw_json.entity_id:
+                er.async_get(hass).async_remove(raw_json.entity_id)
+            raw_json = None
+
+    _async_sync_optional_entities()
+    entry.async_on_unload(
+        coordinator.async_add_options_listener(_async_sync_optional_entities)
+    )
+
 
 def _create_data_sensors(coordinator, sim_id):
     """Create sensors for a specific SIM."""
@@ -410,6 +663,48 @@ def _create_data_sensors(coordinator, sim_id):
         )
     ))
 
+    forecast = coordinator.usage.forecasts[sim_id]
+
+    sensors.append(InvisaGigSensor(
+        coordinator,
+        InvisaGigSensorEntityDescription(
+            key=f"data_{sim_id}_projected",
+            name=f"{sim_id} Projected Cycle Usage",
+            device_class=SensorDeviceClass.DATA_SIZE,
+            native_unit_of_measurement=UnitOfInformation.MEGABYTES,
+            state_class=SensorStateClass.MEASUREMENT,
+            coordinator_fn=lambda coordinator: _round(forecast.projected),
+            attr_fn=lambda coordinator: get_forecast_attributes(coordinator, sim_id),
+        )
+    ))
+
+    sensors.append(InvisaGigSensor(
+        coordinator,
+        InvisaGigSensorEntityDescription(
+            key=f"data_{sim_id}_burn_rate",
+            name=f"{sim_id} Daily Usage Rate",
+            native_unit_of_measurement="MB/d",
+            state_class=SensorStateClass.MEASUREMENT,
+            coordinator_fn=lambda coordinator: _round(forecast.burn_rate),
+        )
+    ))
+
+    sensors.append(InvisaGigSensor(
+        coordinator,
+        InvisaGigSensorEntityDescription(
+            key=f"data_{sim_id}_quota_days",
+            name=f"{sim_id} Days Until Quota",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.DAYS,
+            state_class=SensorStateClass.MEASUREMENT,
+            coordinator_fn=lambda coordinator: (
+                _round(forecast.days_until(coordinator.quotas[sim_id]), 1)
+                if sim_id in coordinator.quotas
+                else None
+            ),
+        )
+    ))
+
     return sensors
 
 
@@ -417,6 +712,8 @@ class InvisaGigSensor(CoordinatorEntity, SensorEntity):
     """Defines an InvisaGig sensor."""
     
     entity_description: InvisaGigSensorEntityDescription
+    # The cell scoreboard changes every poll and is kept in storage anyway
+    _unrecorded_attributes = frozenset({"cells"})
 
     def __init__(
         self,
@@ -458,11 +755,66 @@ class InvisaGigSensor(CoordinatorEntity, SensorEntity):
              if dev.get("igVersion"):
                  self._attr_device_info["sw_version"] = dev.get("igVersion")
 
+        self._filtered_value: Any = None
+        self._written_available: bool | None = None
+
+    @property
+    def available(self) -> bool:
+        """Return whether the sensor has a current value."""
+        return self.entity_description.always_available or super().available
+
     @property
     def native_value(self) -> Any:
         """Return the state of the sensor."""
+        if self.entity_description.write_filter:
+            return self._filtered_value
+        return self._raw_value()
+
+    def _raw_value(self) -> Any:
+        if self.entity_description.coordinator_fn:
+            return self.entity_description.coordinator_fn(self.coordinator)
         if self.entity_description.value_fn:
-            return self.entity_description.value_fn(self.coordinator.data)
+            return self.entity_description.value_fn(self.coordinator.data or {})
+        return None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Apply the rounding step and deadband before writing signal values."""
+        kind = self.entity_description.write_filter
+        if not kind:
+            super()._handle_coordinator_update()
+            return
+        deadband, step = self.coordinator.write_filters.get(kind, (0, 0))
+        value = _quantize(self._raw_value(), step)
+        held = self._filtered_value
+        if (
+            self.available == self._written_available
+            and isinstance(value, (int, float))
+            and isinstance(held, (int, float))
+            and value != held
+            and abs(value - held) < deadband
+        ):
+            self.coordinator.suppressed_writes += 1
+            return
+        self._filtered_value = value
+        self._written_available = self.available
+        self.async_write_ha_state()
+
+    async def async_added_to_hass(self) -> None:
+        """Seed the filtered value from the current snapshot."""
+        await super().async_added_to_hass()
+        if self.entity_description.write_filter:
+            _, step = self.coordinator.write_filters.get(
+                self.entity_description.write_filter, (0, 0)
+            )
+            self._filtered_value = _quantize(self._raw_value(), step)
+            self._written_available = self.available
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return extra attributes, if the description defines any."""
+        if self.entity_description.attr_fn:
+            return self.entity_description.attr_fn(self.coordinator)
         return None
 
 class InvisaGigRawJsonSensor(CoordinatorEntity, SensorEntity):
@@ -495,10 +847,15 @@ class InvisaGigRawJsonSensor(CoordinatorEntity, SensorEntity):
 class InvisaGigSignalHealthSensor(CoordinatorEntity, SensorEntity):
     """Sensor for Signal Health Score."""
 
-    def __init__(self, coordinator):
+    def __init__(self, coordinator, smoothed: bool = False):
         super().__init__(coordinator)
-        self._attr_unique_id = f"{coordinator.api._host}_signal_health"
-        self._attr_name = "Connection Health"
+        self._smoothed = smoothed
+        if smoothed:
+            self._attr_unique_id = f"{coordinator.api._host}_signal_health_smoothed"
+            self._attr_name = "Connection Health (Smoothed)"
+        else:
+            self._attr_unique_id = f"{coordinator.api._host}_signal_health"
+            self._attr_name = "Connection Health"
         self._attr_native_unit_of_measurement = "%"
         self._attr_state_class = SensorStateClass.MEASUREMENT
         self._attr_icon = "mdi:signal-cellular-outline"
@@ -508,42 +865,17 @@ class InvisaGigSignalHealthSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def native_value(self):
-        """Calculate signal health score."""
-        data = self.coordinator.data or {}
-        lte = data.get("lteCell", {})
-        
-        # Fetch metrics (default to None)
-        rsrp = lte.get("lteStr") # using lteStr as RSRP per earlier mapping
-        sinr = lte.get("lteSnr")
-        rsrq = lte.get("lteQal")
-        
-        if rsrp is None or sinr is None:
-            # If 5G metrics exist, we could use them, but let's stick to LTE for base
-            # If basic LTE metrics missing, return None
+        """Return the health score computed by the coordinator."""
+        if self._smoothed:
+            return self.coordinator.health_smoothed
+        if self.coordinator.health is None:
             return None
-            
-        # Normalize RSRP (-120 to -80) -> 0 to 1
-        # Better than -80 = 1.0, Worse than -120 = 0.0
-        rsrp_score = self._normalize(rsrp, -120, -80)
-        
-        # Normalize SINR (0 to 20) -> 0 to 1
-        # Better than 20 = 1.0, Worse than 0 = 0.0
-        sinr_score = self._normalize(sinr, 0, 20)
-        
-        # Normalize RSRQ (-20 to -10) -> 0 to 1
-        # Better than -10 = 1.0, Worse than -20 = 0.0
-        # If rsrq missing, assume decent? Or reweight? 
-        # Requirement said 20% weight.
-        if rsrq is not None:
-             rsrq_score = self._normalize(rsrq, -20, -10)
-             total = (rsrp_score * 40) + (sinr_score * 40) + (rsrq_score * 20)
-        else:
-             # Reweight if RSRQ missing: 50/50
-             total = (rsrp_score * 50) + (sinr_score * 50)
-             
-        return round(total)
-
-    def _normalize(self, val, min_val, max_val):
-        if val <= min_val: return 0.0
-        if val >= max_val: return 1.0
-        return (val - min_val) / (max_val - min_val)
+        return self.coordinator.health["score"]
+
+    @property
+    def extra_state_attributes(self):
+        """Return the per-leg sub-scores."""
+        health = self.coordinator.health
+        if not health:
+            return None
+        return {k: v for k, v in health.items() if k != "score"}
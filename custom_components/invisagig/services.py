@@ -0,0 +1,147 @@
+"""Services for InvisaGig."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from typing import Any
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .anomaly import METRICS
+from .const import (
+    ATTR_AGGREGATE,
+    ATTR_DEVICE_ID,
+    ATTR_END,
+    ATTR_ENTRY_ID,
+    ATTR_METRICS,
+    ATTR_RESOLUTION,
+    ATTR_START,
+    DOMAIN,
+    SERVICE_GET_HISTORY,
+    SERVICE_REFRESH,
+)
+from .coordinator import InvisaGigDataUpdateCoordinator
+from .history import AGGREGATES
+
+_LOGGER = logging.getLogger(__name__)
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+# One modem, by config entry or device
+TARGET_FIELDS = {
+    vol.Exclusive(ATTR_ENTRY_ID, "target"): cv.string,
+    vol.Exclusive(ATTR_DEVICE_ID, "target"): cv.string,
+}
+HISTORY_FIELDS = {
+    vol.Optional(ATTR_START): cv.datetime,
+    vol.Optional(ATTR_END): cv.datetime,
+    vol.Optional(ATTR_METRICS): vol.All(cv.ensure_list, [vol.In([*METRICS, "health"])]),
+    vol.Optional(ATTR_RESOLUTION): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Optional(ATTR_AGGREGATE, default=["mean"]): vol.All(
+        cv.ensure_list, [vol.In(list(AGGREGATES))]
+    ),
+}
+GET_HISTORY_SCHEMA = vol.Schema({**TARGET_FIELDS, **HISTORY_FIELDS})
+
+
+def _coordinators(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[InvisaGigDataUpdateCoordinator]:
+    """Return the coordinators targeted by a service call."""
+    coordinators: dict[str, InvisaGigDataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+    entry_ids = call.data.get(ATTR_ENTRY_ID)
+    if entry_ids is None:
+        return list(coordinators.values())
+    return [
+        coordinators[entry_id] for entry_id in entry_ids if entry_id in coordinators
+    ]
+
+
+def resolve_coordinator(
+    hass: HomeAssistant, params: Mapping[str, Any]
+) -> InvisaGigDataUpdateCoordinator | None:
+    """Return the coordinator of the entry_id or device_id in params.
+
+    With neither, the only configured modem is used if there is just one.
+    """
+    coordinators: dict[str, InvisaGigDataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+    if (device_id := params.get(ATTR_DEVICE_ID)) is not None:
+        device = dr.async_get(hass).async_get(device_id)
+        if device is None:
+            return None
+        return next(
+            (
+                coordinators[entry]
+                for entry in device.config_entries
+                if entry in coordinators
+            ),
+            None,
+        )
+    if (entry_id := params.get(ATTR_ENTRY_ID)) is not None:
+        return coordinators.get(entry_id)
+    if len(coordinators) == 1:
+        return next(iter(coordinators.values()))
+    return None
+
+
+def history_query(
+    coordinator: InvisaGigDataUpdateCoordinator, params: Mapping[str, Any]
+) -> dict[str, list]:
+    """Run a history query validated by HISTORY_FIELDS."""
+    start = params.get(ATTR_START)
+    end = params.get(ATTR_END)
+    # Times without an offset, as the UI sends them, are in Home Assistant's zone
+    return coordinator.history.query(
+        start=dt_util.as_utc(start).timestamp() if start is not None else None,
+        end=dt_util.as_utc(end).timestamp() if end is not None else None,
+        metrics=params.get(ATTR_METRICS),
+        resolution=params.get(ATTR_RESOLUTION),
+        aggregates=params[ATTR_AGGREGATE],
+    )
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def _async_refresh(call: ServiceCall) -> None:
+        """Refresh the targeted modems, skipping ones refreshed too recently."""
+        for coordinator in _coordinators(hass, call):
+            if not await coordinator.async_manual_refresh():
+                _LOGGER.debug(
+                    "Refresh of %s skipped, last one was too recent",
+                    coordinator.api._host,
+                )
+
+    async def _async_get_history(call: ServiceCall) -> ServiceResponse:
+        """Return a slice of a modem's in-memory metric history as columns."""
+        coordinator = resolve_coordinator(hass, call.data)
+        if coordinator is None:
+            raise ServiceValidationError(
+                "No InvisaGig modem matches the entry or device given"
+            )
+        return history_query(coordinator, call.data)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, _async_refresh, schema=REFRESH_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        _async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,150 @@
+"""Home Assistant independent polling, summaries and diffs for InvisaGig.
+
+Together with api, repair, parsers, plmn, arfcn, health and drift this
+imports without Home Assistant, for scripts, audits and the fleet CLI.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import Any
+
+import aiohttp
+
+from .api import InvisaGigApiClient, InvisaGigApiClientError
+from .arfcn import decode_earfcn, decode_nr_arfcn, serving_nr_arfcn
+from .const import DEFAULT_PORT_HTTP
+from .drift import derive_connection_mode
+from .health import HealthConfig, compute_health
+from .parsers import parse_boot_time, parse_temp
+from .plmn import resolve_plmn
+
+# Columns of summarize(); poll records add host, port, ok, error and polled_at
+SUMMARY_FIELDS = (
+    "model",
+    "ig_version",
+    "sim_slot",
+    "carrier",
+    "connection_mode",
+    "mcc",
+    "mnc",
+    "operator",
+    "lte_band",
+    "lte_earfcn",
+    "lte_dl_mhz",
+    "lte_rsrp",
+    "lte_rsrq",
+    "lte_sinr",
+    "nr_band",
+    "nr_arfcn",
+    "nr_dl_mhz",
+    "health_score",
+    "temperature",
+    "last_boot",
+)
+RECORD_FIELDS = ("host", "port", "ok", "error", "polled_at", *SUMMARY_FIELDS)
+
+
+def summarize(
+    data: Mapping[str, Any],
+    health_config: HealthConfig | None = None,
+    mcc_override: Any = None,
+    mnc_override: Any = None,
+) -> dict[str, Any]:
+    """Return the derived values the integration's sensors show, as a flat dict."""
+    device = data.get("device") or {}
+    sim = data.get("activeSim") or {}
+    lte = data.get("lteCell") or {}
+    lte_carrier = decode_earfcn(lte.get("lteFreq"))
+    nr_arfcn, nr_band = serving_nr_arfcn(data)
+    nr_carrier = decode_nr_arfcn(nr_arfcn, nr_band)
+    plmn = resolve_plmn(data, mcc_override, mnc_override)
+    health = compute_health(data, health_config or HealthConfig())
+    boot = parse_boot_time(data.get("timeTemp"))
+    return {
+        "model": device.get("model"),
+        "ig_version": device.get("igVersion"),
+        "sim_slot": sim.get("slot"),
+        "carrier": sim.get("carrier"),
+        "connection_mode": derive_connection_mode(data),
+        "mcc": plmn.mcc if plmn else None,
+        "mnc": plmn.mnc if plmn else None,
+        "operator": plmn.operator if plmn else None,
+        "lte_band": lte.get("lteBand"),
+        "lte_earfcn": lte.get("lteFreq"),
+        "lte_dl_mhz": lte_carrier.dl_mhz if lte_carrier else None,
+        "lte_rsrp": lte.get("lteStr"),
+        "lte_rsrq": lte.get("lteQal"),
+        "lte_sinr": lte.get("lteSnr"),
+        "nr_band": nr_carrier.band if nr_carrier and nr_carrier.band else nr_band,
+        "nr_arfcn": nr_arfcn,
+        "nr_dl_mhz": nr_carrier.dl_mhz if nr_carrier else None,
+        "health_score": health["score"] if health else None,
+        "temperature": parse_temp((data.get("timeTemp") or {}).get("temp")),
+        "last_boot": boot.replace(microsecond=0).isoformat() if boot else None,
+    }
+
+
+def snapshot_diff(old: Mapping[str, Any], new: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the structural changes from one snapshot to the next.
+
+    Nested objects are compared key by key; anything else (lists included)
+    is replaced whole. Paths are lists of keys. Empty when nothing changed.
+    """
+    changed: list[list[Any]] = []
+    removed: list[list[str]] = []
+
+    def _walk(
+        before: Mapping[str, Any], after: Mapping[str, Any], path: list[str]
+    ) -> None:
+        for key, value in after.items():
+            if key not in before:
+                changed.append([[*path, key], value])
+                continue
+            previous = before[key]
+            if previous is value:
+                continue
+            if isinstance(previous, Mapping) and isinstance(value, Mapping):
+                _walk(previous, value, [*path, key])
+            elif previous != value or type(previous) is not type(value):
+                changed.append([[*path, key], value])
+        removed.extend([*path, key] for key in before if key not in after)
+
+    if old is not new:
+        _walk(old, new, [])
+    diff: dict[str, Any] = {}
+    if changed:
+        diff["set"] = changed
+    if removed:
+        diff["remove"] = removed
+    return diff
+
+
+async def async_poll(
+    session: aiohttp.ClientSession,
+    host: str,
+    port: int = DEFAULT_PORT_HTTP,
+    use_ssl: bool = False,
+    health_config: HealthConfig | None = None,
+) -> tuple[dict[str, Any], dict[str, Any] | None]:
+    """Fetch one modem and return (record, snapshot).
+
+    Errors never raise: the record has ok False and the error message, and
+    the snapshot is None, so one dead host doesn't stop a fleet poll.
+    """
+    record: dict[str, Any] = {
+        "host": host,
+        "port": port,
+        "ok": False,
+        "error": None,
+        "polled_at": datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+    }
+    client = InvisaGigApiClient(host=host, port=port, session=session, use_ssl=use_ssl)
+    try:
+        data = await client.async_get_data(max_age=0)
+    except InvisaGigApiClientError as err:
+        record["error"] = str(err) or type(err).__name__
+        return record, None
+    record["ok"] = True
+    record.update(summarize(data, health_config))
+    return record, data
@@ -0,0 +1,184 @@
+"""Billing cycle data usage forecasting for InvisaGig.
+
+Each SIM's cumulative totalMBytes is fitted against time since the start of
+its billing cycle by least squares. Only the running means and co-moments
+are kept (Welford's update), so memory is constant however often the modem
+is polled. The fit starts over when the cycle changes or the counter goes
+backwards. Both SIMs are sampled every poll, so a SIM that is switched away
+from contributes flat stretches and its burn rate falls accordingly.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from datetime import time as dt_time
+from typing import Any
+
+from .parsers import parse_iso_date
+
+SIMS = ("SIM1", "SIM2")
+_DAY = 86400
+
+
+def _epoch_seconds(value: Any) -> float | None:
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+        return None
+    return value / 1000
+
+
+def _date_seconds(value: Any) -> float | None:
+    day = parse_iso_date(value)
+    if day is None:
+        return None
+    return datetime.combine(day, dt_time(), timezone.utc).timestamp()
+
+
+def billing_cycle(sim: Mapping[str, Any]) -> tuple[float, float] | None:
+    """Return the (start, end) epoch seconds of a SIM's billing cycle."""
+    period = sim.get("billingPeriod") or {}
+    start = _epoch_seconds(sim.get("startEpochMs"))
+    if start is None:
+        start = _date_seconds(period.get("startDate"))
+    end = _epoch_seconds(sim.get("endEpochMs"))
+    if end is None:
+        end = _date_seconds(period.get("endDate"))
+    if start is None or end is None or end <= start:
+        return None
+    return start, end
+
+
+class CycleForecast:
+    """Incremental linear fit of one SIM's usage within its billing cycle."""
+
+    _FIELDS = (
+        "cycle",
+        "samples",
+        "mean_t",
+        "mean_y",
+        "m_tt",
+        "c_ty",
+        "first_t",
+        "last_t",
+        "last_total",
+    )
+
+    def __init__(self, min_span: float) -> None:
+        """Initialize."""
+        self.min_span = min_span
+        self.cycle: tuple[float, float] | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.samples = 0
+        # t in days since the cycle start, y in MB
+        self.mean_t = 0.0
+        self.mean_y = 0.0
+        self.m_tt = 0.0
+        self.c_ty = 0.0
+        self.first_t: float | None = None
+        self.last_t: float | None = None
+        self.last_total: float | None = None
+
+    def update(self, cycle: tuple[float, float], total: float, now: float) -> None:
+        """Add a sample of the cumulative total at wall time now."""
+        if cycle != self.cycle or (
+            self.last_total is not None and total < self.last_total
+        ):
+            self.cycle = cycle
+            self._reset()
+        t = (now - cycle[0]) / _DAY
+        self.samples += 1
+        dt = t - self.mean_t
+        self.mean_t += dt / self.samples
+        self.mean_y += (total - self.mean_y) / self.samples
+        self.m_tt += dt * (t - self.mean_t)
+        self.c_ty += dt * (total - self.mean_y)
+        if self.first_t is None:
+            self.first_t = t
+        self.last_t = t
+        self.last_total = total
+
+    @property
+    def ready(self) -> bool:
+        """Return whether the samples span enough time for a forecast."""
+        return (
+            self.first_t is not None
+            and self.m_tt > 0
+            and (self.last_t - self.first_t) * _DAY >= self.min_span
+        )
+
+    @property
+    def burn_rate(self) -> float | None:
+        """Return the fitted usage rate in MB per day."""
+        if not self.ready:
+            return None
+        return max(self.c_ty / self.m_tt, 0.0)
+
+    @property
+    def projected(self) -> float | None:
+        """Return the projected total at the end of the cycle, in MB."""
+        rate = self.burn_rate
+        if rate is None:
+            return None
+        end = (self.cycle[1] - self.cycle[0]) / _DAY
+        # From the latest reading rather than the fitted line, so the
+        # projection never falls below what is already used
+        return self.last_total + rate * max(end - self.last_t, 0.0)
+
+    def days_until(self, quota: float) -> float | None:
+        """Return the days from the latest sample until quota MB are used."""
+        if self.last_total is None:
+            return None
+        remaining = quota - self.last_total
+        if remaining <= 0:
+            return 0.0
+        rate = self.burn_rate
+        if not rate:
+            return None
+        return remaining / rate
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state to persist."""
+        return {field: getattr(self, field) for field in self._FIELDS}
+
+    def restore(self, stored: Mapping[str, Any]) -> None:
+        """Load persisted state."""
+        for field in self._FIELDS:
+            if field in stored:
+                setattr(self, field, stored[field])
+        if self.cycle is not None:
+            self.cycle = tuple(self.cycle)
+
+
+class UsageTracker:
+    """Per SIM usage forecasts from dataUsed."""
+
+    def __init__(self, min_span: float) -> None:
+        """Initialize."""
+        self.forecasts = {sim: CycleForecast(min_span) for sim in SIMS}
+
+    def update(self, data: Mapping[str, Any], now: float) -> None:
+        """Sample every SIM the snapshot has a cycle and total for."""
+        used = data.get("dataUsed") or {}
+        for sim, forecast in self.forecasts.items():
+            sim_data = used.get(sim) or {}
+            total = sim_data.get("totalMBytes")
+            if not isinstance(total, (int, float)) or isinstance(total, bool):
+                continue
+            cycle = billing_cycle(sim_data)
+            if cycle is not None:
+                forecast.update(cycle, float(total), now)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state to persist."""
+        return {
+            sim: forecast.as_dict()
+            for sim, forecast in self.forecasts.items()
+            if forecast.cycle is not None
+        }
+
+    def restore(self, stored: Mapping[str, Any]) -> None:
+        """Load persisted state."""
+        for sim, state in stored.items():
+            if sim in self.forecasts:
+                self.forecasts[sim].restore(state)
@@ -0,0 +1,44 @@
+"""OpenMetrics HTTP endpoint for InvisaGig."""
+from __future__ import annotations
+
+from http import HTTPStatus
+
+from aiohttp import web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import InvisaGigDataUpdateCoordinator
+from .metrics import CONTENT_TYPE, render
+
+
+class InvisaGigMetricsView(HomeAssistantView):
+    """Serve every enabled modem's latest snapshot as OpenMetrics."""
+
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._blocks: list = []
+        self._body = b""
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the exposition, re-rendered only when a snapshot changed."""
+        hass: HomeAssistant = request.app["hass"]
+        coordinators: list[InvisaGigDataUpdateCoordinator] = [
+            coordinator
+            for coordinator in hass.data.get(DOMAIN, {}).values()
+            if coordinator.metrics_enabled
+        ]
+        if not coordinators:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        blocks = [coordinator.metrics_families() for coordinator in coordinators]
+        # Each block is rebuilt only on a new snapshot, so identity is enough
+        if len(blocks) != len(self._blocks) or any(
+            block is not cached for block, cached in zip(blocks, self._blocks)
+        ):
+            self._body = render(blocks).encode()
+            self._blocks = blocks
+        return web.Response(body=self._body, headers={"Content-Type": CONTENT_TYPE})
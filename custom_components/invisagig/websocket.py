@@ -0,0 +1,142 @@
+"""Websocket API for InvisaGig."""
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.json import json_bytes, json_fragment
+
+from .const import DATA_BROADCASTS, DOMAIN
+from .coordinator import InvisaGigDataUpdateCoordinator
+from .services import HISTORY_FIELDS, TARGET_FIELDS, history_query, resolve_coordinator
+from .snapshot import snapshot_diff
+
+
+class SnapshotBroadcast:
+    """Push each new snapshot of one coordinator to its subscribers as a diff.
+
+    The diff and its JSON are built once per poll, whatever the number of
+    subscribers; only the message id is added per connection. When the entry
+    unloads, subscribers get a final {"closed": true} event.
+    """
+
+    def __init__(self, coordinator: InvisaGigDataUpdateCoordinator) -> None:
+        """Initialize."""
+        self.coordinator = coordinator
+        # {(connection, message id)}: every subscriber has been sent _sent
+        self._subscribers: set[tuple[websocket_api.ActiveConnection, int]] = set()
+        self._sent: dict[str, Any] | None = None
+        self._available: bool | None = None
+        self._remove_listener: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_subscribe(
+        self, connection: websocket_api.ActiveConnection, iden: int
+    ) -> CALLBACK_TYPE:
+        """Send the full snapshot now and diffs after every poll."""
+        if self._remove_listener is None:
+            self._sent = self.coordinator.data
+            self._available = self.coordinator.last_update_success
+            self._remove_listener = self.coordinator.async_add_listener(
+                self._handle_update
+            )
+        subscriber = (connection, iden)
+        self._subscribers.add(subscriber)
+        connection.send_message(
+            websocket_api.event_message(
+                iden, {"snapshot": self._sent, "available": self._available}
+            )
+        )
+
+        @callback
+        def unsubscribe() -> None:
+            self._subscribers.discard(subscriber)
+            if not self._subscribers and self._remove_listener is not None:
+                self._remove_listener()
+                self._remove_listener = None
+
+        return unsubscribe
+
+    @callback
+    def _handle_update(self) -> None:
+        data = self.coordinator.data
+        available = self.coordinator.last_update_success
+        diff = snapshot_diff(self._sent or {}, data or {})
+        if not diff and available == self._available:
+            return
+        self._sent = data
+        self._available = available
+        # Serialized once and embedded as is in every subscriber's message
+        event = json_fragment(json_bytes({"diff": diff, "available": available}))
+        for connection, iden in self._subscribers:
+            connection.send_message(websocket_api.event_message(iden, event))
+
+    @callback
+    def async_close(self) -> None:
+        """End every subscription, e.g. when the entry unloads."""
+        if self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+        for connection, iden in self._subscribers:
+            connection.subscriptions.pop(iden, None)
+            connection.send_message(websocket_api.event_message(iden, {"closed": True}))
+        self._subscribers.clear()
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): f"{DOMAIN}/subscribe", **TARGET_FIELDS}
+)
+@callback
+def ws_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to a modem's normalized snapshot and its changes."""
+    coordinator = resolve_coordinator(hass, msg)
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Modem not found")
+        return
+
+    broadcasts: dict[str, SnapshotBroadcast] = hass.data.setdefault(DATA_BROADCASTS, {})
+    entry_id = coordinator.config_entry.entry_id
+    broadcast = broadcasts.get(entry_id)
+    if broadcast is None:
+        broadcast = broadcasts[entry_id] = SnapshotBroadcast(coordinator)
+    connection.send_result(msg["id"])
+    connection.subscriptions[msg["id"]] = broadcast.async_subscribe(
+        connection, msg["id"]
+    )
+
+
+@websocket_api.websocket_command(
+    {vol.Required("type"): f"{DOMAIN}/history", **TARGET_FIELDS, **HISTORY_FIELDS}
+)
+@callback
+def ws_history(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return a slice of a modem's in-memory metric history as columns."""
+    coordinator = resolve_coordinator(hass, msg)
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Modem not found")
+        return
+    connection.send_result(msg["id"], history_query(coordinator, msg))
+
+
+@callback
+def async_close_broadcast(hass: HomeAssistant, entry_id: str) -> None:
+    """Tear down the snapshot broadcast of an unloaded entry."""
+    if broadcast := hass.data.get(DATA_BROADCASTS, {}).pop(entry_id, None):
+        broadcast.async_close()
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe)
+    websocket_api.async_register_command(hass, ws_history)
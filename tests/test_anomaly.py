@@ -0,0 +1,66 @@
+"""Test rolling anomaly detection."""
+import random
+
+import pytest
+
+from custom_components.invisagig.anomaly import AnomalyDetector
+
+
+def _snapshot(sinr, temp=45.0):
+    return {"lteCell": {"lteSnr": sinr}, "timeTemp": {"temp": f"{temp}C"}}
+
+
+def test_noise_is_not_anomalous():
+    """A day of ordinary noise raises nothing."""
+    rng = random.Random(5)
+    detector = AnomalyDetector(0.02, 30, 3.0, 300)
+    for minute in range(1440):
+        snapshot = _snapshot(round(rng.gauss(15, 2)), 45 + rng.gauss(0, 0.3))
+        assert detector.update(snapshot, minute * 60) == []
+    assert detector.baselines["lte_sinr"].mean == pytest.approx(15, abs=1)
+    assert detector.baselines["nr_rsrp"].samples == 0
+
+
+def test_sustained_deviation_sets_and_clears():
+    """Spikes shorter than the duration are ignored; sustained drops are not."""
+    rng = random.Random(9)
+    detector = AnomalyDetector(0.02, 30, 3.0, 300)
+    now = 0
+    for _ in range(100):
+        detector.update(_snapshot(round(rng.gauss(15, 1))), now)
+        now += 60
+
+    # Two minutes of interference, then back to normal
+    for sinr in (0, 0, 0, 15, 15, 15, 15, 15, 15):
+        assert detector.update(_snapshot(sinr), now) == []
+        now += 60
+
+    changes = []
+    for _ in range(10):
+        changes.append(detector.update(_snapshot(0), now))
+        now += 60
+    assert changes[5] == ["lte_sinr"]
+    assert sum(map(len, changes)) == 1
+    assert detector.anomalous == ["lte_sinr"]
+    described = detector.describe("lte_sinr")
+    assert described["anomalous"] is True
+    assert described["value"] == 0
+    assert described["z_score"] < -3
+
+    cleared = []
+    for _ in range(20):
+        cleared += detector.update(_snapshot(15), now)
+        now += 60
+    assert cleared == ["lte_sinr"]
+    assert detector.anomalous == []
+
+
+def test_restore_skips_warmup():
+    """Persisted baselines are used straight away."""
+    detector = AnomalyDetector(0.02, 30, 3.0, 0)
+    for minute in range(40):
+        detector.update(_snapshot(15 + minute % 3), minute * 60)
+
+    restored = AnomalyDetector(0.02, 30, 3.0, 0)
+    restored.restore(detector.as_dict())
+    assert restored.update(_snapshot(-5), 0) == ["lte_sinr"]
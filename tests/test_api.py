@@ -1,7 +1,23 @@
 """Test InvisaGig API Client."""
+import asyncio
+import gzip
+import logging
+import time
+import zlib
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
-from unittest.mock import patch, MagicMock
-from custom_components.invisagig.api import InvisaGigApiClient
+from multidict import CIMultiDict
+
+from custom_components.invisagig import api
+from custom_components.invisagig.api import (
+    InvisaGigApiClient,
+    InvisaGigApiClientCommunicationError,
+    InvisaGigApiClientError,
+    parse_endpoints,
+)
+from custom_components.invisagig.const import ENDPOINT_INITIAL_TIMEOUT, TIMEOUT
+
 
 @pytest.mark.asyncio
 async def test_sanitize_json():
@@ -47,3 +63,342 @@ async def test_normalize_data():
     assert normalized["key"] is None
     assert normalized["key2"] is None
     assert normalized["key3"] == "value"
+
+
+async def test_probe():
+    """Test the reachability probe."""
+    client = InvisaGigApiClient("host", 80, MagicMock())
+    writer = MagicMock(wait_closed=AsyncMock())
+
+    with patch("asyncio.open_connection", AsyncMock(return_value=(None, writer))):
+        assert await client.async_probe()
+    writer.close.assert_called_once()
+
+    with patch("asyncio.open_connection", AsyncMock(side_effect=OSError)):
+        assert not await client.async_probe()
+
+
+async def test_concurrent_requests_are_coalesced():
+    """Concurrent callers for the same modem share one request."""
+    api._RECENT.clear()
+    calls = 0
+
+    async def _fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return {"device": {"model": "IG62"}}
+
+    first = InvisaGigApiClient("host", 80, MagicMock())
+    second = InvisaGigApiClient("host", 80, MagicMock())
+    with patch.object(first, "_async_fetch", _fetch):
+        results = await asyncio.gather(
+            first.async_get_data(), second.async_get_data()
+        )
+        # Only the first caller went to the network; both see its timing
+        assert first.request_source == "network"
+        assert second.request_source == "shared"
+        assert first.request_times == second.request_times
+        sent, received = first.request_times
+        assert sent <= received
+
+        # Within the freshness window the result is reused
+        await second.async_get_data()
+        assert calls == 1
+        assert second.request_source == "cache"
+        assert second.request_times == (sent, received)
+        await first.async_get_data(max_age=0)
+        assert first.request_source == "network"
+        assert first.request_times[0] >= received
+        assert calls == 2
+        # A private request ignores the recent result
+        await first.async_get_data(shared=False)
+
+    assert calls == 3
+    assert results[0] is results[1]
+    api._RECENT.clear()
+
+
+async def test_large_bodies_parsed_in_executor():
+    """Bodies over the threshold are parsed off the event loop."""
+    body = '{"device": {"model": " IG62 ", "modem": ""}}'
+
+    client = InvisaGigApiClient("host", 80, MagicMock(), parse_executor_threshold=1024)
+    assert await client._async_parse(body) == {
+        "device": {"model": "IG62", "modem": None}
+    }
+    assert client.parse_stats["mode"] == "inline"
+
+    client.parse_executor_threshold = 10
+    assert await client._async_parse(body) == {
+        "device": {"model": "IG62", "modem": None}
+    }
+    assert client.parse_stats["mode"] == "executor"
+    assert client.parse_stats["bytes"] == len(body)
+
+
+class _FakeContent:
+    """Stand-in for aiohttp's StreamReader."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    async def iter_chunked(self, size):
+        for chunk in self._chunks:
+            yield chunk
+
+
+def _response(chunks, content_type="application/json", content_length=None):
+    """Return a response that streams the given chunks."""
+    return MagicMock(
+        headers={"Content-Type": content_type},
+        content_length=content_length,
+        charset=None,
+        content=_FakeContent(chunks),
+    )
+
+
+def _session(chunks, content_type="application/json", content_length=None):
+    """Return a session whose GET streams the given chunks."""
+    session = MagicMock()
+    session.get.return_value.__aenter__.return_value = _response(
+        chunks, content_type, content_length
+    )
+    return session
+
+
+async def test_body_is_streamed_and_capped():
+    """Bodies are read in chunks and rejected once over the cap."""
+    api._RECENT.clear()
+    chunks = [b'{"device": ', b'{"model": "IG62"}}']
+    client = InvisaGigApiClient("host", 80, _session(chunks))
+    assert await client.async_get_data(max_age=0) == {"device": {"model": "IG62"}}
+
+    client = InvisaGigApiClient("host", 80, _session(chunks), max_response_bytes=16)
+    with pytest.raises(InvisaGigApiClientError, match="exceeds 16 bytes"):
+        await client.async_get_data(max_age=0)
+
+    client = InvisaGigApiClient(
+        "host", 80, _session(chunks, content_length=10**9), max_response_bytes=16
+    )
+    with pytest.raises(InvisaGigApiClientError, match="exceeds"):
+        await client.async_get_data(max_age=0)
+    api._RECENT.clear()
+
+
+async def test_html_responses_rejected():
+    """Captive portal pages are rejected before parsing."""
+    api._RECENT.clear()
+    client = InvisaGigApiClient("host", 80, _session([b"<html></html>"], "text/html"))
+    with pytest.raises(InvisaGigApiClientError, match="text/html"):
+        await client.async_get_data(max_age=0)
+
+    client = InvisaGigApiClient("host", 80, _session([b"  <!DOCTYPE html>"], ""))
+    with pytest.raises(InvisaGigApiClientError, match="HTML"):
+        await client.async_get_data(max_age=0)
+
+
+async def test_json_error_logs_excerpt(caplog):
+    """Only a bounded excerpt around the error offset is logged."""
+    api._RECENT.clear()
+    # Not a document at all, so the repair pass can't rescue it either
+    body = b'"' + b"x" * 5000 + b'" @'
+    client = InvisaGigApiClient("host", 80, _session([body]))
+    with caplog.at_level(logging.DEBUG), pytest.raises(
+        InvisaGigApiClientError, match="Could not parse"
+    ):
+        await client.async_get_data(max_age=0)
+
+    record = next(r for r in caplog.records if "Invalid JSON" in r.message)
+    assert "@" in record.message
+    assert len(record.message) < 400
+
+
+async def test_malformed_body_is_repaired():
+    """Repairs are applied and reported in parse_stats."""
+    client = InvisaGigApiClient("host", 80, MagicMock())
+    data = await client._async_parse(
+        '{"device": {"model": IG62,}, "lteCell": {"lteStr": -7'
+    )
+    assert data == {"device": {"model": "IG62"}, "lteCell": {}}
+    assert client.parse_stats["repairs"] == {
+        "bare_word": 1,
+        "trailing_comma": 1,
+        "truncated": 1,
+    }
+
+
+def test_parse_endpoints():
+    """Endpoint lists accept host, host:port and bracketed IPv6."""
+    assert parse_endpoints(" 10.0.0.1, modem.ts.net:8080,[fd7a::1]:81, ", 80) == [
+        ("10.0.0.1", 80),
+        ("modem.ts.net", 8080),
+        ("fd7a::1", 81),
+    ]
+    assert parse_endpoints(None, 80) == []
+    for bad in ("host:", "host:http", ":80", "[fd7a::1]x", "host:70000"):
+        with pytest.raises(ValueError):
+            parse_endpoints(bad, 80)
+
+
+async def test_endpoint_failover_and_ranking():
+    """A dead path fails over within the poll and the fastest path is preferred."""
+    api._RECENT.clear()
+    client = InvisaGigApiClient(
+        "10.0.0.1", 80, MagicMock(), alternates=[("100.64.0.1", 80), ("10.0.0.1", 80)]
+    )
+    assert [repr(e) for e in client.endpoints] == ["10.0.0.1:80", "100.64.0.1:80"]
+    attempts = []
+    down = {"10.0.0.1"}
+
+    async def _fetch_body(endpoint, timeout):
+        attempts.append((endpoint.host, timeout))
+        if endpoint.host in down:
+            raise InvisaGigApiClientCommunicationError(
+                "Timeout error fetching information"
+            )
+        return '{"device": {"model": "IG62"}}'
+
+    with patch.object(client, "_async_fetch_body", _fetch_body):
+        assert await client.async_get_data(max_age=0) == {"device": {"model": "IG62"}}
+        # Unmeasured first path gets a short timeout, the last one the full timeout
+        assert attempts == [
+            ("10.0.0.1", ENDPOINT_INITIAL_TIMEOUT),
+            ("100.64.0.1", TIMEOUT),
+        ]
+        assert repr(client.active_endpoint) == "100.64.0.1:80"
+        lan, tailscale = client.endpoints
+        assert lan.failures == 1 and not lan.healthy(time.monotonic())
+        assert tailscale.srtt is not None
+
+        # The backed-off path is only tried after the healthy one
+        attempts.clear()
+        await client.async_get_data(max_age=0)
+        assert [host for host, _ in attempts] == ["100.64.0.1"]
+
+        # Once recovered and measured, the faster path wins
+        down.clear()
+        lan.retry_at = 0
+        lan.record_rtt(0.05, time.monotonic())
+        tailscale.srtt = 0.8
+        assert client.ranked_endpoints(time.monotonic()) == [lan, tailscale]
+
+        client.set_alternates([])
+        assert client.endpoints == [lan]
+
+        # Every path down raises the last path's error
+        down.add("10.0.0.1")
+        with pytest.raises(InvisaGigApiClientCommunicationError):
+            await client.async_get_data(max_age=0)
+    api._RECENT.clear()
+
+
+async def test_unusable_response_fails_over():
+    """A login page on one path backs it off and the next path is used."""
+    api._RECENT.clear()
+    session = MagicMock()
+    session.get.return_value.__aenter__.side_effect = [
+        _response([b"<html>Log in</html>"], "text/html"),
+        _response([b'{"device": {"model": "IG62"}}']),
+        _response([b"<html>Log in</html>"], "text/html"),
+    ]
+    client = InvisaGigApiClient(
+        "100.64.0.1", 80, session, alternates=[("10.0.0.1", 80)]
+    )
+    assert await client.async_get_data(max_age=0) == {"device": {"model": "IG62"}}
+    tailscale, lan = client.endpoints
+    assert client.active_endpoint is lan
+    assert tailscale.failures == 1 and not tailscale.healthy(time.monotonic())
+
+    # With no other path left, the error is raised
+    client.set_alternates([])
+    tailscale.retry_at = 0
+    with pytest.raises(InvisaGigApiClientError, match="text/html"):
+        await client.async_get_data(max_age=0)
+    api._RECENT.clear()
+
+
+def _http_response(body=b"", status=200, headers=None):
+    """Return a response mock with real status, headers and raw headers."""
+    headers = CIMultiDict({"Content-Type": "application/json", **(headers or {})})
+    response = MagicMock(
+        status=status,
+        reason="OK",
+        headers=headers,
+        raw_headers=[(k.encode(), v.encode()) for k, v in headers.items()],
+        content_length=None,
+        charset=None,
+        content=_FakeContent([body[i : i + 7] for i in range(0, len(body), 7)]),
+    )
+    response.request_info.headers = {"Host": "host"}
+    response.request_info.url.path_qs = "/telemetry/info.json"
+    return response
+
+
+async def test_conditional_requests_reuse_document():
+    """Validators are sent back and a 304 reuses the parsed document."""
+    api._RECENT.clear()
+    session = MagicMock()
+    session.get.return_value.__aenter__.side_effect = [
+        _http_response(b'{"device": {"model": "IG62"}}', headers={"ETag": '"abc"'}),
+        _http_response(status=304),
+    ]
+    client = InvisaGigApiClient("host", 80, session)
+
+    first = await client.async_get_data(max_age=0)
+    assert "If-None-Match" not in session.get.call_args.kwargs["headers"]
+    assert client.conditional_supported
+
+    assert await client.async_get_data(max_age=0) is first
+    assert session.get.call_args.kwargs["headers"]["If-None-Match"] == '"abc"'
+    assert session.get.call_args.kwargs["auto_decompress"] is False
+    assert client.parse_stats["mode"] == "not_modified"
+    assert client.transfer["requests"] == 2
+    assert client.transfer["not_modified"] == 1
+    assert client.transfer["body_bytes"] == len(b'{"device": {"model": "IG62"}}')
+    assert client.bytes_transferred > client.transfer["body_bytes"]
+    api._RECENT.clear()
+
+
+async def test_compressed_bodies_are_decoded_and_capped():
+    """gzip and both deflate flavours decode; the cap applies after decoding."""
+    api._RECENT.clear()
+    document = b'{"device": {"model": "IG62"}, "pad": "' + b"x" * 2000 + b'"}'
+    raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    bodies = {
+        "gzip": gzip.compress(document),
+        "deflate": zlib.compress(document),
+        "Deflate": raw.compress(document) + raw.flush(),
+    }
+    for encoding, body in bodies.items():
+        session = MagicMock()
+        session.get.return_value.__aenter__.return_value = _http_response(
+            body, headers={"Content-Encoding": encoding}
+        )
+        client = InvisaGigApiClient("host", 80, session)
+        assert (await client.async_get_data(max_age=0))["device"] == {"model": "IG62"}
+        assert client.transfer["body_bytes"] == len(body) < len(document)
+        assert client.transfer["decoded_bytes"] == len(document)
+        api._RECENT.clear()
+
+    # A small compressed body can't inflate past the cap
+    session.get.return_value.__aenter__.return_value = _http_response(
+        gzip.compress(b" " * 10**6), headers={"Content-Encoding": "gzip"}
+    )
+    client = InvisaGigApiClient("host", 80, session, max_response_bytes=1024)
+    with pytest.raises(InvisaGigApiClientError, match="exceeds 1024 bytes"):
+        await client.async_get_data(max_age=0)
+
+    # A server mangling compression gets uncompressed requests from then on
+    session.get.return_value.__aenter__.return_value = _http_response(
+        b"\x1f\x8bnot gzip", headers={"Content-Encoding": "gzip"}
+    )
+    client = InvisaGigApiClient("host", 80, session)
+    with pytest.raises(InvisaGigApiClientError, match="Could not decode"):
+        await client.async_get_data(max_age=0)
+    assert not client.compression_enabled
+    api._RECENT.clear()
+    session.get.return_value.__aenter__.return_value = _http_response(b"{}")
+    await client.async_get_data(max_age=0)
+    assert "Accept-Encoding" not in session.get.call_args.kwargs["headers"]
+    api._RECENT.clear()
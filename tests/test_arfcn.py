@@ -0,0 +1,69 @@
+"""Test EARFCN / NR-ARFCN decoding."""
+import pytest
+
+from custom_components.invisagig.arfcn import (
+    _LTE_ROWS,
+    DUPLEX_FDD,
+    DUPLEX_TDD,
+    decode_earfcn,
+    decode_nr_arfcn,
+    nr_arfcn_to_mhz,
+)
+
+
+@pytest.mark.parametrize(
+    ("earfcn", "band", "dl_mhz", "ul_mhz"),
+    [
+        (0, 1, 2110.0, 1920.0),
+        (600, 2, 1930.0, 1850.0),
+        (2175, 4, 2132.5, 1732.5),
+        (5230, 13, 751.0, 782.0),
+        (40072, 41, 2538.2, 2538.2),
+        (66586, 66, 2125.0, 1725.0),
+        (68661, 71, 624.5, 670.5),
+    ],
+)
+def test_decode_earfcn(earfcn, band, dl_mhz, ul_mhz):
+    """Test EARFCNs decode to the 36.101 band and frequencies."""
+    carrier = decode_earfcn(earfcn)
+    assert (carrier.band, carrier.dl_mhz, carrier.ul_mhz) == (band, dl_mhz, ul_mhz)
+
+
+def test_earfcn_gaps_and_garbage():
+    """Test unassigned or invalid EARFCNs don't decode."""
+    assert decode_earfcn(70000) is None
+    assert decode_earfcn(-1) is None
+    assert decode_earfcn(None) is None
+    assert decode_earfcn("66586") is None
+
+
+def test_lte_table_is_disjoint():
+    """Test the sorted EARFCN ranges never overlap."""
+    for previous, row in zip(_LTE_ROWS, _LTE_ROWS[1:]):
+        assert previous[3] < row[2]
+
+
+def test_nr_raster():
+    """Test the three NR global raster segments."""
+    assert nr_arfcn_to_mhz(0) == 0
+    assert nr_arfcn_to_mhz(599999) == 2999.995
+    assert nr_arfcn_to_mhz(600000) == 3000
+    assert nr_arfcn_to_mhz(2016667) == 24250.08
+    assert nr_arfcn_to_mhz(3279166) is None
+
+
+def test_decode_nr_arfcn_uses_band_hint():
+    """Test overlapping NR bands prefer the band the modem reports."""
+    carrier = decode_nr_arfcn(520110, 41)
+    assert (carrier.band, carrier.dl_mhz, carrier.duplex) == (41, 2600.55, DUPLEX_TDD)
+    # Without a hint the narrowest covering band wins
+    assert decode_nr_arfcn(520110).band == 38
+    assert decode_nr_arfcn(630000, 77).band == 77
+    assert decode_nr_arfcn(630000).band == 78
+
+    carrier = decode_nr_arfcn(130000)
+    assert (carrier.band, carrier.ul_mhz, carrier.duplex) == (71, 696.0, DUPLEX_FDD)
+
+    # Between bands the frequency is still reported
+    carrier = decode_nr_arfcn(200000)
+    assert (carrier.band, carrier.dl_mhz) == (None, 1000.0)
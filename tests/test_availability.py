@@ -0,0 +1,97 @@
+"""Test availability and outage tracking."""
+import json
+import random
+
+import pytest
+
+from custom_components.invisagig.availability import AvailabilityTracker
+
+DAY = 86400
+WINDOWS = (DAY, 7 * DAY)
+
+
+def _tracker():
+    return AvailabilityTracker(WINDOWS, 900, 5, 180)
+
+
+def test_rolling_windows_match_recount():
+    """Running totals match a full recount of the spans in each window."""
+    rng = random.Random(7)
+    tracker = _tracker()
+    spans, starts = [], []
+    now, ok = 1_000_000.0, True
+    for _ in range(20000):
+        tracker.record(ok, now)
+        if not ok and (not spans or spans[-1][2]):
+            starts.append(now)
+        step = rng.uniform(30, 90)
+        spans.append((now, now + step, ok))
+        now += step
+        if rng.random() < 0.01:
+            ok = not ok
+
+    tracker.record(ok, now)
+    for window in WINDOWS:
+        start = (now // 900 - window // 900 + 1) * 900
+        up = sum(max(0, end - max(begin, start)) for begin, end, s_ok in spans if s_ok)
+        down = sum(
+            max(0, end - max(begin, start)) for begin, end, s_ok in spans if not s_ok
+        )
+        assert tracker.availability(window) == pytest.approx(
+            up / (up + down) * 100, abs=1e-3
+        )
+        assert tracker.outage_count(window) == sum(1 for t in starts if t >= start)
+    # Buckets older than the longest window are dropped
+    assert len(tracker._buckets) <= 7 * DAY // 900 + 1
+
+
+def test_outage_log_mtbf_and_mttr():
+    """Outages run from the first failed poll to the first good one."""
+    tracker = _tracker()
+    for minute in range(60):
+        tracker.record(not 10 <= minute < 15 and not 40 <= minute < 42, minute * 60)
+
+    assert [
+        (o["start"], o["end"], o["duration"]) for o in tracker.outage_log(3600)
+    ] == [
+        (2400, 2520, 120),
+        (600, 900, 300),
+    ]
+    assert tracker.outage_count(DAY) == 2
+    assert tracker.availability(DAY) == pytest.approx(
+        (3540 - 420) / 3540 * 100, abs=1e-3
+    )
+    assert tracker.mttr(DAY) == 210
+    assert tracker.mtbf(DAY) == round((3540 - 420) / 2)
+
+    tracker.record(False, 3600)
+    assert tracker.outage_log(3700)[0] == {"start": 3600, "end": None, "duration": 100}
+
+
+def test_gaps_reboots_and_restore():
+    """Unobserved gaps aren't counted, upTime going back is a reboot, state persists."""
+    tracker = _tracker()
+    tracker.record(True, 0, uptime=5000)
+    tracker.record(False, 60, uptime=None)
+    # Home Assistant was stopped for an hour
+    tracker.record(True, 3660, uptime=30)
+    tracker.record(True, 3720, uptime=90)
+
+    assert tracker.outage_log(3720)[0] == {"start": 60, "end": 60, "duration": 0}
+    assert tracker.availability(DAY) == 100
+    assert tracker.reboots == 1
+    assert tracker.last_reboot == 3630
+    assert tracker.reboot_count(DAY) == 1
+
+    restored = _tracker()
+    restored.restore(json.loads(json.dumps(tracker.as_dict())), 3720)
+    for window in WINDOWS:
+        assert restored.availability(window) == tracker.availability(window)
+        assert restored.reboot_count(window) == tracker.reboot_count(window)
+    assert restored.outage_log(3720) == tracker.outage_log(3720)
+
+    # A week later everything has aged out
+    restored.record(True, 3720 + 7 * DAY, uptime=10**6)
+    assert restored.availability(7 * DAY) is None
+    assert restored.reboot_count(7 * DAY) == 0
+    assert restored.reboots == 1
@@ -0,0 +1,83 @@
+"""Test the serving cell scoreboard."""
+import json
+
+import pytest
+
+from custom_components.invisagig.cells import CellScoreboard, serving_cell
+
+LTE = {
+    "lteCell": {
+        "lteCid": 88177184,
+        "lteLac": 11271,
+        "ltePci": 59,
+        "lteBand": 66,
+        "lteStr": -72,
+        "lteQal": -8,
+        "lteSnr": 18,
+    }
+}
+
+
+def test_serving_cell_identity():
+    """The LTE anchor serves LTE and NSA; the SA cell serves SA."""
+    identity, signals = serving_cell(LTE, "311", "480")
+    assert identity == ("311", "480", 11271, 88177184, 59, 66)
+    assert signals == {"rsrp": -72, "rsrq": -8, "sinr": 18}
+
+    sa = {
+        **LTE,
+        "activeSim": {"networkMode": "5G_SA"},
+        "saCell": {
+            "saCid": 1234,
+            "saTac": 77,
+            "saPci": 301,
+            "saBand": 71,
+            "saStr": -95,
+        },
+    }
+    identity, signals = serving_cell(sa, "311", "480")
+    assert identity == ("311", "480", 77, 1234, 301, 71)
+    assert signals["rsrp"] == -95
+
+    assert serving_cell({"lteCell": {"lteStr": -90}}, None, None)[0] is None
+
+
+def test_scoreboard_means_dwell_and_rank():
+    """Readings are averaged per cell and polls credit dwell to the cell they saw."""
+    board = CellScoreboard(size=2, max_gap=180)
+    a, b, c = (
+        ("311", "480", 1, 10, 1, 66),
+        ("311", "480", 1, 11, 2, 66),
+        ("311", "480", 2, 12, 3, 2),
+    )
+
+    board.update(a, {"rsrp": -80, "sinr": None}, 60, 0)
+    board.update(a, {"rsrp": -90, "sinr": 10}, 80, 60)
+    board.update(b, {"rsrp": -100}, 90, 120)
+    # Missed polls: the gap isn't credited to anyone
+    board.update(b, {"rsrp": -100}, 90, 1000)
+
+    ranked = board.ranked()
+    assert [identity for identity, _ in ranked] == [b, a]
+    stats = dict(ranked)[a]
+    assert stats.samples == 2
+    assert stats.mean("rsrp") == -85
+    assert stats.mean("sinr") == 10
+    assert stats.mean("health") == 70
+    assert stats.dwell == 120
+    assert dict(ranked)[b].dwell == 0
+    assert board.rank(board.current) == 1
+
+    # The least recently served cell is evicted
+    board.update(c, {}, None, 1060)
+    assert len(board) == 2
+    assert board.rank(a) is None
+    assert board.rank(c) == 2
+    assert dict(board.ranked())[b].dwell == 60
+
+    restored = CellScoreboard(size=2, max_gap=180)
+    restored.restore(json.loads(json.dumps(board.as_list())))
+    assert [(i, s.samples) for i, s in restored.ranked()] == [
+        (i, s.samples) for i, s in board.ranked()
+    ]
+    assert dict(restored.ranked())[b].mean("rsrp") == pytest.approx(-100)
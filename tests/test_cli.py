@@ -0,0 +1,115 @@
+"""Test the HA-independent snapshot helpers and fleet CLI."""
+import asyncio
+import csv
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+from custom_components.invisagig import cli
+from custom_components.invisagig.cli import async_main
+from custom_components.invisagig.snapshot import RECORD_FIELDS, summarize
+
+SAMPLE = {
+    "device": {"model": "IG62", "igVersion": "2.0.1"},
+    "timeTemp": {
+        "timeDate": "Sat Dec 27 00:45:18 UTC 2025",
+        "upTime": 3600,
+        "temp": "45.0C",
+    },
+    "activeSim": {"slot": "SIM1", "carrier": "Verizon", "networkMode": "5G_NSA"},
+    "lteCell": {
+        "lteBand": 66,
+        "lteFreq": 66786,
+        "lteStr": -95,
+        "lteQal": -11,
+        "lteSnr": 12,
+    },
+    "nsaCell": {"nsaBand": 77, "nsaFreq": 650016, "nsaStr": -98, "nsaSnr": 8},
+}
+
+
+def test_summarize():
+    """The summary carries the values the sensors derive."""
+    summary = summarize(SAMPLE)
+    assert summary["connection_mode"] == "5G_NSA"
+    assert (summary["mcc"], summary["mnc"]) == ("311", "480")
+    assert summary["operator"] == "Verizon"
+    assert summary["lte_dl_mhz"] == 2145.0
+    assert summary["nr_band"] == 77
+    assert summary["nr_dl_mhz"] == 3750.24
+    assert summary["temperature"] == 45.0
+    assert summary["last_boot"] == "2025-12-26T23:45:18+00:00"
+    assert isinstance(summary["health_score"], int)
+    assert set(summary) < set(RECORD_FIELDS)
+
+
+def test_imports_without_home_assistant():
+    """The client, snapshot helpers and CLI import with homeassistant absent."""
+    code = (
+        "import sys\n"
+        "class Block:\n"
+        "    def find_spec(self, name, path=None, target=None):\n"
+        "        if name.split('.')[0] == 'homeassistant':\n"
+        "            raise ModuleNotFoundError(name=name)\n"
+        "sys.meta_path.insert(0, Block())\n"
+        "import custom_components.invisagig.cli\n"
+        "assert not any(m.startswith('homeassistant') for m in sys.modules)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+async def test_fleet_poll_is_bounded_and_streams():
+    """Hosts are polled at most --concurrency at a time and written as they finish."""
+    running = peak = 0
+
+    async def _poll(session, host, port, use_ssl):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        ok = host != "10.0.0.3"
+        record = {
+            "host": host,
+            "port": port,
+            "ok": ok,
+            "error": None if ok else "Timeout",
+        }
+        return record, SAMPLE if ok else None
+
+    out = io.StringIO()
+    with patch.object(cli, "async_poll", _poll):
+        code = await async_main(["10.0.0.0/29", "-c", "2", "--raw"], out)
+
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert code == 1
+    assert peak == 2
+    assert sorted(line["host"] for line in lines) == [
+        f"10.0.0.{i}" for i in range(1, 7)
+    ]
+    assert all(line["port"] == 80 for line in lines)
+    assert next(line for line in lines if line["host"] == "10.0.0.1")["data"] == SAMPLE
+
+    out = io.StringIO()
+    with patch.object(cli, "async_poll", _poll):
+        code = await async_main(["10.0.0.1", "--format", "csv", "--ssl"], out)
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert code == 0
+    assert rows == [
+        {
+            **dict.fromkeys(RECORD_FIELDS, ""),
+            "host": "10.0.0.1",
+            "port": "443",
+            "ok": "True",
+        }
+    ]
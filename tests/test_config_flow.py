@@ -5,9 +5,11 @@ from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PORT
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.invisagig.const import DOMAIN
 from custom_components.invisagig.api import InvisaGigApiClientCommunicationError
+from custom_components.invisagig.const import DATA_SEEDS, DOMAIN
+
 
 async def test_form(hass: HomeAssistant) -> None:
     """Test we get the form."""
@@ -70,3 +72,110 @@ async def test_form_cannot_connect(hass: HomeAssistant) -> None:
 
     assert result2["type"] == FlowResultType.FORM
     assert result2["errors"] == {"base": "cannot_connect"}
+
+
+async def test_options_reject_inverted_health_range(hass: HomeAssistant) -> None:
+    """A health leg whose minimum isn't below its maximum is rejected."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "1.1.1.1"})
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"health_rsrp_min": -80, "health_sinr_max": -20}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {
+        "health_rsrp_min": "invalid_health_range",
+        "health_sinr_min": "invalid_health_range",
+    }
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"health_rsrp_min": -100}
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options["health_rsrp_min"] == -100
+
+
+async def _discover(session, candidates, snapshots=None, **kwargs):
+    snapshots["192.168.225.1"] = {"device": {"model": "IG62"}}
+    return {"192.168.225.1": "IG62"}
+
+
+async def test_form_discovered(hass: HomeAssistant) -> None:
+    """Test discovered modems are offered for one-click setup."""
+    with patch("custom_components.invisagig.config_flow.async_discover", _discover):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        other = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "pick"
+
+    with patch(
+        "custom_components.invisagig.async_setup_entry",
+        return_value=True,
+    ):
+        result2 = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {CONF_HOST: "192.168.225.1"},
+        )
+        await hass.async_block_till_done()
+
+    assert result2["type"] == FlowResultType.CREATE_ENTRY
+    assert result2["data"][CONF_HOST] == "192.168.225.1"
+    # The entry starts from the snapshot discovery fetched
+    seed = hass.data[DATA_SEEDS]["192.168.225.1"][1]
+    assert seed == {"device": {"model": "IG62"}}
+
+    # A flow picking the same host afterwards aborts
+    result3 = await hass.config_entries.flow.async_configure(
+        other["flow_id"],
+        {CONF_HOST: "192.168.225.1"},
+    )
+    assert result3["type"] == FlowResultType.ABORT
+    assert result3["reason"] == "already_configured"
+
+async def test_scan_runs_as_progress_step(hass: HomeAssistant) -> None:
+    """Only the default address is probed up front; subnets on request."""
+    with patch(
+        "custom_components.invisagig.config_flow.async_discover",
+        return_value={},
+    ) as discover, patch(
+        "custom_components.invisagig.config_flow.network.async_get_adapters",
+        return_value=[
+            {"enabled": True, "ipv4": [{"address": "10.1.2.3", "network_prefix": 24}]}
+        ],
+    ):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        assert result["step_id"] == "user"
+        assert discover.call_args.args[1] == ["192.168.225.1"]
+
+        discover.return_value = {"10.1.2.9": "IG62"}
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_HOST: "192.168.225.1", "scan_local": True}
+        )
+        assert result["type"] == FlowResultType.SHOW_PROGRESS
+        assert result["progress_action"] == "scan"
+        await hass.async_block_till_done()
+        result = await hass.config_entries.flow.async_configure(result["flow_id"])
+        assert result["type"] == FlowResultType.FORM
+        assert result["step_id"] == "pick"
+        assert discover.call_args.args[1] == ["", "10.1.2.0/24"]
+
+        # Nothing found returns to the manual form with an error
+        discover.return_value = {}
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": config_entries.SOURCE_USER}
+        )
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], {CONF_HOST: "x", "scan_candidates": "10.9.9.0/30"}
+        )
+        await hass.async_block_till_done()
+        result = await hass.config_entries.flow.async_configure(result["flow_id"])
+        assert result["step_id"] == "user"
+        assert result["errors"] == {"base": "no_devices_found"}
+        assert discover.call_args.args[1] == ["10.9.9.0/30"]
@@ -0,0 +1,52 @@
+"""Test LAN discovery helpers."""
+from unittest.mock import MagicMock, patch
+
+from custom_components.invisagig import discovery
+from custom_components.invisagig.discovery import (
+    async_discover,
+    expand_candidates,
+    local_subnets,
+)
+
+
+def test_local_subnets():
+    """Local addresses are widened to their /24, skipping loopback and CGNAT."""
+    addresses = [
+        ("192.168.1.20", 16),
+        ("192.168.1.30", 24),
+        ("127.0.0.1", 8),
+        ("100.80.1.2", 10),
+    ]
+    assert local_subnets(addresses) == ["192.168.1.0/24"]
+
+
+def test_expand_candidates():
+    """Hosts and CIDR ranges expand in order without duplicates."""
+    hosts = expand_candidates(["10.0.0.1", " 10.0.0.0/30 ", "modem.lan", "bad/99"])
+    assert hosts == ["10.0.0.1", "10.0.0.2", "modem.lan"]
+
+
+async def test_discover_validates_model():
+    """Only open hosts reporting a device model are returned."""
+    responses = {
+        "10.0.0.5": {"device": {"model": "IG62"}},
+        "10.0.0.9": {"device": {}},
+    }
+
+    async def _port_open(host, port, timeout):
+        return host in responses
+
+    async def _get_data(client, max_age=None, shared=True):
+        assert not shared
+        return responses[client._host]
+
+    snapshots = {}
+    with patch.object(discovery, "_async_port_open", _port_open), patch.object(
+        discovery.InvisaGigApiClient, "async_get_data", _get_data
+    ):
+        found = await async_discover(
+            MagicMock(), ["10.0.0.0/28"], snapshots=snapshots
+        )
+
+    assert found == {"10.0.0.5": "IG62"}
+    assert snapshots == {"10.0.0.5": responses["10.0.0.5"]}
@@ -0,0 +1,47 @@
+"""Test network mode drift detection."""
+from custom_components.invisagig.drift import ModeDriftTracker
+
+
+def test_blip_does_not_confirm_drift():
+    """A single off-mode sample shorter than the dwell time is ignored."""
+    tracker = ModeDriftTracker("5G_SA", min_dwell=120, clear_dwell=300, window=3600)
+
+    assert not tracker.update("5G_SA", 0)
+    assert not tracker.update("5G_NSA", 60)
+    assert not tracker.update("5G_SA", 120)
+    assert not tracker.drifted
+    assert tracker.drift_count == 0
+
+
+def test_drift_confirmed_and_cleared_with_hysteresis():
+    """Drift needs min_dwell to set and clear_dwell to clear."""
+    tracker = ModeDriftTracker("5G_SA", min_dwell=120, clear_dwell=300, window=3600)
+    tracker.update("5G_SA", 0)
+
+    assert not tracker.update("LTE", 60)
+    assert not tracker.update("LTE", 120)
+    assert tracker.update("LTE", 180)
+    assert tracker.drifted
+    assert tracker.drift_count == 1
+
+    # Back on preferred, but not for long enough
+    assert not tracker.update("5G_SA", 240)
+    assert not tracker.update("5G_SA", 480)
+    assert tracker.drifted
+    assert tracker.update("5G_SA", 540)
+    assert not tracker.drifted
+
+
+def test_preferred_percent_and_time_in_mode():
+    """Time on the preferred mode is tracked over the rolling window."""
+    tracker = ModeDriftTracker("LTE", min_dwell=0, clear_dwell=0, window=100)
+    tracker.update("LTE", 0)
+    tracker.update("5G_NSA", 50)
+    tracker.update("5G_NSA", 100)
+
+    assert tracker.preferred_percent == 50.0
+    assert tracker.time_in_mode(100) == 50
+
+    # The LTE span slides out of the window
+    tracker.update("5G_NSA", 150)
+    assert tracker.preferred_percent == 0.0
@@ -0,0 +1,37 @@
+"""Test connection health scoring."""
+from custom_components.invisagig.health import HealthConfig, compute_health
+
+
+def test_lte_only_matches_legacy_weights():
+    """LTE-only snapshots score with the 40/40/20 weighting."""
+    data = {"lteCell": {"lteStr": -100, "lteSnr": 10, "lteQal": -15}}
+    health = compute_health(data, HealthConfig())
+
+    assert health["score"] == 50
+    assert health["lte_rsrp_score"] == 50
+    assert "nr_score" not in health
+
+
+def test_missing_rsrq_reweights():
+    """Missing RSRQ splits the score between RSRP and SINR."""
+    data = {"lteCell": {"lteStr": -80, "lteSnr": 0, "lteQal": None}}
+    assert compute_health(data, HealthConfig())["score"] == 50
+
+
+def test_nr_leg_is_combined():
+    """NSA snapshots blend the LTE anchor and the NR leg."""
+    data = {
+        "lteCell": {"lteStr": -120, "lteSnr": 0, "lteQal": -20},
+        "nsaCell": {"nsaStr": -80, "nsaSnr": 20, "nsaQal": -10},
+    }
+    health = compute_health(data, HealthConfig(nr_weight=75))
+
+    assert health["score"] == 75
+    assert health["nr_leg"] == "nsa"
+    assert health["lte_score"] == 0
+    assert health["nr_score"] == 100
+
+
+def test_no_metrics():
+    """Nothing to score without RSRP and SINR."""
+    assert compute_health({"lteCell": {"lteStr": -90}}, HealthConfig()) is None
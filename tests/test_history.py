@@ -0,0 +1,144 @@
+"""Test the InvisaGig metric history."""
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.invisagig import websocket
+from custom_components.invisagig.const import DOMAIN
+from custom_components.invisagig.history import MetricHistory
+from custom_components.invisagig.services import GET_HISTORY_SCHEMA, history_query
+
+
+def test_ring_wraps_and_bisects():
+    """Only the newest samples are kept, and windows are inclusive."""
+    history = MetricHistory(4, ("a", "b"))
+    for second in range(6):
+        history.append(100 + second, {"a": second, "b": "n/a"})
+    assert history.query() == {
+        "time": [102, 103, 104, 105],
+        "a": [2, 3, 4, 5],
+        "b": [None, None, None, None],
+    }
+    assert history.query(start=103, end=104, metrics=["a"]) == {
+        "time": [103, 104],
+        "a": [3, 4],
+    }
+    assert history.query(start=103.5, end=103.9) == {"time": [], "a": [], "b": []}
+    # A clock stepping back does not unsort the timestamps
+    history.append(50, {"a": 6})
+    assert history.query(metrics=["a"])["time"] == [103, 104, 105, 105]
+
+
+def test_downsampling():
+    """Buckets aggregate their non-missing values; empty buckets are left out."""
+    history = MetricHistory(10, ("a",))
+    for when, value in ((0, 1), (30, 4), (59, None), (60, None), (180, -2), (190, 3)):
+        history.append(when, {"a": value})
+    assert history.query(resolution=60, aggregates=["mean", "min", "max"]) == {
+        "time": [0, 60, 180],
+        "a_mean": [2.5, None, 0.5],
+        "a_min": [1, None, -2],
+        "a_max": [4, None, 3],
+    }
+    assert MetricHistory(2, ("a",)).query(resolution=60) == {"time": [], "a_mean": []}
+
+
+def test_query_is_fast():
+    """A full day at one minute polls downsamples within a few milliseconds."""
+    history = MetricHistory(1440, ("a", "b", "c"))
+    for minute in range(2000):
+        history.append(minute * 60, {"a": minute, "b": -minute, "c": None})
+    start = time.perf_counter()
+    for _ in range(20):
+        result = history.query(start=60000, metrics=["a", "b"], resolution=900)
+    assert (time.perf_counter() - start) / 20 < 0.005
+    assert result["a_mean"][-1] == 1997.0
+
+
+async def test_naive_times_are_local(hass: HomeAssistant) -> None:
+    """Times without an offset are read in the configured time zone."""
+    await hass.config.async_update(time_zone="America/Chicago")
+    history = MetricHistory(4, ("a",))
+    # 2024-01-01 00:00 and 01:00 in Chicago (UTC-6)
+    history.append(1704088800, {"a": 1})
+    history.append(1704092400, {"a": 2})
+    coordinator = SimpleNamespace(history=history)
+    params = GET_HISTORY_SCHEMA({"start": "2024-01-01 01:00:00"})
+    assert history_query(coordinator, params)["a"] == [2]
+    params = GET_HISTORY_SCHEMA({"end": datetime(2024, 1, 1, 0, 30)})
+    assert history_query(coordinator, params)["a"] == [1]
+
+
+async def test_service_and_websocket(hass: HomeAssistant) -> None:
+    """The service and the websocket command return the same columns."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": "1.2.3.4"})
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_get_data",
+        return_value={"lteCell": {"lteStr": -90}, "timeTemp": {"temp": "45C"}},
+    ) as get_data, patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_probe",
+        return_value=True,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        get_data.return_value = {"lteCell": {"lteStr": -96}}
+        await coordinator.async_refresh()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "get_history",
+        {"metrics": ["lte_rsrp", "temperature"]},
+        blocking=True,
+        return_response=True,
+    )
+    assert len(response["time"]) == 2
+    assert response["lte_rsrp"] == [-90, -96]
+    assert response["temperature"] == [45, None]
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        "get_history",
+        {
+            "entry_id": entry.entry_id,
+            "metrics": "lte_rsrp",
+            "resolution": 86400,
+            "aggregate": ["min", "max"],
+        },
+        blocking=True,
+        return_response=True,
+    )
+    assert response["lte_rsrp_min"] == [-96]
+    assert response["lte_rsrp_max"] == [-90]
+
+    connection = MagicMock()
+    websocket.ws_history(
+        hass,
+        connection,
+        {
+            "id": 3,
+            "type": "invisagig/history",
+            "metrics": ["lte_rsrp"],
+            "aggregate": ["mean"],
+        },
+    )
+    connection.send_result.assert_called_once_with(
+        3, {"time": coordinator.history.query()["time"], "lte_rsrp": [-90, -96]}
+    )
+    websocket.ws_history(
+        hass,
+        connection,
+        {
+            "id": 4,
+            "type": "invisagig/history",
+            "entry_id": "nope",
+            "aggregate": ["mean"],
+        },
+    )
+    connection.send_error.assert_called_once()
@@ -0,0 +1,263 @@
+"""Test InvisaGig setup."""
+import time
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.invisagig import api
+from custom_components.invisagig.api import InvisaGigApiClientCommunicationError
+from custom_components.invisagig.const import DOMAIN
+
+
+async def test_setup_restores_snapshot(hass: HomeAssistant, hass_storage) -> None:
+    """An unreachable modem doesn't block setup; the saved snapshot is used."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": "1.2.3.4"})
+    entry.add_to_hass(hass)
+    hass_storage[f"{DOMAIN}.{entry.entry_id}"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.{entry.entry_id}",
+        "data": {
+            "snapshot": {"device": {"model": "IG62"}, "timeTemp": {"temp": "41c"}}
+        },
+    }
+
+    with patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_get_data",
+        side_effect=InvisaGigApiClientCommunicationError,
+    ), patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_probe",
+        return_value=False,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.restored
+    assert coordinator.data["timeTemp"]["temp"] == "41c"
+
+
+async def test_options_applied_in_place(hass: HomeAssistant) -> None:
+    """Option changes reconfigure the coordinator instead of reloading."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": "1.2.3.4"})
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_get_data",
+        return_value={
+            "device": {"model": "IG62"},
+            "lteCell": {"lteStr": -100, "lteSnr": 10, "lteQal": -15},
+        },
+    ), patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_probe",
+        return_value=True,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        await coordinator.async_refresh()
+        assert hass.states.get("sensor.raw_json") is None
+        assert coordinator.health_smoothed == 50
+        assert coordinator.plmn is None
+
+        hass.config_entries.async_update_entry(
+            entry,
+            options={
+                "include_raw_json": True,
+                "scan_interval": 120,
+                "health_rsrp_min": -100,
+                "mcc": "310",
+                "mnc": "410",
+            },
+        )
+        await hass.async_block_till_done()
+
+    assert hass.data[DOMAIN][entry.entry_id] is coordinator
+    assert coordinator.update_interval.total_seconds() == 120
+    assert hass.states.get("sensor.raw_json") is not None
+    # Re-scored with the new thresholds, without the old scores in the window
+    assert coordinator.health["score"] == 30
+    assert coordinator.health_smoothed == 30
+    assert list(coordinator._health_history) == [30]
+    assert (coordinator.plmn.mcc, coordinator.plmn.mnc) == ("310", "410")
+
+
+async def test_signal_deadband_and_last_boot(hass: HomeAssistant) -> None:
+    """Small signal changes and boot time jitter don't write new states."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"host": "1.2.3.4"},
+        options={"rsrp_deadband": 2, "sinr_step": 5},
+    )
+    entry.add_to_hass(hass)
+
+    def _snapshot(rsrp, sinr, uptime, clock):
+        return {
+            "timeTemp": {
+                "upTime": uptime,
+                "timeDate": f"Sat Dec 27 00:{clock} UTC 2025",
+            },
+            "lteCell": {"lteStr": rsrp, "lteSnr": sinr},
+        }
+
+    with patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_get_data",
+        return_value=_snapshot(-90, 12, 600, "10:00"),
+    ) as get_data, patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_probe",
+        return_value=True,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        rsrp = "sensor.invisagig_1_2_3_4_lte_rsrp"
+        boot = hass.states.get("sensor.invisagig_1_2_3_4_last_boot")
+        assert boot.state == "2025-12-27T00:00:00+00:00"
+        assert hass.states.get(rsrp).state == "-90"
+        assert hass.states.get("sensor.invisagig_1_2_3_4_lte_sinr").state == "10"
+
+        # One second of skew between the clock and uptime, 1 dB of noise
+        get_data.return_value = _snapshot(-91, 13, 661, "11:02")
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert hass.states.get(rsrp).state == "-90"
+        assert coordinator.suppressed_writes == 1
+        assert hass.states.get("sensor.invisagig_1_2_3_4_last_boot") == boot
+
+        get_data.return_value = _snapshot(-93, 13, 60, "12:00")
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert hass.states.get(rsrp).state == "-93"
+        assert hass.states.get("sensor.invisagig_1_2_3_4_last_boot").state == (
+            "2025-12-27T00:11:00+00:00"
+        )
+
+
+async def test_poll_follows_refresh_phase(hass: HomeAssistant) -> None:
+    """Polls are rescheduled around the modem's refresh unless disabled."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": "1.2.3.4"})
+    entry.add_to_hass(hass)
+
+    api._RECENT.clear()
+    with patch(
+        "custom_components.invisagig.api.InvisaGigApiClient._async_fetch",
+        return_value={"timeTemp": {"upTime": 600}},
+    ), patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_probe",
+        return_value=True,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+
+        # One sample leaves the phase unknown within a period: bisect it
+        assert 60 < coordinator.update_interval.total_seconds() < 120
+        attributes = hass.states.get(
+            "sensor.invisagig_1_2_3_4_poll_loop_blocking_time"
+        ).attributes
+        assert attributes["phase_locked"] is False
+        assert attributes["refresh_period"] == 60
+
+        # While the probe reports the modem down, retries use the configured cadence
+        coordinator.probe.data = False
+        await coordinator.async_refresh()
+        assert not coordinator.last_update_success
+        assert coordinator.update_interval.total_seconds() == 60
+        coordinator.probe.data = True
+
+        hass.config_entries.async_update_entry(entry, options={"phase_lock": False})
+        await hass.async_block_till_done()
+        assert coordinator.phase is None
+        assert coordinator.update_interval.total_seconds() == 60
+
+
+async def test_availability_survives_outages_and_restarts(
+    hass: HomeAssistant, hass_storage
+) -> None:
+    """Availability sensors keep updating while polls fail and are restored."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": "1.2.3.4"})
+    entry.add_to_hass(hass)
+    key = f"{DOMAIN}.{entry.entry_id}"
+    hass_storage[key] = {
+        "version": 1,
+        "key": key,
+        "data": {"availability": {"reboots": 4, "last": [time.time() - 60, True]}},
+    }
+
+    with patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_get_data",
+        return_value={"timeTemp": {"upTime": 600}},
+    ) as get_data, patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_probe",
+        return_value=True,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        assert hass.states.get("sensor.invisagig_1_2_3_4_reboots").state == "4"
+        assert (
+            hass.states.get("sensor.invisagig_1_2_3_4_availability_24h").state
+            == "100.0"
+        )
+
+        get_data.side_effect = InvisaGigApiClientCommunicationError
+        for _ in range(2):
+            # As if the last poll was a minute ago
+            coordinator.availability._last = (
+                time.time() - 60,
+                coordinator.last_update_success,
+            )
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+        assert (
+            hass.states.get("sensor.invisagig_1_2_3_4_lte_rsrp").state == "unavailable"
+        )
+        outages = hass.states.get("sensor.invisagig_1_2_3_4_outages")
+        assert outages.state == "1"
+        assert outages.attributes["ongoing"] is True
+        assert (
+            float(hass.states.get("sensor.invisagig_1_2_3_4_availability_24h").state)
+            < 100
+        )
+
+    stored = coordinator._data_to_store()["availability"]
+    assert stored["reboots"] == 4
+    assert stored["outage_start"] is not None
+
+
+async def test_anomaly_event_and_binary_sensor(hass: HomeAssistant) -> None:
+    """A sustained deviation fires an event and turns the anomaly sensor on."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data={"host": "1.2.3.4"}, options={"anomaly_duration": 0}
+    )
+    entry.add_to_hass(hass)
+    events = async_capture_events(hass, "invisagig_anomaly")
+
+    with patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_get_data",
+        return_value={"lteCell": {"lteSnr": 15}},
+    ) as get_data, patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_probe",
+        return_value=True,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        coordinator.anomaly.warmup = 2
+        for sinr in (15, -5):
+            get_data.return_value = {"lteCell": {"lteSnr": sinr}}
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.anomaly")
+    assert state.state == "on"
+    assert state.attributes["metrics"]["lte_sinr"]["value"] == -5
+    assert len(events) == 1
+    assert events[0].data["metric"] == "lte_sinr"
+    assert events[0].data["anomalous"] is True
+    assert events[0].data["host"] == "1.2.3.4"
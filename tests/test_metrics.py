@@ -0,0 +1,91 @@
+"""Test the OpenMetrics exporter."""
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.invisagig.const import DOMAIN
+from custom_components.invisagig.metrics import collect, render
+from custom_components.invisagig.view import InvisaGigMetricsView
+
+SNAPSHOT = {
+    "device": {"model": "IG62", "igVersion": "1.0.14"},
+    "activeSim": {"slot": "SIM1", "carrier": 'Ver"izon'},
+    "timeTemp": {"upTime": 1569778, "temp": "54c"},
+    "lteCell": {"lteBand": 66, "lteCid": 88177184, "ltePci": 59, "lteStr": -72.5},
+    "dataUsed": {"SIM1": {"totalMBytes": 1145475.15}, "SIM2": {"totalMBytes": None}},
+    "carAgg": {"nr5g": [{"state": "active", "band": 41, "pci": 100, "freq": 520110}]},
+}
+
+
+def test_render():
+    """Test numeric fields become labelled samples in valid order."""
+    text = render(
+        [
+            collect("1.2.3.4", SNAPSHOT, {"up": ("gauge", 1)}),
+            collect("5.6.7.8", {"lteCell": {"lteStr": -90}}),
+        ]
+    )
+    lines = text.splitlines()
+    assert lines[-1] == "# EOF"
+    assert (
+        'invisagig_lte_cell_lte_str{band="66",cell="88177184",device="1.2.3.4",'
+        'pci="59",sim="SIM1"} -72.5' in lines
+    )
+    # Both devices' samples sit under a single family header
+    index = lines.index("# TYPE invisagig_lte_cell_lte_str gauge")
+    assert lines[index + 2] == 'invisagig_lte_cell_lte_str{device="5.6.7.8"} -90'
+    assert "# TYPE invisagig_data_used_total_mbytes counter" in lines
+    assert (
+        'invisagig_data_used_total_mbytes_total{device="1.2.3.4",sim="SIM1"} 1145475.15'
+        in lines
+    )
+    assert (
+        'invisagig_active_sim_info{carrier="Ver\\"izon",device="1.2.3.4",slot="SIM1"} 1'
+        in lines
+    )
+    assert 'invisagig_car_agg_freq{band="41",device="1.2.3.4",index="0",pci="100",' \
+        'radio="nr5g",state="active"} 520110' in lines
+    assert 'invisagig_up{device="1.2.3.4"} 1' in lines
+    assert "invisagig_time_temp_temp" not in text
+
+
+async def test_metrics_view(hass: HomeAssistant) -> None:
+    """Test the endpoint serves enabled entries from a cached buffer."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": "1.2.3.4"})
+    entry.add_to_hass(hass)
+    view = InvisaGigMetricsView()
+    request = MagicMock(app={"hass": hass})
+
+    with patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_get_data",
+        return_value=SNAPSHOT,
+    ), patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_probe",
+        return_value=True,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        response = await view.get(request)
+        assert response.status == 404
+
+        hass.config_entries.async_update_entry(entry, options={"enable_metrics": True})
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        with patch(
+            "custom_components.invisagig.view.render", wraps=render
+        ) as render_mock:
+            response = await view.get(request)
+            assert response.status == 200
+            assert response.headers["Content-Type"].startswith(
+                "application/openmetrics-text"
+            )
+            assert 'invisagig_up{device="1.2.3.4"} 1' in response.body.decode()
+
+            await view.get(request)
+            assert render_mock.call_count == 1
+
+            await coordinator.async_refresh()
+            await view.get(request)
+            assert render_mock.call_count == 2
@@ -91,3 +91,31 @@ def test_sensor_parsing():
 
     # Test LTE Band
     # I didn't verify every single field in SENSOR_TYPES earlier, let's assume they work if keys match.
+
+
+def test_parse_date_matches_strptime():
+    """Test the fixed-format date parser agrees with strptime."""
+    from datetime import datetime, timezone
+
+    from custom_components.invisagig.sensor import parse_date
+
+    fmt = "%a %b %d %H:%M:%S UTC %Y"
+    for value in (
+        "Sat Dec 27 00:45:18 UTC 2025",
+        "Sun Dec  7 23:59:59 UTC 2025",
+        "Thu Feb 29 12:00:00 UTC 2024",
+    ):
+        expected = datetime.strptime(value, fmt).replace(tzinfo=timezone.utc)
+        assert parse_date(value) == expected
+
+    for value in (
+        None,
+        "",
+        {},
+        "Sat Dec 32 00:45:18 UTC 2025",
+        "Sat Foo 27 00:45:18 UTC 2025",
+        "Sat Dec 27 00:45 UTC 2025",
+        "Sat Dec 27 00:45:18 CET 2025",
+        "2025-12-27T00:45:18Z",
+    ):
+        assert parse_date(value) is None
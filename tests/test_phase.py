@@ -0,0 +1,89 @@
+"""Test refresh phase tracking."""
+import random
+
+from custom_components.invisagig.phase import RefreshPhaseTracker
+
+
+class _Modem:
+    """Rewrites its document every 60 s, starting at local time phase."""
+
+    def __init__(self, phase, uptime=1000):
+        self.phase = phase
+        self.uptime = uptime
+
+    def document(self, now):
+        refreshes = (now - self.phase) // 60
+        return {"timeTemp": {"upTime": max(0, self.uptime + 60 * refreshes)}}
+
+    def staleness(self, now):
+        return (now - self.phase) % 60
+
+
+def _run(tracker, modem, now, polls, rng, events=None):
+    """Poll as the coordinator would; return (staleness, delay) per poll."""
+    history = []
+    for index in range(polls):
+        if events and index in events:
+            events[index](modem, now)
+        latency = rng.uniform(0.05, 0.4)
+        tracker.update(modem.document(now), now, now + latency)
+        delay = tracker.next_delay(now + latency, 60)
+        history.append((modem.staleness(now), delay))
+        # The HA scheduler rounds to whole seconds
+        now += latency + delay + rng.uniform(-0.9, 0.9)
+    return history, now
+
+
+def _tracker():
+    return RefreshPhaseTracker(60, 2, 3, 2e-4, 30)
+
+
+def test_locks_onto_refresh_phase():
+    """Within a handful of polls every poll lands a few seconds after a refresh."""
+    rng = random.Random(1)
+    for phase in (0.0, 13.7, 41.2, 59.9):
+        tracker = _tracker()
+        history, _ = _run(tracker, _Modem(phase), rng.uniform(0, 60), 20, rng)
+        assert tracker.locked
+        assert tracker.period == 60
+        assert all(stale < 5 for stale, _ in history[8:])
+        # No more requests than plain 60 s polling
+        assert all(55 < delay < 65 for _, delay in history[8:])
+
+
+def test_resyncs_after_refresh_moves():
+    """Later and earlier refresh jumps and reboots are all recovered from."""
+
+    def later(modem, now):
+        modem.phase += 25
+
+    def earlier(modem, now):
+        modem.phase -= 30
+
+    def reboot(modem, now):
+        modem.phase = now + 5
+        modem.uptime = 0
+
+    rng = random.Random(3)
+    tracker = _tracker()
+    history, _ = _run(
+        tracker, _Modem(20.0), 5.0, 160, rng, {20: later, 50: earlier, 120: reboot}
+    )
+    late = [stale > 5 for stale, _ in history]
+    assert tracker.resyncs >= 3
+    assert tracker.locked
+    # Later jumps show at the next poll; earlier ones only at the next
+    # recheck, which (like the odd bisecting poll) may see the old document
+    for start in (30, 80, 100, 140):
+        assert sum(late[start : start + 20]) <= 2
+
+
+def test_unknown_device_time_is_ignored():
+    """Snapshots without upTime or timeDate leave the tracker alone."""
+    tracker = _tracker()
+    tracker.update({"timeTemp": {}}, 0, 0.1)
+    assert tracker.next_delay(1, 60) is None
+    assert tracker.attributes(1, 60)["phase_locked"] is False
+
+    tracker.update({"timeTemp": {"timeDate": "Sat Dec 27 00:45:18 UTC 2025"}}, 0, 0.1)
+    assert tracker.next_delay(1, 60) is not None
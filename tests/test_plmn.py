@@ -0,0 +1,60 @@
+"""Test MCC/MNC and operator resolution."""
+from custom_components.invisagig.plmn import plmn_identity, resolve_plmn
+
+
+def test_resolution_order():
+    """Test each source is used in turn."""
+    data = {
+        "activeSim": {"mcc": 311, "mnc": 480, "carrier": "T-Mobile"},
+        "lteCell": {"plmn": "310260"},
+    }
+    plmn = resolve_plmn(data, 302, 720)
+    assert (plmn.mcc, plmn.mnc, plmn.source) == ("302", "720", "override")
+    assert plmn.operator == "Rogers"
+
+    plmn = resolve_plmn(data, 0, 0)
+    assert (plmn.mcc, plmn.mnc, plmn.source) == ("311", "480", "sim")
+    assert plmn.operator == "Verizon"
+
+    # An MCC override alone leaves the MNC at its default of 0, i.e. unset
+    plmn = resolve_plmn(data, 302, 0)
+    assert (plmn.mcc, plmn.mnc, plmn.source) == ("311", "480", "sim")
+
+    del data["activeSim"]["mcc"]
+    plmn = resolve_plmn(data)
+    assert (plmn.mcc, plmn.mnc, plmn.source) == ("310", "260", "cell_plmn")
+
+    del data["lteCell"]["plmn"]
+    plmn = resolve_plmn(data)
+    assert (plmn.mcc, plmn.mnc, plmn.source) == ("310", "260", "carrier")
+
+
+def test_leading_zeros_restored():
+    """Test integer MNCs get the width the index knows."""
+    assert resolve_plmn({"activeSim": {"mcc": 310, "mnc": 4}}).mnc == "004"
+    assert resolve_plmn({"activeSim": {"mcc": 234, "mnc": 30}}).operator == "EE"
+
+
+def test_carrier_names():
+    """Test carrier name lookup, including aliases and longer names."""
+    def _carrier(name):
+        plmn = resolve_plmn({"activeSim": {"carrier": name}})
+        return plmn and plmn.operator
+
+    assert _carrier("Verizon ") == "Verizon"
+    assert _carrier("TMobile") == "T-Mobile"
+    assert _carrier("AT&T Mexico") == "AT&T Mexico"
+    assert _carrier("Unknown Telco") is None
+
+
+def test_identity_ignores_signal_changes():
+    """Test the identity only changes with SIM or network inputs."""
+    data = {
+        "activeSim": {"slot": "SIM1", "carrier": "Verizon"},
+        "lteCell": {"lteStr": -80},
+    }
+    identity = plmn_identity(data)
+    data["lteCell"]["lteStr"] = -90
+    assert plmn_identity(data) == identity
+    data["activeSim"]["slot"] = "SIM2"
+    assert plmn_identity(data) != identity
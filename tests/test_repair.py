@@ -0,0 +1,148 @@
+"""Test the tolerant JSON repair engine."""
+import json
+import random
+import time
+
+import pytest
+
+from custom_components.invisagig.repair import apply_legacy_fixes, parse_json
+
+SAMPLE_JSON = """
+{
+"device": {"model": "IG62", "igVersion": "1.0.14"},
+"activeSim": {"slot": "SIM1", "networkMode": "LTE", "carrier": "Verizon "},
+"dataUsed": {"SIM1": {"billingPeriod": {"startDate": "2025-12-01"},
+                      "totalMBytes": 1145475.15}},
+"lteCell": {"lteBand": 66, "lteUlbw": "20 MHz",
+            "lteStr": -72, "lteQal": -8, "lteSnr": 18},
+"caInfo": [{"band": "B2", "pci": 59}, {"band": "n41", "pci": 310}]
+}
+"""
+
+
+@pytest.mark.parametrize(
+    ("text", "expected", "repair"),
+    [
+        ('{"a":1,}', {"a": 1}, "trailing_comma"),
+        ("[1,,2]", [1, None, 2], "missing_value"),
+        ('{"a":\r\n}', {"a": None}, "missing_value"),
+        ('{"a":1 "b":2}', {"a": 1, "b": 2}, "missing_comma"),
+        ('{"a" 1}', {"a": 1}, "missing_colon"),
+        ('{"a":nan,"b":None}', {"a": None, "b": None}, "bare_literal"),
+        ('{"a":NaN}', {"a": None}, "bare_literal"),
+        ('{"s":REGISTERED}', {"s": "REGISTERED"}, "bare_word"),
+        ("{band:3}", {"band": 3}, "unquoted_key"),
+        ('{"a":+5,"b":.5,"c":007}', {"a": 5, "b": 0.5, "c": 7}, "number_format"),
+        ('{"a":"x\ny"}', {"a": "x\ny"}, "control_character"),
+        ('{"a":"c:\\d"}', {"a": "c:\\d"}, "invalid_escape"),
+        ('{"a":[1,2}', {"a": [1, 2]}, "mismatched_bracket"),
+        ('{"a":1}}', {"a": 1}, "trailing_data"),
+        ('{"a":{"b":1,"c":"ab', {"a": {"b": 1}}, "truncated"),
+        ('{"a":1,"b":-11', {"a": 1}, "truncated"),
+    ],
+)
+def test_repairs(text, expected, repair):
+    """Test each catalogued malformation is repaired and reported."""
+    data, repairs = parse_json(text)
+    assert data == expected
+    assert repair in repairs
+
+
+def test_legacy_fixes_take_fast_path():
+    """Test bodies the old sanitizer handled parse without repairs."""
+    text = '{"a": , "b": }'
+    assert apply_legacy_fixes(text) == '{"a": null, "b": null}'
+    assert parse_json(text) == ({"a": None, "b": None}, {})
+
+
+def test_garbage_still_fails():
+    """Test a body that isn't a document raises a JSON error."""
+    with pytest.raises(json.JSONDecodeError):
+        parse_json("Service Unavailable")
+
+
+def _random_value(rng, depth=0):
+    kind = rng.randrange(7 if depth < 4 else 4)
+    if kind == 0:
+        return rng.randint(-10**6, 10**6)
+    if kind == 1:
+        return round(rng.uniform(-200, 200), rng.randrange(4))
+    if kind == 2:
+        return "".join(rng.choice('ab "\\\n\té:,}') for _ in range(rng.randrange(8)))
+    if kind == 3:
+        return rng.choice([True, False, None])
+    if kind in (4, 5):
+        return {
+            f"k{i}": _random_value(rng, depth + 1) for i in range(rng.randrange(5))
+        }
+    return [_random_value(rng, depth + 1) for _ in range(rng.randrange(5))]
+
+
+def test_valid_json_round_trips():
+    """Test valid documents parse unchanged and without repairs."""
+    rng = random.Random(35)
+    for _ in range(300):
+        value = {"root": _random_value(rng)}
+        text = json.dumps(value, indent=rng.choice([None, 1]))
+        assert parse_json(text) == (value, {})
+
+
+def test_every_truncation_recovers():
+    """Test every prefix of a real body yields a dict of intact members."""
+    full, _ = parse_json(SAMPLE_JSON)
+    start = SAMPLE_JSON.index("{")
+    for end in range(start + 1, len(SAMPLE_JSON)):
+        data, _ = parse_json(SAMPLE_JSON[:end])
+        assert isinstance(data, dict)
+        _assert_intact(data, full)
+
+
+def _assert_intact(partial, full):
+    """Members that made it through a truncation are never corrupted."""
+    if isinstance(partial, dict):
+        for key, value in partial.items():
+            _assert_intact(value, full[key])
+    elif isinstance(partial, list):
+        for index, value in enumerate(partial):
+            _assert_intact(value, full[index])
+    else:
+        assert partial == full
+
+
+def test_mutations_never_crash():
+    """Test random corruption either parses or raises a JSON error."""
+    rng = random.Random(350)
+    alphabet = '{}[],:" \n\\aZ09.-'
+    for _ in range(1000):
+        text = list(SAMPLE_JSON)
+        for _ in range(rng.randrange(1, 6)):
+            pos = rng.randrange(len(text))
+            action = rng.randrange(3)
+            if action == 0:
+                del text[pos]
+            elif action == 1:
+                text.insert(pos, rng.choice(alphabet))
+            else:
+                text[pos] = rng.choice(alphabet)
+        try:
+            data, _ = parse_json("".join(text))
+        except json.JSONDecodeError:
+            continue
+        assert isinstance(data, (dict, list))
+
+
+def test_fast_path_cost():
+    """Test the fast path stays close to a bare sanitize and json.loads."""
+    text = SAMPLE_JSON
+
+    def _best(func):
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            for _ in range(200):
+                func(text)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    legacy = _best(lambda body: json.loads(apply_legacy_fixes(body)))
+    assert _best(parse_json) < legacy * 1.5 + 0.001
@@ -0,0 +1,81 @@
+"""Test billing cycle usage forecasting."""
+import pytest
+
+from custom_components.invisagig.usage import CycleForecast, UsageTracker, billing_cycle
+
+DAY = 86400
+START = 1764547200  # 2025-12-01
+END = 1767139200  # 2025-12-31
+
+
+def _sim(total, start=START, end=END):
+    return {
+        "startEpochMs": start * 1000,
+        "endEpochMs": end * 1000,
+        "totalMBytes": total,
+    }
+
+
+def test_billing_cycle():
+    """Epochs are preferred; the ISO dates are the fallback; nulls give nothing."""
+    assert billing_cycle(_sim(0)) == (START, END)
+    dates = {"billingPeriod": {"startDate": "2025-12-01", "endDate": "2025-12-31"}}
+    assert billing_cycle(dates) == (START, END)
+    nulls = {
+        "billingPeriod": {"startDate": "null", "endDate": "null"},
+        "startEpochMs": None,
+        "endEpochMs": None,
+    }
+    assert billing_cycle(nulls) is None
+
+
+def test_forecast_and_quota():
+    """A steady burn is fitted exactly and projected to the cycle end."""
+    forecast = CycleForecast(min_span=6 * 3600)
+    for hour in range(0, 5):
+        forecast.update((START, END), 1000 + hour * 100, START + DAY + hour * 3600)
+    assert forecast.burn_rate is None
+
+    for hour in range(5, 48):
+        forecast.update((START, END), 1000 + hour * 100, START + DAY + hour * 3600)
+    assert forecast.burn_rate == pytest.approx(2400)
+    # Last sample at day 2 23:00, 27 days and one hour to go at 2400 MB a day
+    assert forecast.projected == pytest.approx(5700 + 2400 * (27 + 1 / 24))
+    assert forecast.days_until(10_000) == pytest.approx(4300 / 2400)
+    assert forecast.days_until(1000) == 0
+
+    restored = CycleForecast(min_span=6 * 3600)
+    restored.restore(forecast.as_dict())
+    assert restored.projected == pytest.approx(forecast.projected)
+
+    # A new cycle starts over
+    forecast.update((END, END + 30 * DAY), 10, END + 60)
+    assert forecast.samples == 1
+    assert forecast.burn_rate is None
+    # So does a counter reset within the cycle
+    forecast.update((END, END + 30 * DAY), 500, END + 120)
+    forecast.update((END, END + 30 * DAY), 5, END + 180)
+    assert forecast.samples == 1
+
+
+def test_sim_switch():
+    """Each SIM keeps its own fit; flat stretches while inactive slow its rate."""
+    tracker = UsageTracker(min_span=3600)
+    for hour in range(48):
+        active = "SIM1" if hour < 24 else "SIM2"
+        totals = {"SIM1": min(hour, 24) * 50, "SIM2": max(hour - 24, 0) * 10}
+        data = {"dataUsed": {sim: _sim(total) for sim, total in totals.items()}}
+        data["activeSim"] = {"slot": active}
+        tracker.update(data, START + hour * 3600)
+
+    sim1, sim2 = tracker.forecasts["SIM1"], tracker.forecasts["SIM2"]
+    assert sim1.last_total == 1200
+    assert 0 < sim1.burn_rate < 1200
+    assert sim2.last_total == 230
+    assert 0 < sim2.burn_rate < 240
+    assert tracker.as_dict().keys() == {"SIM1", "SIM2"}
+
+    # A SIM without data isn't sampled
+    tracker = UsageTracker(min_span=3600)
+    tracker.update({"dataUsed": {"SIM2": {"totalMBytes": None}}}, START)
+    assert tracker.as_dict() == {}
@@ -0,0 +1,153 @@
+"""Test the InvisaGig websocket API."""
+import json
+from unittest.mock import MagicMock, patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.invisagig import websocket
+from custom_components.invisagig.const import DATA_BROADCASTS, DOMAIN
+from custom_components.invisagig.snapshot import snapshot_diff
+
+
+def test_snapshot_diff():
+    """Nested changes, additions and removals are reported by path."""
+    old = {
+        "device": {"model": "IG62"},
+        "lteCell": {"lteStr": -90, "lteSnr": 10},
+        "carAgg": {"lte": [1]},
+    }
+    new = {
+        "device": {"model": "IG62"},
+        "lteCell": {"lteStr": -91},
+        "carAgg": {"lte": [1, 2]},
+        "saCell": {},
+    }
+    assert snapshot_diff(old, new) == {
+        "set": [
+            [["lteCell", "lteStr"], -91],
+            [["carAgg", "lte"], [1, 2]],
+            [["saCell"], {}],
+        ],
+        "remove": [["lteCell", "lteSnr"]],
+    }
+    assert snapshot_diff(new, new) == {}
+    assert snapshot_diff({"a": 1}, {"a": 1.0}) == {"set": [[["a"], 1.0]]}
+
+
+def _connection():
+    connection = MagicMock()
+    connection.subscriptions = {}
+    return connection
+
+
+def _events(connection):
+    messages = []
+    for call in connection.send_message.call_args_list:
+        message = call.args[0]
+        messages.append(json.loads(json_bytes(message)))
+    return messages
+
+
+async def test_subscribe_fans_out_one_diff(hass: HomeAssistant) -> None:
+    """Subscribers get the snapshot, then one shared diff per poll."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": "1.2.3.4"})
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_get_data",
+        return_value={"lteCell": {"lteStr": -90}},
+    ) as get_data, patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_probe",
+        return_value=True,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        device_id = next(iter(hass.data["device_registry"].devices))
+
+        first, second, missing = _connection(), _connection(), _connection()
+        websocket.ws_subscribe(
+            hass,
+            first,
+            {"id": 1, "type": "invisagig/subscribe", "entry_id": entry.entry_id},
+        )
+        websocket.ws_subscribe(
+            hass,
+            second,
+            {"id": 7, "type": "invisagig/subscribe", "device_id": device_id},
+        )
+        websocket.ws_subscribe(
+            hass, missing, {"id": 2, "type": "invisagig/subscribe", "entry_id": "nope"}
+        )
+        missing.send_error.assert_called_once()
+        assert _events(first) == [
+            {
+                "id": 1,
+                "type": "event",
+                "event": {"snapshot": {"lteCell": {"lteStr": -90}}, "available": True},
+            }
+        ]
+
+        get_data.return_value = {"lteCell": {"lteStr": -95}}
+        with patch.object(websocket, "snapshot_diff", wraps=snapshot_diff) as diff:
+            await coordinator.async_refresh()
+            # An unchanged snapshot sends nothing
+            get_data.return_value = {"lteCell": {"lteStr": -95}}
+            await coordinator.async_refresh()
+        assert diff.call_count == 2
+
+        update = {"diff": {"set": [[["lteCell", "lteStr"], -95]]}, "available": True}
+        assert _events(first)[1:] == [{"type": "event", "event": update, "id": 1}]
+        assert _events(second)[1:] == [{"type": "event", "event": update, "id": 7}]
+
+        # The last unsubscribe stops listening to the coordinator
+        listeners = len(coordinator._listeners)
+        first.subscriptions[1]()
+        second.subscriptions[7]()
+        assert len(coordinator._listeners) == listeners - 1
+
+
+async def test_unload_closes_subscriptions(hass: HomeAssistant) -> None:
+    """Unloading ends the subscriptions; a reloaded entry gets a new broadcast."""
+    entry = MockConfigEntry(domain=DOMAIN, data={"host": "1.2.3.4"})
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_get_data",
+        return_value={"lteCell": {"lteStr": -90}},
+    ), patch(
+        "custom_components.invisagig.api.InvisaGigApiClient.async_probe",
+        return_value=True,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        listeners = len(coordinator._listeners)
+
+        connection = _connection()
+        msg = {"id": 1, "type": "invisagig/subscribe", "entry_id": entry.entry_id}
+        websocket.ws_subscribe(hass, connection, msg)
+        assert len(coordinator._listeners) == listeners + 1
+        broadcast = hass.data[DATA_BROADCASTS][entry.entry_id]
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+        assert _events(connection)[-1] == {
+            "id": 1,
+            "type": "event",
+            "event": {"closed": True},
+        }
+        assert connection.subscriptions == {}
+        assert broadcast._remove_listener is None
+        assert entry.entry_id not in hass.data[DATA_BROADCASTS]
+
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        reloaded = hass.data[DOMAIN][entry.entry_id]
+        connection = _connection()
+        websocket.ws_subscribe(hass, connection, msg)
+        assert hass.data[DATA_BROADCASTS][entry.entry_id].coordinator is reloaded
+        assert _events(connection)[-1]["event"]["available"] is True
+        connection.subscriptions[1]()